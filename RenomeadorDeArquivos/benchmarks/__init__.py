@@ -0,0 +1,6 @@
+"""
+Benchmarks reprodutíveis do pipeline de nomes e renomeação.
+
+    python -m benchmarks --saida resultados.json
+    python -m benchmarks --comparar versao-anterior.json
+"""
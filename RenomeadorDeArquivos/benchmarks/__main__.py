@@ -0,0 +1,121 @@
+"""
+Executa a suíte de benchmarks e grava os resultados em JSON.
+
+    python -m benchmarks [--escala 1.0] [--repeticoes 5] [--casos nomes,lote]
+                         [--saida resultados.json] [--comparar anterior.json]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+from typing import Dict, List
+
+from benchmarks import (
+    bench_colisoes,
+    bench_duplicados,
+    bench_lote,
+    bench_memoria,
+    bench_nomes,
+    bench_processos,
+    bench_sanitizacao,
+    bench_simulacao,
+    bench_sufixos,
+    bench_trocas,
+)
+from benchmarks.comum import pasta_temporaria, remover
+
+MODULOS = {
+    "nomes": bench_nomes,
+    "sanitizacao": bench_sanitizacao,
+    "colisoes": bench_colisoes,
+    "lote": bench_lote,
+    "simulacao": bench_simulacao,
+    "memoria": bench_memoria,
+    "duplicados": bench_duplicados,
+    "trocas": bench_trocas,
+    "sufixos": bench_sufixos,
+    "processos": bench_processos,
+}
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            timeout=5,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def _meta(args: argparse.Namespace) -> Dict[str, object]:
+    tmp = pasta_temporaria()
+    remover(tmp)
+    return {
+        "criado": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+        "pasta_temporaria": os.path.dirname(tmp),
+        "escala": args.escala,
+        "repeticoes": args.repeticoes,
+    }
+
+
+def _comparar(atuais: List[Dict[str, object]], caminho: str, tolerancia: float) -> int:
+    with open(caminho, "r", encoding="utf-8") as f:
+        anteriores = {r["caso"]: r for r in json.load(f)["resultados"]}
+    regressoes = 0
+    for r in atuais:
+        antes = anteriores.get(r["caso"])
+        if not antes or not antes["mediana_s"]:
+            continue
+        razao = r["mediana_s"] / antes["mediana_s"]
+        marca = ""
+        if razao > 1 + tolerancia:
+            marca = "  <-- regressão"
+            regressoes += 1
+        print(f"{r['caso']:<40} {antes['mediana_s']:>10.4f}s -> {r['mediana_s']:>10.4f}s  ({razao:.2f}x){marca}", file=sys.stderr)
+    return 1 if regressoes else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks do Renomeador de Arquivos.")
+    parser.add_argument("--escala", type=float, default=1.0, help="multiplica o tamanho de todos os casos (padrão: 1.0)")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--casos", default=",".join(MODULOS), help=f"grupos separados por vírgula ({', '.join(MODULOS)})")
+    parser.add_argument("--saida", help="grava o JSON neste arquivo (padrão: saída padrão)")
+    parser.add_argument("--comparar", metavar="JSON", help="compara com um resultado anterior; sai com 1 se houver regressão")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="piora relativa aceita na comparação (padrão: 0.2)")
+    args = parser.parse_args()
+
+    resultados: List[Dict[str, object]] = []
+    for nome in args.casos.split(","):
+        modulo = MODULOS.get(nome.strip())
+        if modulo is None:
+            parser.error(f"grupo desconhecido: {nome!r}")
+        print(f"[{nome}] ...", file=sys.stderr)
+        resultados.extend(modulo.executar(args.escala, args.repeticoes))
+
+    saida = json.dumps({"meta": _meta(args), "resultados": resultados}, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            f.write(saida + "\n")
+    else:
+        print(saida)
+
+    if args.comparar:
+        return _comparar(resultados, args.comparar, args.tolerancia)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
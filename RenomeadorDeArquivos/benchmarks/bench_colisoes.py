@@ -0,0 +1,69 @@
+"""
+Numeração em pastas com muitos ``-NNN`` já existentes.
+
+Mede só o planejamento dos destinos (sem ``os.replace``): o ``NumeradorLote``
+contra a sondagem original com ``os.path.exists`` a cada tentativa.
+"""
+
+import os
+from typing import Dict, List, Tuple
+
+from benchmarks.comum import DATA, cronometrar, pasta_temporaria, remover
+from renomeador.nomes import PlanoNome
+from renomeador.numeracao import NumeradorLote
+
+
+def _preparar(existentes: int, novos: int) -> Tuple[str, List[str]]:
+    raiz = pasta_temporaria()
+    for n in range(1, existentes + 1):
+        open(os.path.join(raiz, f"{DATA}-Con-{n:03d}.pdf"), "wb").close()
+    lote = []
+    for i in range(novos):
+        c = os.path.join(raiz, f"novo {i:06d}.pdf")
+        open(c, "wb").close()
+        lote.append(c)
+    return raiz, lote
+
+
+def _legado(plano: PlanoNome, arquivos: List[str]) -> None:
+    # Sondagem original; ``usados`` faz o papel dos arquivos já renomeados no lote.
+    usados = set()
+    for idx, origem in enumerate(arquivos, start=1):
+        diretorio = os.path.dirname(origem)
+        tentativa = idx
+        destino = os.path.join(diretorio, plano.nome_para(origem, tentativa))
+        while destino in usados or os.path.exists(destino):
+            tentativa += 1
+            destino = os.path.join(diretorio, plano.nome_para(origem, tentativa))
+        usados.add(destino)
+
+
+def _numerador(plano: PlanoNome, arquivos: List[str]) -> None:
+    numerador = NumeradorLote(plano)
+    for idx, origem in enumerate(arquivos, start=1):
+        _, destino = numerador.reservar(origem, idx)
+        numerador.confirmar(origem, destino)
+
+
+def executar(escala: float, repeticoes: int) -> List[Dict[str, object]]:
+    plano = PlanoNome(f"{DATA}-Con")
+    resultados = []
+    # O legado é quadrático: roda numa escala menor para não dominar a suíte.
+    for caso, func, existentes, novos in (
+        ("colisoes.exists_legado", _legado, int(1_000 * escala), int(300 * escala)),
+        ("colisoes.numerador", _numerador, int(1_000 * escala), int(300 * escala)),
+        ("colisoes.numerador_grande", _numerador, int(20_000 * escala), int(20_000 * escala)),
+    ):
+        existentes, novos = max(1, existentes), max(1, novos)
+        resultados.append(
+            cronometrar(
+                caso,
+                novos,
+                lambda estado, f=func: f(plano, estado[1]),
+                preparar=lambda e=existentes, n=novos: _preparar(e, n),
+                limpar=lambda estado: remover(estado[0]),
+                repeticoes=repeticoes,
+            )
+        )
+        resultados[-1]["existentes"] = existentes
+    return resultados
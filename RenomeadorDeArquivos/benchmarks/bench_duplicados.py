@@ -0,0 +1,61 @@
+"""
+Conteúdo repetido: peneira tamanho -> hash parcial -> hash completo, sem e com cache.
+"""
+
+import os
+import random
+from typing import Dict, List
+
+from benchmarks.comum import cronometrar, pasta_temporaria, remover
+from renomeador.duplicados import CacheHashes, encontrar_duplicados
+
+
+def _criar(raiz: str, unicos: int, copias: int) -> List[str]:
+    """``unicos`` arquivos de 4-400 KB (tamanhos repetidos de propósito) e ``copias`` cópias deles."""
+    rnd = random.Random(42)
+    caminhos = []
+    os.makedirs(os.path.join(raiz, "a"))
+    os.makedirs(os.path.join(raiz, "b"))
+    for i in range(unicos):
+        c = os.path.join(raiz, "a", f"doc{i:05d}.pdf")
+        with open(c, "wb") as f:
+            f.write(rnd.randbytes(4096 * rnd.randint(1, 100)))
+        caminhos.append(c)
+    for i in range(copias):
+        c = os.path.join(raiz, "b", f"copia{i:05d}.pdf")
+        with open(caminhos[i], "rb") as o, open(c, "wb") as f:
+            f.write(o.read())
+        caminhos.append(c)
+    return caminhos
+
+
+def executar(escala: float, repeticoes: int) -> List[Dict[str, object]]:
+    unicos = max(10, int(2000 * escala))
+    copias = max(1, unicos // 10)
+    total = unicos + copias
+    raiz = pasta_temporaria()
+    try:
+        arquivos = _criar(raiz, unicos, copias)
+        banco = os.path.join(raiz, "hashes.db")
+
+        def sem_cache(_) -> None:
+            assert len(encontrar_duplicados(arquivos).repetidos) == copias
+
+        def preparar_cache():
+            if os.path.exists(banco):
+                os.remove(banco)
+            with CacheHashes(banco) as cache:
+                encontrar_duplicados(arquivos, cache=cache)
+            return CacheHashes(banco)
+
+        def com_cache(cache) -> None:
+            r = encontrar_duplicados(arquivos, cache=cache)
+            assert len(r.repetidos) == copias and r.lidos == 0
+
+        resultados = [
+            cronometrar("duplicados.sem_cache", total, sem_cache, repeticoes=repeticoes),
+            cronometrar("duplicados.cache_quente", total, com_cache, preparar=preparar_cache, limpar=lambda c: c.fechar(), repeticoes=repeticoes),
+        ]
+    finally:
+        remover(raiz)
+    return resultados
@@ -0,0 +1,41 @@
+"""
+Renomeação em lote de ponta a ponta numa árvore sintética em tmpfs.
+"""
+
+from typing import Dict, List, Tuple
+
+from benchmarks.comum import CAMPOS, DATA, criar_arvore, cronometrar, pasta_temporaria, remover
+from renomeador.catalogo import EVENTOS, SETORES
+from renomeador.executor import ExecutorLote
+from renomeador.lote import renomear_lote
+from renomeador.nomes import PlanoNome
+
+
+def executar(escala: float, repeticoes: int) -> List[Dict[str, object]]:
+    pastas = max(1, int(20 * escala))
+    por_pasta = max(1, int(500 * escala))
+    total = pastas * por_pasta
+    plano = PlanoNome.criar(setores=SETORES, eventos=EVENTOS, data=DATA, **CAMPOS)
+
+    def preparar() -> Tuple[str, List[str]]:
+        raiz = pasta_temporaria()
+        return raiz, criar_arvore(raiz, pastas, por_pasta)
+
+    def limpar(estado) -> None:
+        remover(estado[0])
+
+    def serial(estado) -> None:
+        r = renomear_lote(plano, estado[1])
+        assert r.ok == total, r.resumo()
+
+    def paralelo(estado) -> None:
+        r = ExecutorLote(plano, max_tarefas=4).executar(estado[1])
+        assert r.ok == total, r.resumo()
+
+    resultados = [
+        cronometrar("lote.serial", total, serial, preparar=preparar, limpar=limpar, repeticoes=repeticoes),
+        cronometrar("lote.executor_4", total, paralelo, preparar=preparar, limpar=limpar, repeticoes=repeticoes),
+    ]
+    for r in resultados:
+        r["pastas"] = pastas
+    return resultados
@@ -0,0 +1,70 @@
+"""
+Pico de memória do plano de um lote grande: lista de caminhos (antes) x ``PlanoCompacto``.
+
+Os caminhos são sintéticos (pastas inexistentes): mede só as estruturas em
+memória, sem tocar no disco. Com ``--escala 5`` o plano tem 1 milhão de arquivos.
+"""
+
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterator, List
+
+from benchmarks.comum import CAMPOS, DATA
+from renomeador.catalogo import EVENTOS, SETORES
+from renomeador.compacto import PlanoCompacto
+from renomeador.nomes import PlanoNome
+from renomeador.numeracao import NumeradorLote
+
+
+def _caminhos(total: int, por_pasta: int) -> Iterator[str]:
+    for i in range(total):
+        yield f"/srv/migracao/Evento {i // por_pasta:05d}/Documento Ação {i:07d}.pdf"
+
+
+def _medir(caso: str, total: int, func: Callable[[], object]) -> Dict[str, object]:
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    try:
+        plano = func()
+        tempo = time.perf_counter() - t0
+        atual, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del plano
+    return {
+        "caso": caso,
+        "itens": total,
+        "repeticoes": 1,
+        "mediana_s": tempo,
+        "pico_mb": pico / 2**20,
+        "final_mb": atual / 2**20,
+        "bytes_por_item": atual / total if total else None,
+    }
+
+
+def executar(escala: float, repeticoes: int) -> List[Dict[str, object]]:
+    total = max(1, int(200_000 * escala))
+    por_pasta = 1000
+    plano = PlanoNome.criar(setores=SETORES, eventos=EVENTOS, data=DATA, **CAMPOS)
+
+    def lista():
+        # Representação anterior: lista de caminhos + (idx, origem, destino) por arquivo.
+        arquivos = list(_caminhos(total, por_pasta))
+        numerador = NumeradorLote(plano)
+        itens = []
+        for idx, origem in enumerate(arquivos, start=1):
+            n, destino = numerador.reservar(origem, idx)
+            numerador.confirmar(origem, destino)
+            itens.append((idx, origem, destino))
+        return arquivos, itens
+
+    def compacto():
+        compacto = PlanoCompacto(_caminhos(total, por_pasta))
+        compacto.planejar(plano)
+        return compacto
+
+    # Medições de memória são determinísticas: uma rodada de cada basta.
+    return [
+        _medir("memoria.plano_lista", total, lista),
+        _medir("memoria.plano_compacto", total, compacto),
+    ]
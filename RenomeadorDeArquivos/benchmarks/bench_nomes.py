@@ -0,0 +1,48 @@
+"""
+Custo por arquivo na montagem de nomes.
+
+Compara a montagem "por arquivo" (sanitiza data, setor, evento, funcionário e
+documento a cada nome, como o app fazia) com o ``PlanoNome`` (prefixo
+sanitizado uma vez, só sufixo e extensão variam).
+"""
+
+import os
+from typing import Dict, List
+
+from benchmarks.comum import CAMPOS, DATA, cronometrar
+from renomeador.catalogo import EVENTOS, SETORES
+from renomeador.nomes import PlanoNome, encurtar_se_preciso, formatar_numero, sanitizar_componente, sanitizar_documento
+
+
+def _por_arquivo(arquivo: str, n: int) -> str:
+    # Montagem sem cache, equivalente à de antes do PlanoNome.
+    comp = sanitizar_componente.__wrapped__
+    doc = sanitizar_documento.__wrapped__
+    partes = [
+        comp(DATA),
+        comp(SETORES[CAMPOS["setor"]]),
+        comp(EVENTOS[CAMPOS["evento"]]),
+        comp(CAMPOS["funcionario"]),
+        doc(CAMPOS["documento"]),
+        f"v{int(CAMPOS['versao']):02d}",
+    ]
+    base = "-".join(p for p in partes if p) + "-" + formatar_numero(n)
+    return encurtar_se_preciso(os.path.dirname(arquivo), base + os.path.splitext(arquivo)[1])
+
+
+def executar(escala: float, repeticoes: int) -> List[Dict[str, object]]:
+    n = max(1, int(100_000 * escala))
+    caminhos = [f"/srv/eventos/FisioSummit/arquivo {i}.pdf" for i in range(n)]
+
+    def por_arquivo(_):
+        return [_por_arquivo(c, i) for i, c in enumerate(caminhos, start=1)]
+
+    def plano(_):
+        p = PlanoNome.criar(setores=SETORES, eventos=EVENTOS, data=DATA, **CAMPOS)
+        return [p.nome_para(c, i) for i, c in enumerate(caminhos, start=1)]
+
+    assert por_arquivo(None) == plano(None)
+    return [
+        cronometrar("nomes.por_arquivo", n, por_arquivo, repeticoes=repeticoes),
+        cronometrar("nomes.plano", n, plano, repeticoes=repeticoes),
+    ]
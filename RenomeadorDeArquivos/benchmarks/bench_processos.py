@@ -0,0 +1,48 @@
+"""
+Lote com muitas pastas: threads num processo só contra o modo ``processos``.
+
+Com threads, montar nomes e listar pastas disputa um único interpretador;
+com ``processos``, cada pacote de pastas roda num processo. O ganho depende
+dos núcleos livres (``cpus`` no resultado): com um núcleo só, mede o custo
+de enviar os pacotes.
+"""
+
+import os
+from typing import Dict, List, Tuple
+
+from benchmarks.comum import CAMPOS, DATA, criar_arvore, cronometrar, pasta_temporaria, remover
+from renomeador.catalogo import EVENTOS, SETORES
+from renomeador.executor import ExecutorLote
+from renomeador.nomes import PlanoNome
+
+
+def executar(escala: float, repeticoes: int) -> List[Dict[str, object]]:
+    pastas = max(1, int(200 * escala))
+    por_pasta = max(1, int(250 * escala))
+    total = pastas * por_pasta
+    cpus = os.cpu_count() or 1
+    plano = PlanoNome.criar(setores=SETORES, eventos=EVENTOS, data=DATA, **CAMPOS)
+
+    def preparar() -> Tuple[str, List[str]]:
+        raiz = pasta_temporaria()
+        return raiz, criar_arvore(raiz, pastas, por_pasta)
+
+    def limpar(estado) -> None:
+        remover(estado[0])
+
+    def threads(estado) -> None:
+        r = ExecutorLote(plano, max_tarefas=max(2, cpus)).executar(estado[1])
+        assert r.ok == total, r.resumo()
+
+    def processos(estado) -> None:
+        r = ExecutorLote(plano, processos=max(2, cpus)).executar(estado[1])
+        assert r.ok == total, r.resumo()
+
+    resultados = [
+        cronometrar("processos.threads", total, threads, preparar=preparar, limpar=limpar, repeticoes=repeticoes),
+        cronometrar("processos.pool", total, processos, preparar=preparar, limpar=limpar, repeticoes=repeticoes),
+    ]
+    for r in resultados:
+        r["pastas"] = pastas
+        r["cpus"] = cpus
+    return resultados
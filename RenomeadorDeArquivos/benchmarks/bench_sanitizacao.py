@@ -0,0 +1,34 @@
+"""
+Sanitização de entradas em português com acentos, com e sem o cache LRU.
+"""
+
+import random
+from typing import Dict, List
+
+from benchmarks.comum import cronometrar
+from renomeador.nomes import sanitizar_componente, sanitizar_documento
+
+_PALAVRAS = [
+    "Ação", "Contratação", "Pós-Graduação", "Gerência", "Conteúdo", "João", "Flávio",
+    "Órgão", "Exceção", "Açaí", "Ônibus", "Índice", "Prática", "Questionário", "Inscrição",
+]
+
+
+def _entradas(n: int, distintas: int) -> List[str]:
+    rnd = random.Random(42)
+    base = [" ".join(rnd.choice(_PALAVRAS) for _ in range(rnd.randint(1, 5))) for _ in range(distintas)]
+    return [base[i % distintas] for i in range(n)]
+
+
+def executar(escala: float, repeticoes: int) -> List[Dict[str, object]]:
+    n = max(1, int(200_000 * escala))
+    # Poucas entradas distintas, como num lote real (mesmo setor/evento/documento).
+    entradas = _entradas(n, 64)
+    comp, doc = sanitizar_componente.__wrapped__, sanitizar_documento.__wrapped__
+
+    return [
+        cronometrar("sanitizacao.componente.sem_cache", n, lambda _: [comp(s) for s in entradas], repeticoes=repeticoes),
+        cronometrar("sanitizacao.componente.com_cache", n, lambda _: [sanitizar_componente(s) for s in entradas], repeticoes=repeticoes),
+        cronometrar("sanitizacao.documento.sem_cache", n, lambda _: [doc(s) for s in entradas], repeticoes=repeticoes),
+        cronometrar("sanitizacao.documento.com_cache", n, lambda _: [sanitizar_documento(s) for s in entradas], repeticoes=repeticoes),
+    ]
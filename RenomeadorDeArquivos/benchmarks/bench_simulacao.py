@@ -0,0 +1,42 @@
+"""
+Simulação de lote (plano + relatório CSV/JSON) numa árvore sintética em tmpfs.
+"""
+
+import os
+from typing import Dict, List
+
+from benchmarks.comum import CAMPOS, DATA, criar_arvore, cronometrar, pasta_temporaria, remover
+from renomeador.catalogo import EVENTOS, SETORES
+from renomeador.nomes import PlanoNome
+from renomeador.simulacao import escrever_relatorio, simular
+
+
+def executar(escala: float, repeticoes: int) -> List[Dict[str, object]]:
+    pastas = max(1, int(50 * escala))
+    por_pasta = max(1, int(2000 * escala))
+    total = pastas * por_pasta
+    plano = PlanoNome.criar(setores=SETORES, eventos=EVENTOS, data=DATA, **CAMPOS)
+
+    raiz = pasta_temporaria()
+    try:
+        arquivos = criar_arvore(raiz, pastas, por_pasta)
+
+        def relatorio(formato: str):
+            def func(_) -> None:
+                r = escrever_relatorio(simular(plano, arquivos), os.path.join(raiz, f"simulacao.{formato}"))
+                assert r.total == total
+            return func
+
+        def so_plano(_) -> None:
+            assert sum(1 for _ in simular(plano, arquivos)) == total
+
+        resultados = [
+            cronometrar("simulacao.plano", total, so_plano, repeticoes=repeticoes),
+            cronometrar("simulacao.csv", total, relatorio("csv"), repeticoes=repeticoes),
+            cronometrar("simulacao.json", total, relatorio("json"), repeticoes=repeticoes),
+        ]
+    finally:
+        remover(raiz)
+    for r in resultados:
+        r["pastas"] = pastas
+    return resultados
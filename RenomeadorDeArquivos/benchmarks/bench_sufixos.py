@@ -0,0 +1,62 @@
+"""
+Lote pequeno arquivado numa pasta grande que já está numerada.
+
+Sem cache, cada lote lista a pasta de destino inteira para achar os números
+livres; com o ``CacheSufixos`` aquecido (a pasta não mudou por fora desde o
+último lote), os números vêm das faixas gravadas e o custo é o do lote.
+"""
+
+import os
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.comum import DATA, cronometrar, pasta_temporaria, remover
+from renomeador.arquivamento import ArquivadorLote
+from renomeador.nomes import PlanoNome
+from renomeador.numeracao import CacheSufixos, NumeradorLote
+
+_LOTE = 50
+
+
+def _preparar(n: int, plano: PlanoNome, aquecer: bool) -> Tuple[str, str, List[str], Optional[CacheSufixos]]:
+    raiz = pasta_temporaria()
+    destino = os.path.join(raiz, "Evento")
+    entrada = os.path.join(raiz, "Entrada")
+    os.makedirs(destino)
+    os.makedirs(entrada)
+    for i in range(1, n + 1):
+        open(os.path.join(destino, f"{plano.base}-{i:03d}.pdf"), "wb").close()
+    lote = []
+    for i in range(_LOTE):
+        c = os.path.join(entrada, f"digitalizado {i:03d}.pdf")
+        open(c, "wb").close()
+        lote.append(c)
+    cache = None
+    if aquecer:
+        cache = CacheSufixos(os.path.join(raiz, "sufixos.db"))
+        NumeradorLote(plano, sufixos=cache).reservar_em(destino, ".pdf", 1)
+        cache.salvar()
+    return raiz, destino, lote, cache
+
+
+def _limpar(estado: Tuple[str, str, List[str], Optional[CacheSufixos]]) -> None:
+    if estado[3] is not None:
+        estado[3].fechar()
+    remover(estado[0])
+
+
+def executar(escala: float, repeticoes: int) -> List[Dict[str, object]]:
+    plano = PlanoNome(f"{DATA}-Con")
+    n = max(10, int(20_000 * escala))
+    resultados = []
+    for caso, aquecer in (("sufixos.sem_cache", False), ("sufixos.cache_aquecido", True)):
+        resultados.append(
+            cronometrar(
+                caso,
+                _LOTE,
+                lambda estado: ArquivadorLote(plano, estado[1], max_tarefas=1, sufixos=estado[3]).executar(estado[2]),
+                preparar=lambda aquecer=aquecer: _preparar(n, plano, aquecer),
+                limpar=_limpar,
+                repeticoes=repeticoes,
+            )
+        )
+    return resultados
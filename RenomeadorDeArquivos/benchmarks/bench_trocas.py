@@ -0,0 +1,50 @@
+"""
+Renumerar uma pasta que já está numerada (-001 ... -N), em ordem invertida.
+
+No lote comum cada arquivo encontra o seu número ocupado por outro da
+seleção e vai para N+1, N+2, ...; no de duas fases cada um fica com a
+posição dele, com uma troca (dois arquivos) por par. Mede o planejamento
+sozinho e os dois lotes com ``os.replace``.
+"""
+
+import os
+from typing import Dict, List, Tuple
+
+from benchmarks.comum import DATA, cronometrar, pasta_temporaria, remover
+from renomeador.compacto import PlanoCompacto
+from renomeador.executor import ExecutorLote
+from renomeador.nomes import PlanoNome
+from renomeador.trocas import planejar_trocas
+
+
+def _preparar(n: int) -> Tuple[str, List[str]]:
+    raiz = pasta_temporaria()
+    lote = []
+    for i in range(1, n + 1):
+        c = os.path.join(raiz, f"{DATA}-Con-{i:03d}.pdf")
+        open(c, "wb").close()
+        lote.append(c)
+    lote.reverse()
+    return raiz, lote
+
+
+def executar(escala: float, repeticoes: int) -> List[Dict[str, object]]:
+    plano = PlanoNome(f"{DATA}-Con")
+    n = max(2, int(20_000 * escala))
+    resultados = []
+    for caso, func in (
+        ("trocas.planejar", lambda estado: planejar_trocas(plano, PlanoCompacto(estado[1]))),
+        ("trocas.lote_comum", lambda estado: ExecutorLote(plano, max_tarefas=1).executar(estado[1])),
+        ("trocas.lote_duas_fases", lambda estado: ExecutorLote(plano, max_tarefas=1, duas_fases=True).executar(estado[1])),
+    ):
+        resultados.append(
+            cronometrar(
+                caso,
+                n,
+                func,
+                preparar=lambda: _preparar(n),
+                limpar=lambda estado: remover(estado[0]),
+                repeticoes=repeticoes,
+            )
+        )
+    return resultados
@@ -0,0 +1,74 @@
+"""
+Utilitários compartilhados pelos benchmarks — cronômetro, pastas em tmpfs e árvores sintéticas.
+"""
+
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Data fixa: os nomes gerados não dependem do dia em que o benchmark roda.
+DATA = "20260101"
+CAMPOS = dict(setor="Conteúdo", evento="LI Pós 3", funcionario="Flávio", documento="aditivo contratual ção", versao="2")
+
+PASTA_TMPFS = "/dev/shm"
+
+
+def pasta_temporaria(prefixo: str = "renomeador-bench-") -> str:
+    """Pasta temporária em tmpfs quando disponível (Linux), senão no temp padrão."""
+    base = PASTA_TMPFS if os.path.isdir(PASTA_TMPFS) and os.access(PASTA_TMPFS, os.W_OK) else None
+    return tempfile.mkdtemp(prefix=prefixo, dir=base)
+
+
+def criar_arvore(raiz: str, pastas: int, por_pasta: int, exts=(".pdf", ".docx", ".jpg")) -> List[str]:
+    """Cria ``pastas`` x ``por_pasta`` arquivos vazios e devolve os caminhos em ordem estável."""
+    caminhos = []
+    for p in range(pastas):
+        d = os.path.join(raiz, f"Evento {p:04d}")
+        os.makedirs(d, exist_ok=True)
+        for i in range(por_pasta):
+            c = os.path.join(d, f"Documento Ação {i:06d}{exts[i % len(exts)]}")
+            open(c, "wb").close()
+            caminhos.append(c)
+    return caminhos
+
+
+def remover(raiz: str) -> None:
+    shutil.rmtree(raiz, ignore_errors=True)
+
+
+def cronometrar(
+    caso: str,
+    itens: int,
+    func: Callable[[object], object],
+    *,
+    preparar: Optional[Callable[[], object]] = None,
+    limpar: Optional[Callable[[object], None]] = None,
+    repeticoes: int = 5,
+) -> Dict[str, object]:
+    """Roda ``func`` ``repeticoes`` vezes (preparação fora do tempo) e resume em dict."""
+    tempos: List[float] = []
+    for _ in range(repeticoes):
+        estado = preparar() if preparar else None
+        try:
+            t0 = time.perf_counter()
+            func(estado)
+            tempos.append(time.perf_counter() - t0)
+        finally:
+            if limpar:
+                limpar(estado)
+    mediana = statistics.median(tempos)
+    return {
+        "caso": caso,
+        "itens": itens,
+        "repeticoes": repeticoes,
+        "min_s": min(tempos),
+        "mediana_s": mediana,
+        "por_item_us": mediana / itens * 1e6 if itens else None,
+        "itens_por_s": itens / mediana if mediana else None,
+    }
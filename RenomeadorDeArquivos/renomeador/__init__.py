@@ -0,0 +1,23 @@
+"""
+Motor de renomeação do Renomeador de Arquivos — sem dependência de Tk.
+"""
+
+from .nomes import (
+    PlanoNome,
+    ascii_sem_acentos,
+    data_atual,
+    encurtar_se_preciso,
+    formatar_numero,
+    sanitizar_componente,
+    sanitizar_documento,
+)
+
+__all__ = [
+    "PlanoNome",
+    "ascii_sem_acentos",
+    "data_atual",
+    "encurtar_se_preciso",
+    "formatar_numero",
+    "sanitizar_componente",
+    "sanitizar_documento",
+]
@@ -0,0 +1,199 @@
+"""
+Arquivamento em lote — renomeia e move cada arquivo para uma pasta de destino (outro volume, inclusive).
+
+A numeração é a do lote (-001, -002, ..., próximo livre em caso de colisão),
+só que na pasta de destino: todos os nomes são reservados em sequência, numa
+thread, antes de qualquer arquivo sair do lugar, então nunca dois arquivos
+disputam o mesmo destino. As cópias (``mover.mover_arquivo``) andam em
+paralelo numa fila limitada; os resultados são contados na ordem do lote.
+"""
+
+import collections
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from .diario import Diario
+from .executor import CANCELADO, ERRO, RENOMEADO, EventoLote
+from .lote import ResultadoLote
+from .metricas import DIARIO, PLANEJAMENTO, MetricasLote, medir_iteracao, registrar_erro
+from .mover import mover_arquivo
+from .nomes import PlanoNome
+from .numeracao import CacheSufixos, IndiceDiretorio, NumeradorLote
+
+_BLOCO_PLANO = 64  # arquivos planejados (e gravados no diário) antes de começar a movê-los
+
+# (tipo, erro, copiou, segundos) de um arquivo
+_Movimento = Tuple[str, Optional[BaseException], bool, float]
+
+
+class ArquivadorLote:
+    """Move um lote para ``pasta_destino`` com até ``max_tarefas`` cópias em paralelo.
+
+    Mesma interface do ``ExecutorLote`` (``executar``, ``executar_grupos``,
+    ``cancelar``, ``diario``, ``ao_evento``). Com ``verificar``, cada cópia
+    entre volumes é conferida por hash antes de apagar a origem.
+
+    Com ``sufixos``, a pasta de destino só é listada se mudou por fora desde o
+    último lote (ver ``numeracao.CacheSufixos``).
+    """
+
+    def __init__(
+        self,
+        plano: PlanoNome,
+        pasta_destino: str,
+        *,
+        max_tarefas: int = 4,
+        verificar: bool = False,
+        ao_evento: Optional[Callable[[EventoLote], None]] = None,
+        cancelar: Optional[threading.Event] = None,
+        diario: Optional[Diario] = None,
+        sufixos: Optional[CacheSufixos] = None,
+    ):
+        self.plano = plano
+        self.pasta_destino = pasta_destino
+        self.sufixos = sufixos
+        self.max_tarefas = max(1, max_tarefas)
+        self.verificar = verificar
+        self.ao_evento = ao_evento
+        self.cancelar = cancelar or threading.Event()
+        self.diario = diario
+
+    def _emitir(self, evento: EventoLote) -> None:
+        if self.ao_evento:
+            self.ao_evento(evento)
+
+    def _mover(self, origem: str, destino: str) -> _Movimento:
+        if self.cancelar.is_set():
+            return CANCELADO, None, False, 0.0
+        t0 = time.perf_counter()
+        try:
+            copiou = mover_arquivo(origem, destino, verificar=self.verificar)
+        except Exception as e:
+            return ERRO, e, False, 0.0
+        return RENOMEADO, None, copiou, time.perf_counter() - t0
+
+    def executar(self, arquivos: Iterable[str]) -> ResultadoLote:
+        return self.executar_grupos([(self.plano, arquivos)])
+
+    def executar_grupos(self, grupos: Iterable[Tuple[PlanoNome, Iterable[str]]]) -> ResultadoLote:
+        """Cada grupo é numerado a partir de 1 na pasta de destino; ``idx`` segue o conjunto."""
+        grupos = list(grupos)
+        resultado = ResultadoLote()
+        metricas = resultado.metricas = MetricasLote()
+        erros: List[Tuple[int, str]] = []
+        pasta = self.pasta_destino
+        # Um numerador por nome-base; a pasta de destino é lida uma vez só.
+        indices: Dict[str, IndiceDiretorio] = {}
+        numeradores: List[NumeradorLote] = []
+        encurtados: Set[int] = set()  # idx com o nome encurtado pelo limite de caminho
+        pastas_origem: Set[str] = set()
+        em_voo: Deque[Tuple[int, str, str, "Future[_Movimento]"]] = collections.deque()
+        limite = 2 * self.max_tarefas
+
+        def falhou(idx: int, origem: str, destino: Optional[str], erro: Optional[BaseException]) -> None:
+            erros.append((idx, origem))
+            metricas.erro(type(erro).__name__ if erro is not None else "SemNome")
+            registrar_erro(origem, destino, erro, idx)
+            if self.diario and destino:
+                self.diario.falhou(idx, erro)
+            self._emitir(EventoLote(ERRO, idx, origem, destino, erro))
+
+        def cancelado(idx: int, origem: str) -> None:
+            resultado.cancelados += 1
+            if self.diario:
+                self.diario.cancelado(idx)
+            self._emitir(EventoLote(CANCELADO, idx, origem))
+
+        def concluir_mais_antigo() -> None:
+            idx, origem, destino, fut = em_voo.popleft()
+            tipo, erro, copiou, segundos = fut.result()
+            resultado.total += 1
+            if tipo == CANCELADO:
+                cancelado(idx, origem)
+            elif tipo == ERRO:
+                falhou(idx, origem, destino, erro)
+            else:
+                resultado.ok += 1
+                if idx in encurtados:
+                    resultado.encurtados.append(destino)
+                metricas.renomeado(segundos)
+                metricas.contar("copiados" if copiou else "movidos")
+                if self.diario:
+                    self.diario.concluido(idx, destino)
+                self._emitir(EventoLote(RENOMEADO, idx, origem, destino))
+
+        def despachar(pendentes: List[Tuple[int, str, str]]) -> None:
+            if self.diario:
+                with metricas.etapa(DIARIO):
+                    for idx, origem, destino in pendentes:
+                        self.diario.planejado(idx, origem, destino)
+                    self.diario.sincronizar()
+            for idx, origem, destino in pendentes:
+                while len(em_voo) >= limite:
+                    concluir_mais_antigo()
+                em_voo.append((idx, origem, destino, pool.submit(self._mover, origem, destino)))
+            pendentes.clear()
+
+        os.makedirs(pasta, exist_ok=True)
+        idx = 0
+        with ThreadPoolExecutor(max_workers=self.max_tarefas) as pool:
+            pendentes: List[Tuple[int, str, str]] = []
+            for plano, arquivos in grupos:
+                numerador = NumeradorLote(plano, indices, self.sufixos)
+                numeradores.append(numerador)
+                for numero, origem in enumerate(medir_iteracao(arquivos, metricas), start=1):
+                    if self.cancelar.is_set():
+                        break
+                    idx += 1
+                    pastas_origem.add(os.path.dirname(origem))
+                    t0 = time.perf_counter()
+                    ext = os.path.splitext(origem)[1]
+                    reserva = numerador.reservar_em(pasta, ext, numero)
+                    if reserva:
+                        # Só ocupa: o nome de origem (se estiver na mesma pasta) continua
+                        # em uso até o arquivo sair de lá, talvez em outra thread.
+                        numerador.ocupar_em(pasta, reserva[1])
+                    metricas.somar(PLANEJAMENTO, time.perf_counter() - t0)
+                    if not reserva:
+                        resultado.total += 1
+                        falhou(idx, origem, None, None)
+                        continue
+                    if plano.encurtado(reserva[1], ext, reserva[0]):
+                        encurtados.add(idx)
+                    pendentes.append((idx, origem, os.path.join(pasta, reserva[1])))
+                    if len(pendentes) >= _BLOCO_PLANO:
+                        despachar(pendentes)
+                if self.cancelar.is_set():
+                    break
+            if pendentes and not self.cancelar.is_set():
+                despachar(pendentes)
+            while em_voo:
+                concluir_mais_antigo()
+            # Cancelado antes do despacho: planejados, mas nem saíram do lugar.
+            for idx, origem, _ in pendentes:
+                resultado.total += 1
+                cancelado(idx, origem)
+
+        if self.cancelar.is_set() and all(hasattr(arquivos, "__len__") for _, arquivos in grupos):
+            # Lista conhecida (interface): o que nem chegou a ser planejado também ficou intacto.
+            restantes = sum(len(arquivos) for _, arquivos in grupos) - resultado.total  # type: ignore[arg-type]
+            resultado.cancelados += restantes
+            resultado.total += restantes
+
+        if self.sufixos:
+            # Cancelado: números reservados e não usados ficariam como ocupados.
+            # Origem na própria pasta de destino: o numerador não viu o nome dela sair.
+            alvo = os.path.normcase(os.path.abspath(pasta))
+            if not erros and not resultado.cancelados and not self.cancelar.is_set() and all(
+                os.path.normcase(os.path.abspath(d or ".")) != alvo for d in pastas_origem
+            ):
+                for numerador in numeradores:
+                    numerador.gravar()
+            self.sufixos.salvar()
+        erros.sort()
+        resultado.erros = [os.path.basename(origem) for _, origem in erros]
+        metricas.encerrar()
+        return resultado
@@ -0,0 +1,84 @@
+"""
+Cache em disco de valores calculados por arquivo (hashes, metadados).
+
+Uma tabela SQLite por tipo de valor, com chave no caminho absoluto
+(``chave_caminho``); cada linha só vale enquanto o tamanho e o mtime do
+arquivo são os mesmos de quando foi gravada.
+As gravações ficam em memória e vão para o disco numa transação só
+(``salvar``/``fechar``). Pode ser usado de várias threads.
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Dict, Optional, Sequence, Tuple
+
+PASTA_CACHE = "cache"  # dentro da pasta de configuração
+
+
+class CacheArquivos:
+    def __init__(self, caminho: str, tabela: str, colunas: Sequence[str]):
+        self.caminho = caminho
+        self.tabela = tabela
+        self.colunas = tuple(colunas)
+        self._trava = threading.Lock()
+        self._novos: Dict[str, Tuple[object, ...]] = {}
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        self._con = sqlite3.connect(caminho, timeout=5.0, check_same_thread=False)
+        self._con.execute(
+            f"CREATE TABLE IF NOT EXISTS {tabela} "
+            f"(caminho TEXT PRIMARY KEY, tamanho INTEGER, mtime INTEGER, {', '.join(self.colunas)})"
+        )
+
+    def consultar(self, caminho: str, tamanho: int, mtime: int) -> Optional[Tuple[object, ...]]:
+        """Valores guardados para esta versão do arquivo, ou ``None``."""
+        with self._trava:
+            linha = self._novos.get(caminho)
+            if linha is None:
+                linha = self._con.execute(
+                    f"SELECT tamanho, mtime, {', '.join(self.colunas)} FROM {self.tabela} WHERE caminho = ?",
+                    (caminho,),
+                ).fetchone()
+        if linha is None or linha[0] != tamanho or linha[1] != mtime:
+            return None
+        return tuple(linha[2:])
+
+    def guardar(self, caminho: str, tamanho: int, mtime: int, valores: Sequence[object]) -> None:
+        with self._trava:
+            self._novos[caminho] = (tamanho, mtime, *valores)
+
+    def salvar(self) -> None:
+        with self._trava:
+            if not self._novos:
+                return
+            marcadores = ", ".join("?" * (3 + len(self.colunas)))
+            with self._con:
+                self._con.executemany(
+                    f"INSERT OR REPLACE INTO {self.tabela} "
+                    f"(caminho, tamanho, mtime, {', '.join(self.colunas)}) VALUES ({marcadores})",
+                    [(c, *v) for c, v in self._novos.items()],
+                )
+            self._novos.clear()
+
+    def fechar(self) -> None:
+        try:
+            self.salvar()
+        finally:
+            self._con.close()
+
+    def __enter__(self) -> "CacheArquivos":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.fechar()
+
+
+def chave_caminho(caminho: str) -> str:
+    """Chave de um arquivo no cache: absoluta e em ``normcase``, a mesma de qualquer pasta de trabalho."""
+    return os.path.normcase(os.path.abspath(caminho))
+
+
+def caminho_cache(pasta_config: str, nome: str) -> str:
+    return os.path.join(pasta_config, PASTA_CACHE, nome)
@@ -0,0 +1,321 @@
+"""
+Catálogo de setores, eventos e funcionários usado na montagem dos nomes.
+
+Os valores abaixo são o padrão embutido. Um arquivo externo (JSON, TOML ou
+SQLite) pode substituí-los sem gerar um novo executável: ele é validado e
+indexado ao carregar, e ``FonteCatalogo`` o relê quando o mtime muda.
+"""
+
+import bisect
+import functools
+import json
+import os
+import re
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+from .nomes import ascii_sem_acentos, sanitizar_componente
+
+SETORES: Dict[str, str] = {
+    "Atendimento": "Ate",
+    "Conteúdo": "Con",
+    "Departamento Pessoal": "Dep",
+    "Eventos": "Eve",
+    "Financeiro": "Fin",
+    "Gerência": "Ger",
+    "Mentorias": "Men",
+}
+
+EVENTOS: Dict[str, str] = {
+    "FisioSummit": "FS",
+    "Mentoria Black": "MB",
+    "Mentoria Black Diamond": "MBD",
+    "Pós-Graduação": "PG",
+    "RCA360": "RCA",
+    "Congresso RCA": "CRCA",
+    "PowerFisio": "PF",
+    "RCA Exclusive": "RCAE",
+    "RCA na Prática": "RNP",
+}
+for _n in range(10, 31):
+    EVENTOS[f"LI {_n}"] = f"LI{_n}"
+for _n in range(1, 11):
+    EVENTOS[f"LI Pós {_n}"] = f"LIP{_n}"
+del _n
+
+FUNCIONARIOS: List[str] = sorted(
+    [
+        "Flávio",
+        "Thiago",
+        "Moises",
+        "Mateus",
+        "Sara",
+        "João",
+        "Luiza",
+        "Patrick",
+        "Paula",
+        "Paulo",
+        "Yarhima",
+        "Mayara",
+        "Clara",
+        "Renilson",
+        "Lane",
+        "Juliana",
+        "Deisy",
+        "JP",
+        "Glenda",
+        "Rayssa",
+        "Walkyria",
+    ]
+)
+
+
+# ---------- Índice de busca ----------
+_RE_PALAVRA = re.compile(r"[0-9a-z]+")
+_MAIOR_CARACTERE = "\U0010ffff"
+
+
+def _chave(texto: str) -> str:
+    return ascii_sem_acentos(texto).casefold()
+
+
+class IndicePrefixo:
+    """Busca por prefixo, sem acento nem caixa, a partir do início de qualquer palavra do nome.
+
+    Guarda, ordenado, o trecho de cada nome que começa em cada palavra; uma
+    busca são duas bisseções, sem percorrer a lista inteira.
+    """
+
+    __slots__ = ("todos", "_chaves", "_posicoes")
+
+    def __init__(self, nomes: Iterable[str]):
+        self.todos: List[str] = list(nomes)
+        pares: List[Tuple[str, int]] = []
+        for pos, nome in enumerate(self.todos):
+            chave = _chave(nome)
+            for palavra in _RE_PALAVRA.finditer(chave):
+                pares.append((chave[palavra.start():], pos))
+        pares.sort()
+        self._chaves = [c for c, _ in pares]
+        self._posicoes = [p for _, p in pares]
+
+    def buscar(self, texto: str, limite: Optional[int] = None) -> List[str]:
+        """Nomes com alguma palavra começando por ``texto``, na ordem do catálogo."""
+        prefixo = _chave(texto).strip()
+        if not prefixo:
+            return self.todos[:limite]
+        i = bisect.bisect_left(self._chaves, prefixo)
+        j = bisect.bisect_left(self._chaves, prefixo + _MAIOR_CARACTERE, i)
+        return [self.todos[p] for p in sorted(set(self._posicoes[i:j]))][:limite]
+
+    def exato(self, texto: str) -> Optional[str]:
+        """O nome do catálogo igual a ``texto`` (sem acento nem caixa), se houver."""
+        chave = _chave(texto).strip()
+        for nome in self.buscar(texto):
+            if _chave(nome) == chave:
+                return nome
+        return None
+
+
+# ---------- Catálogo validado ----------
+class ErroCatalogo(ValueError):
+    pass
+
+
+class Catalogo:
+    __slots__ = ("setores", "eventos", "funcionarios", "busca_setores", "busca_eventos", "busca_funcionarios", "origem")
+
+    def __init__(self, setores: Dict[str, str], eventos: Dict[str, str], funcionarios: Iterable[str], origem: str = ""):
+        problemas: List[str] = []
+        self.setores = _validar_tabela("setores", setores, problemas)
+        self.eventos = _validar_tabela("eventos", eventos, problemas)
+        self.funcionarios = sorted(_validar_lista("funcionarios", funcionarios, problemas))
+        if problemas:
+            raise ErroCatalogo(f"catálogo inválido ({origem or 'sem nome'}):\n- " + "\n- ".join(problemas))
+        self.origem = origem
+        self.busca_setores = IndicePrefixo(self.setores)
+        self.busca_eventos = IndicePrefixo(self.eventos)
+        self.busca_funcionarios = IndicePrefixo(self.funcionarios)
+
+
+def _validar_tabela(nome_tabela: str, tabela: object, problemas: List[str]) -> Dict[str, str]:
+    if not isinstance(tabela, dict):
+        problemas.append(f"{nome_tabela}: esperado um mapa nome -> código")
+        return {}
+    validos: Dict[str, str] = {}
+    nomes: Dict[str, str] = {}
+    codigos: Dict[str, str] = {}
+    for nome, codigo in tabela.items():
+        if not isinstance(nome, str) or not nome.strip():
+            problemas.append(f"{nome_tabela}: nome vazio ou inválido ({nome!r})")
+            continue
+        nome = nome.strip()
+        if not isinstance(codigo, str) or not sanitizar_componente(codigo):
+            problemas.append(f"{nome_tabela}: código vazio ou inválido para {nome!r} ({codigo!r})")
+            continue
+        if _chave(nome) in nomes:
+            problemas.append(f"{nome_tabela}: {nome!r} repetido (já existe {nomes[_chave(nome)]!r})")
+            continue
+        codigo_sanitizado = sanitizar_componente(codigo)
+        if codigo_sanitizado in codigos:
+            problemas.append(f"{nome_tabela}: código {codigo!r} de {nome!r} já usado por {codigos[codigo_sanitizado]!r}")
+            continue
+        nomes[_chave(nome)] = nome
+        codigos[codigo_sanitizado] = nome
+        validos[nome] = codigo.strip()
+    return validos
+
+
+def _validar_lista(nome_lista: str, lista: object, problemas: List[str]) -> List[str]:
+    if not isinstance(lista, (list, tuple)):
+        problemas.append(f"{nome_lista}: esperada uma lista de nomes")
+        return []
+    validos: List[str] = []
+    vistos = set()
+    for nome in lista:
+        if not isinstance(nome, str) or not sanitizar_componente(nome):
+            problemas.append(f"{nome_lista}: nome vazio ou inválido ({nome!r})")
+            continue
+        nome = nome.strip()
+        if _chave(nome) in vistos:
+            problemas.append(f"{nome_lista}: {nome!r} repetido")
+            continue
+        vistos.add(_chave(nome))
+        validos.append(nome)
+    return validos
+
+
+@functools.lru_cache(maxsize=1)
+def catalogo_padrao() -> Catalogo:
+    return Catalogo(SETORES, EVENTOS, FUNCIONARIOS, origem="embutido")
+
+
+# ---------- Arquivo externo ----------
+def _de_dict(dados: object, origem: str) -> Catalogo:
+    """``{"setores": {...}, "eventos": {...}, "series_eventos": [...], "funcionarios": [...]}``.
+
+    Cada série gera eventos numerados, como os "LI 10".."LI 30" embutidos:
+    ``{"nome": "LI {n}", "codigo": "LI{n}", "de": 10, "ate": 30}``.
+    """
+    if not isinstance(dados, dict):
+        raise ErroCatalogo(f"catálogo inválido ({origem}): esperado um objeto com setores, eventos e funcionarios")
+    eventos = dados.get("eventos", {})
+    series = dados.get("series_eventos", [])
+    if isinstance(eventos, dict) and series:
+        eventos = dict(eventos)
+        try:
+            for serie in series:
+                for n in range(int(serie["de"]), int(serie["ate"]) + 1):
+                    eventos[serie["nome"].format(n=n)] = serie["codigo"].format(n=n)
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            raise ErroCatalogo(f"catálogo inválido ({origem}): série de eventos mal formada ({e})") from e
+    return Catalogo(dados.get("setores", {}), eventos, dados.get("funcionarios", []), origem=origem)
+
+
+def _de_sqlite(caminho: str) -> Catalogo:
+    """Tabelas ``setores(nome, codigo)``, ``eventos(nome, codigo)`` e ``funcionarios(nome)``."""
+    try:
+        con = sqlite3.connect(f"file:{caminho}?mode=ro", uri=True)
+        try:
+            setores = dict(con.execute("SELECT nome, codigo FROM setores ORDER BY rowid"))
+            eventos = dict(con.execute("SELECT nome, codigo FROM eventos ORDER BY rowid"))
+            funcionarios = [r[0] for r in con.execute("SELECT nome FROM funcionarios ORDER BY rowid")]
+        finally:
+            con.close()
+    except sqlite3.Error as e:
+        raise ErroCatalogo(f"catálogo inválido ({caminho}): {e}") from e
+    return Catalogo(setores, eventos, funcionarios, origem=caminho)
+
+
+def carregar_catalogo(caminho: str) -> Catalogo:
+    """Lê e valida um catálogo ``.json``, ``.toml`` ou SQLite (``.db``/``.sqlite``)."""
+    ext = os.path.splitext(caminho)[1].lower()
+    if ext in (".db", ".sqlite", ".sqlite3"):
+        if not os.path.isfile(caminho):
+            raise FileNotFoundError(caminho)
+        return _de_sqlite(caminho)
+    if ext == ".toml":
+        if tomllib is None:
+            raise ErroCatalogo("catálogo TOML requer Python 3.11 ou mais novo")
+        with open(caminho, "rb") as f:
+            try:
+                dados = tomllib.load(f)
+            except tomllib.TOMLDecodeError as e:
+                raise ErroCatalogo(f"catálogo inválido ({caminho}): {e}") from e
+    else:
+        with open(caminho, "r", encoding="utf-8") as f:
+            try:
+                dados = json.load(f)
+            except ValueError as e:
+                raise ErroCatalogo(f"catálogo inválido ({caminho}): {e}") from e
+    return _de_dict(dados, caminho)
+
+
+def exportar_catalogo(catalogo: Catalogo, caminho: str) -> None:
+    """Grava ``catalogo`` em JSON (ponto de partida para um catálogo externo)."""
+    dados = {"setores": catalogo.setores, "eventos": catalogo.eventos, "funcionarios": catalogo.funcionarios}
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(dados, f, indent=2, ensure_ascii=False)
+
+
+# Procurados, nesta ordem, na pasta de configuração.
+NOMES_ARQUIVO = ("catalogo.json", "catalogo.toml", "catalogo.db")
+VARIAVEL_CATALOGO = "RENOMEADOR_CATALOGO"
+
+
+def caminho_catalogo(pasta_config: str, configurado: object = None) -> Optional[str]:
+    """Variável de ambiente, depois o caminho da configuração, depois ``catalogo.*`` na pasta dela."""
+    caminho = os.environ.get(VARIAVEL_CATALOGO) or configurado
+    if isinstance(caminho, str) and caminho:
+        return caminho
+    for nome in NOMES_ARQUIVO:
+        candidato = os.path.join(pasta_config, nome)
+        if os.path.isfile(candidato):
+            return candidato
+    return None
+
+
+class FonteCatalogo:
+    """Catálogo atual de ``caminho``, relido quando o arquivo muda (mtime/tamanho).
+
+    O arquivo é conferido no máximo a cada ``intervalo`` segundos. Se a nova
+    versão for inválida (ou sumir), continua valendo a última boa e ``erro``
+    explica o motivo; sem ``caminho``, vale o catálogo embutido.
+    """
+
+    def __init__(self, caminho: Optional[str], *, intervalo: float = 2.0):
+        self.caminho = caminho
+        self.intervalo = intervalo
+        self.erro: Optional[str] = None
+        self._catalogo = catalogo_padrao()
+        self._versao: Optional[Tuple[int, int]] = None
+        self._conferido = float("-inf")
+        self.atual()
+
+    def atual(self) -> Catalogo:
+        if not self.caminho:
+            return self._catalogo
+        agora = time.monotonic()
+        if agora - self._conferido < self.intervalo:
+            return self._catalogo
+        self._conferido = agora
+        try:
+            st = os.stat(self.caminho)
+        except OSError as e:
+            self.erro = f"catálogo indisponível ({self.caminho}): {e.strerror or e}"
+            return self._catalogo
+        versao = (st.st_mtime_ns, st.st_size)
+        if versao != self._versao:
+            self._versao = versao
+            try:
+                self._catalogo = carregar_catalogo(self.caminho)
+                self.erro = None
+            except (OSError, ErroCatalogo) as e:
+                self.erro = str(e)
+        return self._catalogo
@@ -0,0 +1,626 @@
+"""
+Modo linha de comando — renomeia em fluxo sem carregar Tk nem PIL.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import glob
+import itertools
+import os
+import signal
+import socket
+import sys
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from .arquivamento import ArquivadorLote
+from .catalogo import Catalogo, ErroCatalogo, FonteCatalogo, caminho_catalogo, carregar_catalogo, exportar_catalogo
+from .configuracao import Configuracao
+from .compacto import PlanoCompacto
+from .diario import Diario, desfazer, recuperar
+from .duplicados import ResultadoDuplicados, abrir_cache, encontrar_duplicados, sem_repetidos
+from .executor import RENOMEADO, EventoLote, ExecutorLote
+from .lote import renomear_lote
+from .metadados import CacheMetadados, PlanosPorArquivo, agrupar_por_plano, metadados_de, planos_dos_arquivos
+from .metadados import abrir_cache as abrir_cache_metadados
+from .metricas import configurar_log, registrar_erro, registrar_lote
+from .mover import mover_arquivo
+from .numeracao import abrir_cache as abrir_cache_sufixos
+from .nomes import PlanoNome, caminho_longo
+from .servico import ServicoRenomeador, servir
+from .simulacao import DUPLICADO, ORIGEM_AUSENTE, SEM_NOME, ItemSimulacao, ResumoSimulacao, escrever_relatorio, simular
+from .varredura import FiltroArquivos, varrer
+from .vigia import CAMPOS_PERFIL, Vigia, carregar_perfil, salvar_perfil
+
+_TAM_BLOCO = 1 << 16
+
+
+# ---------- Entrada ----------
+def _ler_stdin(separador_nulo: bool) -> Iterator[str]:
+    if separador_nulo:
+        resto = b""
+        leitor = sys.stdin.buffer
+        while True:
+            bloco = leitor.read(_TAM_BLOCO)
+            if not bloco:
+                break
+            partes = (resto + bloco).split(b"\0")
+            resto = partes.pop()
+            for p in partes:
+                if p:
+                    yield os.fsdecode(p)
+        if resto:
+            yield os.fsdecode(resto)
+        return
+    for linha in sys.stdin:
+        linha = linha.rstrip("\r\n")
+        if linha:
+            yield linha
+
+
+def _caminhos(args: argparse.Namespace) -> Iterator[str]:
+    usar_stdin = not args.arquivos and not args.glob and not args.pasta
+    for a in args.arquivos:
+        if a == "-":
+            usar_stdin = True
+        else:
+            yield a
+    for padrao in args.glob:
+        for p in glob.iglob(padrao, recursive=True):
+            if os.path.isfile(p):
+                yield p
+    if args.pasta:
+        filtro = FiltroArquivos(
+            incluir=args.incluir,
+            excluir=args.excluir,
+            extensoes=[e for grupo in args.ext for e in grupo.split(",")],
+            profundidade_max=args.profundidade,
+        )
+        for pasta in args.pasta:
+            yield from varrer(pasta, filtro)
+    if usar_stdin:
+        yield from _ler_stdin(args.nulo)
+
+
+# ---------- Catálogo ----------
+def _fonte_catalogo(args: argparse.Namespace, parser: argparse.ArgumentParser) -> FonteCatalogo:
+    config = Configuracao()
+    caminho = args.catalogo or caminho_catalogo(config.pasta, config.get("catalogo"))
+    fonte = FonteCatalogo(caminho)
+    if fonte.erro:
+        parser.error(fonte.erro)
+    return fonte
+
+
+# ---------- Comando rename ----------
+def _validar(args: argparse.Namespace, parser: argparse.ArgumentParser, catalogo: Catalogo) -> None:
+    # Aceita o nome sem acento/caixa ("li pos 3") e troca pelo nome do catálogo.
+    for campo, rotulo, busca in (
+        ("setor", "setor", catalogo.busca_setores),
+        ("evento", "evento", catalogo.busca_eventos),
+        ("funcionario", "funcionário", catalogo.busca_funcionarios),
+    ):
+        valor = getattr(args, campo)
+        if not valor:
+            continue
+        nome = busca.exato(valor)
+        if nome is None:
+            sugestoes = busca.buscar(valor, limite=10) or busca.todos
+            parser.error(f"{rotulo} desconhecido: {valor!r} (opções: {', '.join(sugestoes)})")
+        setattr(args, campo, nome)
+    if args.versao and not args.versao.isdigit():
+        parser.error("a versão deve conter apenas dígitos")
+
+
+def _plano(args: argparse.Namespace, catalogo: Catalogo) -> PlanoNome:
+    return PlanoNome.criar(
+        setor=args.setor,
+        evento=args.evento,
+        funcionario=args.funcionario,
+        documento=args.documento,
+        versao=args.versao,
+        setores=catalogo.setores,
+        eventos=catalogo.eventos,
+    )
+
+
+def _planos_por_arquivo(args: argparse.Namespace, catalogo: Catalogo) -> Optional[PlanosPorArquivo]:
+    if not (args.data_do_arquivo or args.versao_do_nome):
+        return None
+    return PlanosPorArquivo(
+        catalogo.setores,
+        catalogo.eventos,
+        usar_data=args.data_do_arquivo,
+        usar_versao=args.versao_do_nome,
+        setor=args.setor,
+        evento=args.evento,
+        funcionario=args.funcionario,
+        documento=args.documento,
+        versao=args.versao,
+    )
+
+
+def _renomear_um(plano: PlanoNome, origem: str, args: argparse.Namespace) -> int:
+    pasta = args.arquivar or os.path.dirname(origem)
+    ext = os.path.splitext(origem)[1]
+    nome_final = plano.nome_em(pasta, ext)
+    if not nome_final:
+        print("Erro: não foi possível gerar o nome final.", file=sys.stderr)
+        return 1
+    destino = os.path.join(pasta, nome_final)
+    if os.path.exists(destino) and not args.substituir:
+        print(f"Erro: o arquivo '{os.path.basename(destino)}' já existe (use --substituir).", file=sys.stderr)
+        return 1
+    with (Diario.criar(args.diario, plano.base) if args.diario else contextlib.nullcontext()) as diario:
+        if diario:
+            diario.planejado(1, origem, destino)
+            diario.sincronizar()
+        try:
+            if args.arquivar:
+                os.makedirs(pasta, exist_ok=True)
+                mover_arquivo(origem, destino, verificar=args.verificar)
+            else:
+                os.replace(origem, destino)
+        except OSError as e:
+            if diario:
+                diario.falhou(1, e)
+            registrar_erro(origem, destino, e, 1)
+            print(f"Erro ao renomear:\n{e}", file=sys.stderr)
+            return 1
+        if diario:
+            diario.concluido(1, destino)
+    if args.verboso:
+        print(f"{origem} -> {destino}")
+    print(f"Arquivo renomeado: {os.path.basename(destino)}", file=sys.stderr)
+    if plano.encurtado(nome_final, ext):
+        print("Nome encurtado pelo limite de caminho (use --caminhos-longos no Windows).", file=sys.stderr)
+    return 0
+
+
+def _repetidos(arquivos: Iterable[str], args: argparse.Namespace) -> ResultadoDuplicados:
+    cache = abrir_cache(Configuracao().pasta)
+    try:
+        return encontrar_duplicados(arquivos, tarefas=max(args.tarefas, min(8, os.cpu_count() or 4)), cache=cache)
+    finally:
+        if cache:
+            cache.fechar()
+
+
+def _simular(
+    plano: PlanoNome,
+    arquivos: Iterable[str],
+    numerar: bool,
+    args: argparse.Namespace,
+    repetidos: Optional[ResultadoDuplicados] = None,
+    plano_de: Optional[Callable[[str], PlanoNome]] = None,
+) -> int:
+    itens: Iterable[ItemSimulacao] = simular(
+        plano,
+        arquivos,
+        numerar=numerar,
+        repetidos=repetidos.repetidos if repetidos else None,
+        pular_repetidos=args.duplicados == "pular",
+        plano_de=plano_de,
+        pasta_destino=args.arquivar,
+        duas_fases=args.renumerar,
+    )
+    if args.relatorio:
+        resumo = escrever_relatorio(itens, args.relatorio)
+    else:
+        resumo = ResumoSimulacao()
+        for it in itens:
+            resumo.contar(it)
+            if it.avisos or args.verboso:
+                avisos = f"  [{', '.join(it.avisos)}]" if it.avisos else ""
+                print(f"{it.origem} -> {it.destino or '-'}{avisos}")
+    print(resumo.resumo(), file=sys.stderr)
+    # Só avisos que virariam erro no lote real mudam o código de saída.
+    return 1 if any(resumo.contagem.get(a) for a in (DUPLICADO, ORIGEM_AUSENTE, SEM_NOME)) else 0
+
+
+def _cmd_renomear(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    if args.relatorio and not args.simular:
+        parser.error("--relatorio só vale com --simular")
+    if args.verificar and not args.arquivar:
+        parser.error("--verificar só vale com --arquivar")
+    if args.renumerar and args.arquivar:
+        parser.error("--renumerar não vale com --arquivar (a numeração é a da pasta de destino)")
+    if args.processos is not None and (args.renumerar or args.arquivar):
+        parser.error("--processos não vale com --renumerar nem com --arquivar")
+    if args.processos == 0:
+        args.processos = os.cpu_count() or 1
+    configurar_log(Configuracao().pasta)
+    catalogo = _fonte_catalogo(args, parser).atual()
+    _validar(args, parser, catalogo)
+    plano = _plano(args, catalogo)
+    if not plano.base:
+        print("Erro: não foi possível gerar o nome final.", file=sys.stderr)
+        return 1
+
+    caminhos: Iterable[str] = _caminhos(args)
+    if args.caminhos_longos:
+        caminhos = map(caminho_longo, caminhos)
+        if args.arquivar:
+            args.arquivar = caminho_longo(args.arquivar)
+    if args.ordenar:
+        caminhos = sorted(caminhos, key=lambda p: os.path.basename(p).lower())
+
+    # Um único arquivo segue a regra da interface: sem sufixo numérico.
+    it = iter(caminhos)
+    primeiros = list(itertools.islice(it, 2))
+    if not primeiros:
+        print("Nenhum arquivo informado.", file=sys.stderr)
+        return 1
+    arquivos: Iterable[str] = itertools.chain(primeiros, it)
+    repetidos: Optional[ResultadoDuplicados] = None
+    if args.duplicados and len(primeiros) > 1:
+        # A verificação precisa da seleção inteira: guardada compacta.
+        arquivos = PlanoCompacto(arquivos)
+        repetidos = _repetidos(arquivos, args)
+
+    planos = _planos_por_arquivo(args, catalogo)
+    if planos is None:
+        return _executar_renomear(plano, arquivos, primeiros, args, repetidos)
+    cache = abrir_cache_metadados(Configuracao().pasta)
+    try:
+        return _executar_renomear(plano, arquivos, primeiros, args, repetidos, planos, cache)
+    finally:
+        if cache:
+            cache.fechar()
+
+
+def _executar_renomear(
+    plano: PlanoNome,
+    arquivos: Iterable[str],
+    primeiros: List[str],
+    args: argparse.Namespace,
+    repetidos: Optional[ResultadoDuplicados],
+    planos: Optional[PlanosPorArquivo] = None,
+    cache: Optional[CacheMetadados] = None,
+) -> int:
+    """``primeiros``: até dois arquivos já lidos de ``arquivos`` (um só = sem sufixo)."""
+    tarefas = max(args.tarefas, min(8, os.cpu_count() or 4))
+    if args.simular:
+        plano_de: Optional[Callable[[str], PlanoNome]] = None
+        if planos is not None:
+            arquivos = arquivos if isinstance(arquivos, PlanoCompacto) else PlanoCompacto(arquivos)
+            por_arquivo: Dict[str, PlanoNome] = dict(
+                planos_dos_arquivos(arquivos, planos, tarefas=tarefas, cache=cache)
+            )
+            plano_de = por_arquivo.__getitem__
+        return _simular(plano, arquivos, len(primeiros) > 1, args, repetidos, plano_de)
+    if len(primeiros) == 1:
+        origem = primeiros[0]
+        if planos is not None:
+            plano = planos.plano_para(metadados_de(origem, cache))
+        return _renomear_um(plano, origem, args)
+
+    if repetidos and args.duplicados == "pular":
+        arquivos = sem_repetidos(arquivos, repetidos.repetidos)
+    if planos is not None:
+        # Um grupo por data/versão, cada um numerado a partir de -001.
+        grupos = agrupar_por_plano(
+            planos_dos_arquivos(arquivos, planos, tarefas=tarefas, cache=cache)
+        )
+    # Números já usados em cada pasta, guardados entre execuções.
+    sufixos = abrir_cache_sufixos(Configuracao().pasta)
+    try:
+        if planos is not None or args.arquivar or args.renumerar or args.tarefas > 1 or args.processos or args.diario:
+            trava = threading.Lock()
+
+            def ao_evento(ev: EventoLote) -> None:
+                if ev.tipo == RENOMEADO:
+                    with trava:
+                        print(f"{ev.origem} -> {ev.destino}")
+
+            with (Diario.criar(args.diario, plano.base) if args.diario else contextlib.nullcontext()) as diario:
+                if args.arquivar:
+                    executor = ArquivadorLote(
+                        plano,
+                        args.arquivar,
+                        max_tarefas=args.tarefas,
+                        verificar=args.verificar,
+                        ao_evento=ao_evento if args.verboso else None,
+                        diario=diario,
+                        sufixos=sufixos,
+                    )
+                else:
+                    executor = ExecutorLote(
+                        plano,
+                        max_tarefas=args.tarefas,
+                        ao_evento=ao_evento if args.verboso else None,
+                        diario=diario,
+                        duas_fases=args.renumerar,
+                        sufixos=sufixos,
+                        processos=args.processos or 0,
+                    )
+                resultado = executor.executar_grupos(grupos) if planos is not None else executor.executar(arquivos)
+        else:
+            ao_renomear = (lambda o, d: print(f"{o} -> {d}")) if args.verboso else None
+            resultado = renomear_lote(plano, arquivos, ao_renomear=ao_renomear, sufixos=sufixos)
+    finally:
+        if sufixos:
+            sufixos.fechar()
+    if repetidos and args.duplicados == "pular":
+        resultado.repetidos = list(repetidos.repetidos.items())
+    registrar_lote(resultado, {"origem": "cli", "tarefas": args.tarefas, "processos": args.processos or 0})
+    print(resultado.resumo(), file=sys.stderr)
+    if args.metricas and resultado.metricas is not None:
+        print(resultado.metricas.resumo(), file=sys.stderr)
+    if repetidos and repetidos.repetidos and args.duplicados == "avisar":
+        print(repetidos.resumo(), file=sys.stderr)
+    return 1 if resultado.erros else 0
+
+
+# ---------- Comando vigiar ----------
+def _cmd_vigiar(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    if args.perfil:
+        try:
+            perfil = carregar_perfil(args.perfil)
+        except (OSError, ValueError) as e:
+            parser.error(f"não foi possível ler o perfil: {e}")
+        # Opções da linha de comando têm prioridade sobre o perfil.
+        for campo in CAMPOS_PERFIL:
+            if not getattr(args, campo):
+                setattr(args, campo, perfil[campo])
+    fonte = _fonte_catalogo(args, parser)
+    _validar(args, parser, fonte.atual())
+    if not _plano(args, fonte.atual()).base:
+        print("Erro: não foi possível gerar o nome final.", file=sys.stderr)
+        return 1
+    if args.salvar_perfil:
+        salvar_perfil(args.salvar_perfil, {campo: getattr(args, campo) for campo in CAMPOS_PERFIL})
+
+    totais = {"ok": 0, "erros": 0}
+    configurar_log(Configuracao().pasta)
+
+    def ao_lote(resultado) -> None:
+        registrar_lote(resultado, {"origem": "vigia", "pasta": args.pasta})
+        totais["ok"] += resultado.ok
+        totais["erros"] += len(resultado.erros)
+        if resultado.erros:
+            print(resultado.resumo(), file=sys.stderr)
+
+    vigia = Vigia(
+        args.pasta,
+        # Catálogo relido a cada lote: um evento novo vale sem reiniciar a vigia.
+        lambda: _plano(args, fonte.atual()),
+        estavel=args.estavel,
+        intervalo=args.intervalo,
+        polling=args.polling,
+        existentes=not args.ignorar_existentes,
+        ao_renomear=(lambda o, d: print(f"{o} -> {d}", flush=True)) if args.verboso else None,
+        ao_lote=ao_lote,
+    )
+    # SIGTERM (serviço do sistema) encerra como o Ctrl+C: termina os renomes já enfileirados.
+    signal.signal(signal.SIGTERM, lambda *_: vigia.parar())
+    try:
+        vigia.executar()
+    except KeyboardInterrupt:
+        pass
+    except NotADirectoryError:
+        print(f"Erro: pasta não encontrada: {args.pasta}", file=sys.stderr)
+        return 1
+    print(f"Vigia encerrada ({vigia.modo}): {totais['ok']} renomeado(s), {totais['erros']} erro(s).", file=sys.stderr)
+    return 1 if totais["erros"] else 0
+
+
+# ---------- Comando servir ----------
+def _cmd_servir(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    if args.socket and args.porta is not None:
+        parser.error("use --socket ou --porta, não os dois")
+    config = Configuracao()
+    socket_unix = args.socket
+    if not socket_unix and args.porta is None:
+        if not hasattr(socket, "AF_UNIX"):
+            parser.error("informe --porta (socket Unix não disponível neste sistema)")
+        socket_unix = os.path.join(config.pasta, "renomeador.sock")
+    fonte = _fonte_catalogo(args, parser)
+    configurar_log(config.pasta)
+    cache = abrir_cache_metadados(config.pasta)
+    sufixos = abrir_cache_sufixos(config.pasta)
+    servico = ServicoRenomeador(fonte, tarefas=args.tarefas, cache=cache, sufixos=sufixos)
+
+    async def executar() -> None:
+        parar = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        # SIGTERM (serviço do sistema) e Ctrl+C encerram depois do pedido em andamento.
+        for sinal in (signal.SIGINT, signal.SIGTERM):
+            with contextlib.suppress(NotImplementedError, AttributeError):
+                loop.add_signal_handler(sinal, parar.set)
+        await servir(
+            servico,
+            socket_unix=socket_unix,
+            porta=args.porta,
+            parar=parar,
+            ao_iniciar=lambda endereco: print(f"Atendendo em {endereco}", file=sys.stderr, flush=True),
+        )
+
+    try:
+        asyncio.run(executar())
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if cache:
+            cache.fechar()
+        if sufixos:
+            sufixos.fechar()
+    print(f"Serviço encerrado: {servico.pedidos} pedido(s).", file=sys.stderr)
+    return 0
+
+
+# ---------- Comando catalogo ----------
+def _cmd_catalogo(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    try:
+        catalogo = carregar_catalogo(args.arquivo) if args.arquivo else _fonte_catalogo(args, parser).atual()
+    except (OSError, ErroCatalogo) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    print(
+        f"Catálogo {catalogo.origem}: {len(catalogo.setores)} setor(es), "
+        f"{len(catalogo.eventos)} evento(s), {len(catalogo.funcionarios)} funcionário(s).",
+        file=sys.stderr,
+    )
+    if args.exportar:
+        exportar_catalogo(catalogo, args.exportar)
+        print(f"Exportado para {args.exportar}", file=sys.stderr)
+    return 0
+
+
+# ---------- Comandos do diário ----------
+def _cmd_recuperar(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    resultado = recuperar(args.diario)
+    print(resultado.resumo(), file=sys.stderr)
+    return 1 if resultado.erros else 0
+
+
+def _cmd_desfazer(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    resultado = desfazer(args.diario)
+    print(resultado.resumo(), file=sys.stderr)
+    return 1 if resultado.erros else 0
+
+
+# ---------- Parser ----------
+def _adicionar_campos(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--setor", default="", help="nome do setor (ex.: Financeiro)")
+    p.add_argument("--evento", default="", help="nome do evento (ex.: RCA360)")
+    p.add_argument("--funcionario", default="", help="nome do funcionário")
+    p.add_argument("--documento", default="", help="nome do documento (fica MAIÚSCULO e sem espaços)")
+    p.add_argument("--versao", default="", help="número da versão (vira vNN)")
+    p.add_argument("--catalogo", metavar="ARQUIVO", help="catálogo externo (.json, .toml ou .db) no lugar do configurado")
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="RenomeadorDeArquivos",
+        description="Renomeador de Arquivos — Instituto Walkyria Fernandes (modo linha de comando).",
+    )
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p = sub.add_parser(
+        "rename",
+        aliases=["renomear"],
+        help="renomeia arquivos na mesma pasta (-001, -002, ... em lote)",
+        description="Sem arquivos, --glob nem --pasta, lê os caminhos da entrada padrão (um por linha ou separados por NUL com -0).",
+    )
+    _adicionar_campos(p)
+    p.add_argument("arquivos", nargs="*", help="arquivos a renomear ('-' lê da entrada padrão)")
+    p.add_argument("--glob", action="append", default=[], metavar="PADRAO", help="padrão glob (aceita **); pode repetir")
+    p.add_argument("--pasta", action="append", default=[], metavar="DIR", help="renomeia os arquivos da pasta e subpastas (em fluxo); pode repetir")
+    p.add_argument("--incluir", action="append", default=[], metavar="GLOB", help="com --pasta: só arquivos que casam (nome, ou caminho relativo se tiver '/')")
+    p.add_argument("--excluir", action="append", default=[], metavar="GLOB", help="com --pasta: ignora arquivos e subpastas que casam")
+    p.add_argument("--ext", action="append", default=[], metavar="EXTS", help="com --pasta: extensões aceitas, ex.: pdf,docx")
+    p.add_argument("--profundidade", type=int, default=None, metavar="N", help="com --pasta: níveis de subpastas (0 = só a pasta)")
+    p.add_argument("-0", "--nulo", action="store_true", help="entrada padrão separada por NUL (find -print0)")
+    p.add_argument("--ordenar", action="store_true", help="ordena por nome como a interface (carrega a lista toda)")
+    p.add_argument(
+        "-j", "--tarefas", type=int, default=1, metavar="N",
+        help="renomeia até N pastas em paralelo (planeja pasta por pasta; padrão: 1)",
+    )
+    p.add_argument(
+        "--processos", type=int, nargs="?", const=0, default=None, metavar="N",
+        help="divide o lote por pasta entre N processos (sem N: um por núcleo) — para milhões de arquivos em muitas pastas",
+    )
+    p.add_argument(
+        "--duplicados",
+        choices=("pular", "avisar"),
+        help="antes do lote, procura arquivos com o mesmo conteúdo (tamanho + hash): pular as cópias ou só avisar",
+    )
+    p.add_argument(
+        "--data-do-arquivo",
+        action="store_true",
+        help="usa a data de cada arquivo (EXIF, propriedades do PDF/Office ou data de modificação) em vez da de hoje",
+    )
+    p.add_argument(
+        "--versao-do-nome",
+        action="store_true",
+        help="usa a versão escrita no nome atual (v2, rev 3, versão 4) quando --versao não for informada",
+    )
+    p.add_argument(
+        "--arquivar",
+        metavar="PASTA",
+        help="move os arquivos renomeados para PASTA (pode ser outro volume; numeração -001, -002, ... nela)",
+    )
+    p.add_argument("--verificar", action="store_true", help="com --arquivar: confere o hash de cada cópia antes de apagar a origem")
+    p.add_argument(
+        "--renumerar",
+        action="store_true",
+        help="numera a seleção inteira de uma vez: arquivos dela que já têm número (-001, -002) não empurram os outros "
+        "para números altos; trocas e ciclos passam por um nome temporário (lê a lista toda)",
+    )
+    p.add_argument(
+        "--caminhos-longos",
+        action="store_true",
+        help="Windows: usa caminhos \\\\?\\ e passa do limite de 259 caracteres (só o nome continua limitado a 255)",
+    )
+    p.add_argument("--substituir", action="store_true", help="com um único arquivo, substitui o destino se já existir")
+    p.add_argument("-v", "--verboso", action="store_true", help="imprime 'origem -> destino' para cada arquivo")
+    p.add_argument("--diario", metavar="ARQUIVO", help="grava o lote num diário JSON Lines (permite recuperar/desfazer)")
+    p.add_argument(
+        "--metricas",
+        action="store_true",
+        help="no fim, mostra arquivos/s, latência p50/p99 do renome e o tempo de cada etapa (sempre gravados no log)",
+    )
+    p.add_argument("--simular", action="store_true", help="só mostra o plano e os avisos (colisões, nomes encurtados, ...), sem renomear")
+    p.add_argument("--relatorio", metavar="ARQUIVO", help="com --simular: grava o plano completo em .csv ou .json")
+    p.set_defaults(func=_cmd_renomear)
+
+    p = sub.add_parser(
+        "vigiar",
+        aliases=["watch"],
+        help="vigia uma pasta e renomeia os arquivos que chegam",
+        description="Renomeia cada arquivo novo da pasta (-001, -002, ...) quando ele para de mudar. Ctrl+C encerra.",
+    )
+    p.add_argument("pasta", help="pasta vigiada (só o primeiro nível)")
+    _adicionar_campos(p)
+    p.add_argument("--perfil", metavar="ARQUIVO", help="perfil JSON com setor, evento, funcionario, documento e versao")
+    p.add_argument("--salvar-perfil", metavar="ARQUIVO", help="grava os campos em uso como perfil JSON")
+    p.add_argument("--estavel", type=float, default=2.0, metavar="S", help="segundos sem mudança antes de renomear (padrão: 2)")
+    p.add_argument("--intervalo", type=float, default=1.0, metavar="S", help="intervalo entre verificações (padrão: 1)")
+    p.add_argument("--polling", action="store_true", help="consulta a pasta em vez de usar inotify (use em compartilhamentos de rede)")
+    p.add_argument("--ignorar-existentes", action="store_true", help="não renomeia os arquivos que já estão na pasta ao iniciar")
+    p.add_argument("-v", "--verboso", action="store_true", help="imprime 'origem -> destino' para cada arquivo")
+    p.set_defaults(func=_cmd_vigiar)
+
+    p = sub.add_parser(
+        "servir",
+        aliases=["serve"],
+        help="serviço local para outras ferramentas: gerar nome, planejar e executar lotes",
+        description="JSON Lines sobre socket Unix (padrão: renomeador.sock na pasta de configuração) ou TCP em 127.0.0.1. "
+        "Catálogo e índices das pastas ficam em memória entre as chamadas. Ctrl+C encerra.",
+    )
+    p.add_argument("--socket", metavar="CAMINHO", help="socket Unix onde atender")
+    p.add_argument("--porta", type=int, metavar="N", help="atende em 127.0.0.1:N (no Windows; 0 = qualquer porta livre)")
+    p.add_argument("--catalogo", metavar="ARQUIVO", help="catálogo externo (.json, .toml ou .db) no lugar do configurado")
+    p.add_argument("-j", "--tarefas", type=int, default=4, metavar="N", help="pastas em paralelo em cada lote (padrão: 4)")
+    p.set_defaults(func=_cmd_servir)
+
+    p = sub.add_parser(
+        "catalogo",
+        aliases=["catalog"],
+        help="valida um catálogo ou exporta o atual para JSON",
+        description="Sem ARQUIVO, mostra o catálogo em uso (embutido ou o configurado).",
+    )
+    p.add_argument("arquivo", nargs="?", help="catálogo a validar (.json, .toml ou .db)")
+    p.add_argument("--catalogo", metavar="ARQUIVO", help=argparse.SUPPRESS)
+    p.add_argument("--exportar", metavar="DESTINO", help="grava o catálogo em JSON (ponto de partida para editar)")
+    p.set_defaults(func=_cmd_catalogo)
+
+    p = sub.add_parser("recuperar", aliases=["recover"], help="conclui um lote interrompido a partir do diário")
+    p.add_argument("diario", help="arquivo de diário (.jsonl)")
+    p.set_defaults(func=_cmd_recuperar)
+
+    p = sub.add_parser("desfazer", aliases=["undo"], help="reverte um lote a partir do diário")
+    p.add_argument("diario", help="arquivo de diário (.jsonl)")
+    p.set_defaults(func=_cmd_desfazer)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = criar_parser()
+    args = parser.parse_args(argv)
+    return args.func(args, parser)
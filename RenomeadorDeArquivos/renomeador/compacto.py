@@ -0,0 +1,116 @@
+"""
+Plano compacto — lotes enormes sem uma string de caminho por arquivo.
+
+Cada pasta e cada extensão é guardada uma única vez; por arquivo ficam só o
+id da pasta, o id da extensão, o radical do nome (num único buffer de bytes)
+e o número do sufixo, em ``array``. Os caminhos completos de origem e de
+destino são montados só quando alguém pede (na hora do ``os.replace``).
+"""
+
+import os
+from array import array
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from .nomes import PlanoNome
+from .numeracao import NumeradorLote
+
+SEM_NUMERO = 0  # arquivo ainda não planejado (ou sem nome possível)
+
+
+class PlanoCompacto:
+    """Sequência de arquivos (``len``, índice e iteração devolvem a origem) com o número planejado de cada um."""
+
+    __slots__ = ("pastas", "exts", "numeros", "_id_pasta", "_id_ext", "_pasta", "_ext", "_fim", "_radicais")
+
+    def __init__(self, arquivos: Iterable[str] = ()):
+        self.pastas: List[str] = []
+        self.exts: List[str] = []
+        self.numeros = array("I")
+        self._id_pasta: Dict[str, int] = {}
+        self._id_ext: Dict[str, int] = {}
+        self._pasta = array("I")
+        self._ext = array("I")
+        self._fim = array("Q")  # fim do radical de cada arquivo em _radicais
+        self._radicais = bytearray()
+        for arquivo in arquivos:
+            self.adicionar(arquivo)
+
+    def adicionar(self, caminho: str) -> None:
+        pasta, nome = os.path.split(caminho)
+        radical, ext = os.path.splitext(nome)
+        id_pasta = self._id_pasta.get(pasta)
+        if id_pasta is None:
+            id_pasta = self._id_pasta[pasta] = len(self.pastas)
+            self.pastas.append(pasta)
+        id_ext = self._id_ext.get(ext)
+        if id_ext is None:
+            id_ext = self._id_ext[ext] = len(self.exts)
+            self.exts.append(ext)
+        self._pasta.append(id_pasta)
+        self._ext.append(id_ext)
+        self._radicais += os.fsencode(radical)
+        self._fim.append(len(self._radicais))
+        self.numeros.append(SEM_NUMERO)
+
+    def com_pastas(self, converter: Callable[[str], str]) -> "PlanoCompacto":
+        """Cópia com cada pasta trocada por ``converter(pasta)`` — uma chamada por pasta, não por arquivo."""
+        novo = PlanoCompacto()
+        novo.pastas = [converter(p) for p in self.pastas]
+        novo._id_pasta = {p: i for i, p in enumerate(novo.pastas)}
+        novo.exts = list(self.exts)
+        novo._id_ext = dict(self._id_ext)
+        novo.numeros = array("I", self.numeros)
+        novo._pasta = array("I", self._pasta)
+        novo._ext = array("I", self._ext)
+        novo._fim = array("Q", self._fim)
+        novo._radicais = bytearray(self._radicais)
+        return novo
+
+    # ---------- Acesso ----------
+    def __len__(self) -> int:
+        return len(self._pasta)
+
+    def __getitem__(self, i: int) -> str:
+        return self.origem(i)
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self._pasta)):
+            yield self.origem(i)
+
+    def id_pasta(self, i: int) -> int:
+        return self._pasta[i]
+
+    def pasta(self, i: int) -> str:
+        return self.pastas[self._pasta[i]]
+
+    def ext(self, i: int) -> str:
+        return self.exts[self._ext[i]]
+
+    def nome(self, i: int) -> str:
+        inicio = self._fim[i - 1] if i else 0
+        return os.fsdecode(bytes(self._radicais[inicio:self._fim[i]])) + self.exts[self._ext[i]]
+
+    def origem(self, i: int) -> str:
+        return os.path.join(self.pastas[self._pasta[i]], self.nome(i))
+
+    def destino(self, plano: PlanoNome, i: int) -> Optional[str]:
+        n = self.numeros[i]
+        if n == SEM_NUMERO:
+            return None
+        pasta = self.pastas[self._pasta[i]]
+        nome = plano.nome_em(pasta, self.exts[self._ext[i]], n)
+        return os.path.join(pasta, nome) if nome else None
+
+    # ---------- Planejamento ----------
+    def planejar(self, plano: PlanoNome, inicio: int = 1, numerador: Optional[NumeradorLote] = None) -> None:
+        """Numera todos os arquivos (o ``i``-ésimo pede ``inicio + i``), como ``renomear_lote`` faria."""
+        numerador = numerador or NumeradorLote(plano)
+        numeros = self.numeros
+        for i in range(len(self._pasta)):
+            pasta = self.pastas[self._pasta[i]]
+            reserva = numerador.reservar_em(pasta, self.exts[self._ext[i]], inicio + i)
+            if not reserva:
+                numeros[i] = SEM_NUMERO
+                continue
+            numeros[i] = reserva[0]
+            numerador.confirmar_em(pasta, self.nome(i), reserva[1])
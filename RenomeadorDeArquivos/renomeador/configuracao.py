@@ -0,0 +1,145 @@
+"""
+Configuração do usuário — arquivo JSON na pasta de configuração do sistema.
+
+Lido uma vez (na primeira consulta) e gravado só quando algum valor muda. A
+gravação é atômica (arquivo temporário + ``os.replace``) e feita sob uma
+trava de arquivo entre processos, então duas instâncias abertas no mesmo
+perfil (inclusive perfil móvel) não corrompem nem apagam o que a outra salvou.
+"""
+
+import contextlib
+import datetime
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, Iterator, Optional, Tuple
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+NOME_APP = "RenomeadorDeArquivos"
+NOME_ARQUIVO = "config.json"
+# Versões antigas gravavam na pasta de trabalho; o arquivo é importado uma vez.
+CAMINHO_LEGADO = "renomeador_config.json"
+# Permite apontar outra pasta (testes, instalações gerenciadas).
+VARIAVEL_PASTA = "RENOMEADOR_CONFIG_DIR"
+
+
+def pasta_configuracao() -> str:
+    pasta = os.environ.get(VARIAVEL_PASTA)
+    if pasta:
+        return pasta
+    if os.name == "nt":
+        raiz = os.environ.get("APPDATA") or os.path.expanduser("~")
+    elif sys.platform == "darwin":
+        raiz = os.path.expanduser("~/Library/Application Support")
+    else:
+        raiz = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    return os.path.join(raiz, NOME_APP)
+
+
+@contextlib.contextmanager
+def _trava_arquivo(caminho: str) -> Iterator[None]:
+    """Trava exclusiva entre processos num arquivo ``.lock`` ao lado da configuração."""
+    with open(caminho, "a+b") as f:
+        if os.name == "nt":
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)  # tenta por ~10 s
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class Configuracao:
+    def __init__(self, pasta: Optional[str] = None):
+        self.pasta = pasta or pasta_configuracao()
+        self.caminho = os.path.join(self.pasta, NOME_ARQUIVO)
+        self._trava = threading.Lock()
+        self._dados: Optional[Dict[str, object]] = None
+        self._versao: Optional[Tuple[int, int, int]] = None  # (inode, mtime, tamanho) do que está em _dados
+
+    # ---------- Leitura ----------
+    def _versao_disco(self) -> Optional[Tuple[int, int, int]]:
+        # Cada gravação é um arquivo novo (os.replace): o inode muda mesmo quando
+        # o relógio grosso do sistema de arquivos repete o mtime e o tamanho é igual.
+        try:
+            st = os.stat(self.caminho)
+        except OSError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _ler(self, caminho: str) -> Dict[str, object]:
+        try:
+            with open(caminho, "r", encoding="utf-8") as f:
+                dados = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return dados if isinstance(dados, dict) else {}
+
+    def _carregar(self) -> Dict[str, object]:
+        if self._dados is None:
+            self._versao = self._versao_disco()
+            if self._versao is not None:
+                self._dados = self._ler(self.caminho)
+            else:
+                self._dados = self._ler(CAMINHO_LEGADO) if os.path.isfile(CAMINHO_LEGADO) else {}
+        return self._dados
+
+    def get(self, chave: str, padrao: object = None) -> object:
+        with self._trava:
+            return self._carregar().get(chave, padrao)
+
+    # ---------- Escrita ----------
+    def _gravar(self, dados: Dict[str, object]) -> None:
+        fd, temporario = tempfile.mkstemp(prefix=".config-", suffix=".tmp", dir=self.pasta)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(dados, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            for tentativa in range(5):
+                try:
+                    os.replace(temporario, self.caminho)
+                    break
+                except PermissionError:
+                    # Windows: outro processo lendo o arquivo neste instante.
+                    if tentativa == 4:
+                        raise
+                    time.sleep(0.05)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(temporario)
+            raise
+
+    def atualizar(self, valores: Dict[str, object], *, carimbo: Optional[str] = None) -> bool:
+        """Grava ``valores`` se algum mudou (e então ``carimbo`` recebe a data/hora). Devolve se gravou."""
+        with self._trava:
+            dados = self._carregar()
+            mudancas = {k: v for k, v in valores.items() if dados.get(k) != v}
+            if not mudancas:
+                return False
+            if carimbo:
+                mudancas[carimbo] = datetime.datetime.now().isoformat()
+            os.makedirs(self.pasta, exist_ok=True)
+            with _trava_arquivo(self.caminho + ".lock"):
+                # Outra instância gravou depois da nossa leitura: parte da versão dela.
+                versao = self._versao_disco()
+                if versao is not None and versao != self._versao:
+                    dados = self._dados = self._ler(self.caminho)
+                dados.update(mudancas)
+                self._gravar(dados)
+                self._versao = self._versao_disco()
+            return True
@@ -0,0 +1,477 @@
+"""
+Diário de lote — registro JSON Lines (só acrescenta) de cada origem -> destino.
+
+O plano de cada pasta é gravado e sincronizado (fsync) antes do primeiro
+``os.replace`` nela; as confirmações são sincronizadas em blocos. Se o
+processo morrer no meio, o diário e o estado das pastas bastam para concluir
+(``recuperar``) ou reverter (``desfazer``) o lote.
+
+Registros (um objeto JSON por linha):
+    {"tipo": "lote", "versao": 1, "criado": ..., "base": ...}
+    {"tipo": "plano", "i": 1, "o": origem, "d": destino}
+    {"tipo": "plano", "i": 4, "o": origem, "d": destino, "t": temporario}
+    {"tipo": "ciclo", "i": 4}
+    {"tipo": "feito", "i": 1, "d": destino}
+    {"tipo": "erro", "i": 2, "e": "mensagem"}
+    {"tipo": "cancelado", "i": 3}
+    {"tipo": "desfeito", "i": 1}
+    {"tipo": "pacote", "c": "lote.p1.jsonl"}
+    {"tipo": "fim"}
+
+Os planos vêm na ordem de execução. Um plano com ``"t"`` abre um ciclo do
+renome em duas fases (``trocas``): a origem vai para o temporário, os
+outros arquivos do ciclo andam, e o registro ``ciclo`` (sincronizado) marca
+que só falta temporário -> destino. Recuperar e desfazer seguem as mesmas
+três etapas: temporários, demais renomes, temporários de volta.
+
+Um registro ``pacote`` (modo ``processos`` do executor) aponta para o
+diário de um pacote, na mesma pasta, gravado antes de o pacote começar.
+Quando o pacote termina, o diário dele é copiado para este e apagado; o
+que sobrar depois de uma queda é lido junto com este (``ler_diario``) e
+copiado para ele antes de recuperar ou desfazer.
+"""
+
+import datetime
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Set
+
+from .lote import ResultadoLote
+from .mover import mover_arquivo
+from .numeracao import IndiceDiretorio
+
+VERSAO = 1
+
+PLANO = "plano"
+FEITO = "feito"
+ERRO = "erro"
+CANCELADO = "cancelado"
+DESFEITO = "desfeito"
+CICLO = "ciclo"
+PACOTE = "pacote"
+
+_RE_PACOTE = re.compile(r"^(.*)\.p\d+\.jsonl$")
+
+# Nomes POSIX que não são UTF-8 chegam com bytes soltos (``surrogateescape``);
+# vão para o diário como esses bytes e voltam no mesmo caminho.
+_ERROS_CODIFICACAO = "surrogateescape"
+
+
+class Diario:
+    """Escrita do diário com fsync em blocos (``lote_fsync`` registros ou ``intervalo_fsync`` s)."""
+
+    def __init__(self, caminho: str, *, lote_fsync: int = 256, intervalo_fsync: float = 0.5):
+        self.caminho = caminho
+        self.lote_fsync = lote_fsync
+        self.intervalo_fsync = intervalo_fsync
+        self._trava = threading.Lock()
+        self._pendentes = 0
+        self._ultimo_fsync = time.monotonic()
+        self._arquivo = open(caminho, "a", encoding="utf-8", errors=_ERROS_CODIFICACAO)
+
+    @classmethod
+    def criar(cls, caminho: str, base: str = "", **kwargs) -> "Diario":
+        """Novo diário em ``caminho`` com o registro de cabeçalho já sincronizado."""
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        diario = cls(caminho, **kwargs)
+        criado = datetime.datetime.now().isoformat()
+        diario._escrever({"tipo": "lote", "versao": VERSAO, "criado": criado, "base": base}, sincronizar=True)
+        return diario
+
+    # ---------- Escrita ----------
+    def _escrever(self, registro: dict, sincronizar: bool = False) -> None:
+        with self._trava:
+            self._arquivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+            self._pendentes += 1
+            if (
+                sincronizar
+                or self._pendentes >= self.lote_fsync
+                or time.monotonic() - self._ultimo_fsync >= self.intervalo_fsync
+            ):
+                self._sincronizar()
+
+    def _sincronizar(self) -> None:
+        self._arquivo.flush()
+        os.fsync(self._arquivo.fileno())
+        self._pendentes = 0
+        self._ultimo_fsync = time.monotonic()
+
+    def sincronizar(self) -> None:
+        with self._trava:
+            self._sincronizar()
+
+    def planejado(self, idx: int, origem: str, destino: str, temporario: Optional[str] = None) -> None:
+        registro = {"tipo": PLANO, "i": idx, "o": origem, "d": destino}
+        if temporario:
+            registro["t"] = temporario
+        self._escrever(registro)
+
+    def pacote(self, caminho: str) -> None:
+        """O pacote com diário em ``caminho`` (na mesma pasta) vai começar."""
+        self._escrever({"tipo": PACOTE, "c": os.path.basename(caminho)}, sincronizar=True)
+
+    def ciclo_fechado(self, idx: int) -> None:
+        """O resto do ciclo de ``idx`` já andou: só falta temporário -> destino."""
+        self._escrever({"tipo": CICLO, "i": idx}, sincronizar=True)
+
+    def concluido(self, idx: int, destino: str) -> None:
+        self._escrever({"tipo": FEITO, "i": idx, "d": destino})
+
+    def falhou(self, idx: int, erro: object) -> None:
+        self._escrever({"tipo": ERRO, "i": idx, "e": str(erro)})
+
+    def cancelado(self, idx: int) -> None:
+        self._escrever({"tipo": CANCELADO, "i": idx})
+
+    def desfeito(self, idx: int) -> None:
+        self._escrever({"tipo": DESFEITO, "i": idx})
+
+    def anexar(self, caminho: str) -> None:
+        """Copia os registros de outro diário do mesmo lote (sem cabeçalho e ``fim``) e sincroniza.
+
+        Usado pelo modo ``processos`` do executor: cada pacote grava o seu
+        diário e ele entra aqui inteiro quando o pacote termina. Até ser
+        apagado, o diário do pacote continua valendo sozinho para recuperar.
+        """
+        with self._trava, open(caminho, "r", encoding="utf-8", errors=_ERROS_CODIFICACAO) as f:
+            f.readline()  # cabeçalho
+            for linha in f:
+                if not linha.endswith("\n"):
+                    break  # cortada por uma queda no meio da escrita
+                if not linha.startswith('{"tipo": "fim"'):
+                    self._arquivo.write(linha)
+            self._sincronizar()
+
+    def fechar(self, terminado: bool = True) -> None:
+        if self._arquivo.closed:
+            return
+        if terminado:
+            self._escrever({"tipo": "fim"})
+        with self._trava:
+            self._sincronizar()
+            self._arquivo.close()
+
+    def __enter__(self) -> "Diario":
+        return self
+
+    def __exit__(self, tipo, *_) -> None:
+        self.fechar(terminado=tipo is None)
+
+
+def novo_caminho(pasta: str) -> str:
+    agora = datetime.datetime.now()
+    return os.path.join(pasta, f"lote-{agora.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.jsonl")
+
+
+# ---------- Leitura ----------
+class ItemDiario:
+    __slots__ = ("idx", "origem", "destino", "estado", "temporario", "ciclo_fechado")
+
+    def __init__(self, idx: int, origem: str, destino: str, temporario: Optional[str] = None):
+        self.idx = idx
+        self.origem = origem
+        self.destino = destino
+        self.estado = PLANO
+        self.temporario = temporario
+        self.ciclo_fechado = False
+
+
+class EstadoDiario:
+    def __init__(self) -> None:
+        self.itens: Dict[int, ItemDiario] = {}  # na ordem do primeiro plano de cada um (a de execução)
+        self.terminado = False
+
+    def pendentes(self) -> List[ItemDiario]:
+        return [it for it in self.itens.values() if it.estado == PLANO]
+
+
+def _registros(caminho: str) -> Iterator[dict]:
+    with open(caminho, "r", encoding="utf-8", errors=_ERROS_CODIFICACAO) as f:
+        for linha in f:
+            try:
+                yield json.loads(linha)
+            except ValueError:
+                # Última linha cortada por uma queda no meio da escrita.
+                return
+
+
+def _pacotes(caminho: str) -> List[str]:
+    """Diários de pacote citados em ``caminho`` que ainda existem (não foram copiados para ele)."""
+    pasta = os.path.dirname(caminho)
+    citados = (os.path.join(pasta, r["c"]) for r in _registros(caminho) if r.get("tipo") == PACOTE and r.get("c"))
+    return [c for c in citados if os.path.exists(c)]
+
+
+def _registros_do_lote(caminho: str) -> Iterator[dict]:
+    """Registros de ``caminho`` com os dos pacotes que ainda estão à parte, cada um no lugar do seu registro ``pacote``."""
+    pasta = os.path.dirname(caminho)
+    for r in _registros(caminho):
+        if r.get("tipo") != PACOTE:
+            yield r
+            continue
+        pacote = os.path.join(pasta, r.get("c") or "")
+        if r.get("c") and os.path.exists(pacote):
+            for rp in _registros(pacote):
+                if rp.get("tipo") not in ("lote", "fim"):  # o fim do pacote não é o do lote
+                    yield rp
+
+
+def _juntar_pacotes(caminho: str) -> None:
+    """Copia para ``caminho`` os diários de pacote que ficaram à parte (queda no meio do lote) e os apaga."""
+    pacotes = _pacotes(caminho)
+    if not pacotes:
+        return
+    diario = Diario(caminho)
+    try:
+        for pacote in pacotes:
+            diario.anexar(pacote)
+            os.remove(pacote)
+    finally:
+        diario.fechar(terminado=False)
+
+
+def ler_diario(caminho: str) -> EstadoDiario:
+    estado = EstadoDiario()
+    itens = estado.itens
+    for r in _registros_do_lote(caminho):
+        tipo = r.get("tipo")
+        if tipo == PLANO:
+            itens[r["i"]] = ItemDiario(r["i"], r["o"], r["d"], r.get("t"))
+        elif tipo == FEITO:
+            it = itens.get(r["i"])
+            if it:
+                it.estado = FEITO
+                it.destino = r.get("d", it.destino)
+        elif tipo in (ERRO, CANCELADO, DESFEITO):
+            it = itens.get(r["i"])
+            if it:
+                it.estado = tipo
+        elif tipo == CICLO:
+            it = itens.get(r["i"])
+            if it:
+                it.ciclo_fechado = True
+        elif tipo == "fim":
+            estado.terminado = True
+    return estado
+
+
+def _diarios(pasta: str) -> List[str]:
+    """Diários de lote da pasta; o de um pacote só aparece se o do lote dele não existe mais."""
+    if not os.path.isdir(pasta):
+        return []
+    nomes = {n for n in os.listdir(pasta) if n.endswith(".jsonl")}
+    diarios = []
+    for n in nomes:
+        m = _RE_PACOTE.match(n)
+        if m and m.group(1) + ".jsonl" in nomes:
+            continue
+        diarios.append(os.path.join(pasta, n))
+    return sorted(diarios)
+
+
+def diarios_incompletos(pasta: str, *, parado_ha: float = 120.0) -> List[str]:
+    """Diários sem o registro ``fim`` e sem escrita há ``parado_ha`` segundos.
+
+    Um lote ativo grava pelo menos a cada ``intervalo_fsync``; o limite evita
+    oferecer a recuperação de um lote que outra instância ainda está rodando.
+    """
+    agora = time.time()
+    incompletos = []
+    for caminho in _diarios(pasta):
+        try:
+            if agora - os.path.getmtime(caminho) >= parado_ha and not ler_diario(caminho).terminado:
+                incompletos.append(caminho)
+        except OSError:
+            pass
+    return incompletos
+
+
+def limpar_antigos(pasta: str, manter: int = 50) -> None:
+    """Apaga os diários terminados mais antigos, mantendo os ``manter`` mais recentes."""
+    for caminho in _diarios(pasta)[:-manter or None]:
+        try:
+            if ler_diario(caminho).terminado:
+                os.remove(caminho)
+        except OSError:
+            pass
+
+
+# ---------- Recuperação / desfazer ----------
+class _Existencia:
+    """Existência de arquivos via um ``os.scandir`` por pasta, em vez de um stat por arquivo."""
+
+    def __init__(self) -> None:
+        self._indices: Dict[str, IndiceDiretorio] = {}
+
+    def _indice(self, caminho: str) -> IndiceDiretorio:
+        d = os.path.dirname(caminho)
+        indice = self._indices.get(d)
+        if indice is None:
+            indice = self._indices[d] = IndiceDiretorio(d)
+        return indice
+
+    def existe(self, caminho: str) -> bool:
+        return self._indice(caminho).contem(os.path.basename(caminho))
+
+    def mover(self, origem: str, destino: str) -> None:
+        mover_arquivo(origem, destino)  # lote arquivado em outro volume: copia de volta
+        self._indice(origem).remover(os.path.basename(origem))
+        self._indice(destino).adicionar(os.path.basename(destino))
+
+
+def _ciclo_concluido(it: ItemDiario, fs: _Existencia) -> bool:
+    return it.estado == FEITO or (it.ciclo_fechado and fs.existe(it.destino) and not fs.existe(it.temporario or ""))
+
+
+def _feitos(itens: List[ItemDiario], fs: _Existencia) -> Set[int]:
+    """``idx`` dos renomes que aconteceram, pelo estado das pastas (o ``feito`` pode não ter chegado ao disco).
+
+    Origem e destino presentes ao mesmo tempo é ambíguo numa cadeia (o
+    destino era a origem de outro arquivo do lote): o renome aconteceu se o
+    arquivo que ia para a origem dele também andou. Esse vem depois no
+    diário (ou abre o ciclo), então basta percorrer os itens de trás para frente.
+    """
+    por_destino = {os.path.normcase(it.destino): it for it in itens}
+    # Quem abre um ciclo vem antes dos outros no diário, mas é o último a chegar ao destino.
+    feitos: Set[int] = {it.idx for it in itens if it.temporario and _ciclo_concluido(it, fs)}
+    for it in reversed(itens):
+        if it.temporario:
+            continue
+        if it.estado == FEITO:
+            feitos.add(it.idx)
+            continue
+        origem_existe = fs.existe(it.origem)
+        if not fs.existe(it.destino):
+            continue
+        if not origem_existe:
+            feitos.add(it.idx)
+        else:
+            seguinte = por_destino.get(os.path.normcase(it.origem))
+            if seguinte is not None and seguinte.idx in feitos:
+                feitos.add(it.idx)
+    return feitos
+
+
+def recuperar(caminho: str) -> ResultadoLote:
+    """Conclui um lote interrompido: refaz os renomes planejados que não aconteceram."""
+    _juntar_pacotes(caminho)
+    estado = ler_diario(caminho)
+    fs = _Existencia()
+    resultado = ResultadoLote()
+    pendentes = estado.pendentes()
+    ciclos = [it for it in pendentes if it.temporario]
+    feitos = _feitos(pendentes, fs)
+    with Diario(caminho) as diario:
+        # 1) Ciclo que nem começou: a origem sai da frente, para o temporário.
+        for it in ciclos:
+            if not it.ciclo_fechado and not fs.existe(it.temporario) and fs.existe(it.origem):
+                try:
+                    fs.mover(it.origem, it.temporario)
+                except OSError:
+                    pass  # o ciclo fica em conflito e nada mais dele anda
+
+        # 2) Demais renomes, na ordem em que foram planejados.
+        for it in pendentes:
+            if it.temporario:
+                continue
+            resultado.total += 1
+            if it.idx in feitos:
+                diario.concluido(it.idx, it.destino)
+                resultado.ok += 1
+            elif fs.existe(it.origem) and not fs.existe(it.destino):
+                try:
+                    fs.mover(it.origem, it.destino)
+                except OSError as e:
+                    diario.falhou(it.idx, e)
+                    resultado.erros.append(os.path.basename(it.origem))
+                    continue
+                diario.concluido(it.idx, it.destino)
+                resultado.ok += 1
+            else:
+                diario.falhou(it.idx, "origem e destino em conflito")
+                resultado.erros.append(os.path.basename(it.origem))
+
+        # 3) Temporários para o destino, que o resto do ciclo desocupou.
+        for it in ciclos:
+            resultado.total += 1
+            temporario_existe = fs.existe(it.temporario)
+            destino_existe = fs.existe(it.destino)
+            if temporario_existe and not destino_existe:
+                try:
+                    fs.mover(it.temporario, it.destino)
+                except OSError as e:
+                    diario.falhou(it.idx, e)
+                    resultado.erros.append(os.path.basename(it.origem))
+                    continue
+            elif not (it.ciclo_fechado and destino_existe and not temporario_existe):
+                diario.falhou(it.idx, "origem e destino em conflito")
+                resultado.erros.append(os.path.basename(it.origem))
+                continue
+            diario.concluido(it.idx, it.destino)
+            resultado.ok += 1
+    return resultado
+
+
+def desfazer(caminho: str) -> ResultadoLote:
+    """Reverte um lote (em ordem inversa), inclusive um interrompido no meio."""
+    _juntar_pacotes(caminho)
+    estado = ler_diario(caminho)
+    fs = _Existencia()
+    resultado = ResultadoLote()
+    itens = [it for it in estado.itens.values() if it.estado in (FEITO, PLANO)]
+    feitos = _feitos(itens, fs)
+    itens.reverse()
+    ciclos = [it for it in itens if it.temporario]
+    with Diario(caminho) as diario:
+        # 1) Quem fechou um ciclo sai do destino para o temporário.
+        for it in ciclos:
+            if it.idx in feitos and fs.existe(it.destino) and not fs.existe(it.temporario):
+                try:
+                    fs.mover(it.destino, it.temporario)
+                except OSError:
+                    pass  # o resto do ciclo encontra a origem ocupada e não volta
+
+        # 2) Demais renomes, do último para o primeiro.
+        for it in itens:
+            if it.temporario:
+                continue
+            if it.estado == PLANO and it.idx not in feitos:
+                # Renome planejado que nunca aconteceu: nada a desfazer.
+                continue
+            destino_existe = fs.existe(it.destino)
+            origem_existe = fs.existe(it.origem)
+            resultado.total += 1
+            # Falhas não são gravadas: o item continua "feito" para uma nova tentativa.
+            if not destino_existe or origem_existe:
+                resultado.erros.append(os.path.basename(it.destino))
+                continue
+            try:
+                fs.mover(it.destino, it.origem)
+            except OSError:
+                resultado.erros.append(os.path.basename(it.destino))
+                continue
+            diario.desfeito(it.idx)
+            resultado.ok += 1
+
+        # 3) Temporários de volta à origem.
+        for it in ciclos:
+            temporario_existe = fs.existe(it.temporario)
+            if not temporario_existe and it.estado == PLANO:
+                continue  # o ciclo nem começou
+            resultado.total += 1
+            if not temporario_existe or fs.existe(it.origem):
+                resultado.erros.append(os.path.basename(it.destino))
+                continue
+            try:
+                fs.mover(it.temporario, it.origem)
+            except OSError:
+                resultado.erros.append(os.path.basename(it.destino))
+                continue
+            diario.desfeito(it.idx)
+            resultado.ok += 1
+    return resultado
@@ -0,0 +1,216 @@
+"""
+Conteúdo repetido — o mesmo arquivo selecionado mais de uma vez (ex.: o mesmo PDF em duas pastas).
+
+Três peneiras, cada uma só sobre quem passou da anterior: tamanho (um stat),
+hash parcial (início e fim do arquivo) e hash completo em fluxo (com mmap nos
+arquivos grandes). Os hashes rodam num pool de threads (o hashlib solta o
+GIL) e ficam num cache SQLite por (caminho, tamanho, mtime): repetir a
+verificação na mesma seleção quase não lê disco.
+"""
+
+import hashlib
+import mmap
+import os
+import sqlite3
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .cache import CacheArquivos, caminho_cache, chave_caminho
+from .compacto import PlanoCompacto
+
+NOME_CACHE = "hashes.db"
+
+_PARCIAL = 64 * 1024  # lido do início e do fim no hash parcial
+_BLOCO = 1024 * 1024
+_MMAP_MINIMO = 16 * 1024 * 1024  # a partir daqui o hash completo lê via mmap
+
+# (caminho, tamanho, mtime_ns)
+_Candidato = Tuple[str, int, int]
+
+
+# ---------- Hashes ----------
+def _novo_hash():
+    return hashlib.blake2b(digest_size=20)
+
+
+def hash_completo(caminho: str, tamanho: int) -> str:
+    h = _novo_hash()
+    with open(caminho, "rb") as f:
+        if tamanho >= _MMAP_MINIMO:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m, memoryview(m) as mv:
+                for i in range(0, len(mv), 8 * _BLOCO):
+                    h.update(mv[i:i + 8 * _BLOCO])
+        else:
+            buf = bytearray(_BLOCO)
+            with memoryview(buf) as mv:
+                while True:
+                    n = f.readinto(buf)
+                    if not n:
+                        break
+                    h.update(mv[:n])
+    return h.hexdigest()
+
+
+def hash_parcial(caminho: str, tamanho: int) -> str:
+    """Início + fim do arquivo; arquivos pequenos são lidos inteiros (é o próprio hash completo)."""
+    if tamanho <= 2 * _PARCIAL:
+        return hash_completo(caminho, tamanho)
+    h = _novo_hash()
+    with open(caminho, "rb") as f:
+        h.update(f.read(_PARCIAL))
+        f.seek(-_PARCIAL, os.SEEK_END)
+        h.update(f.read(_PARCIAL))
+    return h.hexdigest()
+
+
+# ---------- Cache ----------
+class CacheHashes(CacheArquivos):
+    """Hashes ``(parcial, completo)`` já calculados; qualquer um dos dois pode faltar."""
+
+    def __init__(self, caminho: str):
+        super().__init__(caminho, "hashes", ("parcial", "completo"))
+
+
+def abrir_cache(pasta_config: str) -> Optional[CacheHashes]:
+    """Cache em ``<configuração>/cache``; ``None`` se não der para abrir (segue sem cache)."""
+    try:
+        return CacheHashes(caminho_cache(pasta_config, NOME_CACHE))
+    except (OSError, sqlite3.Error):
+        return None
+
+
+# ---------- Detecção ----------
+class ResultadoDuplicados:
+    __slots__ = ("repetidos", "grupos", "lidos", "do_cache")
+
+    def __init__(self) -> None:
+        # cópia -> primeiro arquivo da seleção com o mesmo conteúdo
+        self.repetidos: Dict[str, str] = {}
+        self.grupos: List[List[str]] = []
+        self.lidos = 0  # hashes calculados lendo o disco
+        self.do_cache = 0  # hashes reaproveitados do cache
+
+    def resumo(self, limite: int = 10) -> str:
+        if not self.repetidos:
+            return "Nenhum conteúdo repetido."
+        msg = f"Conteúdo repetido: {len(self.repetidos)} arquivo(s) iguais a outro da seleção."
+        itens = list(self.repetidos.items())
+        for copia, original in itens[:limite]:
+            msg += f"\n- {os.path.basename(copia)} = {os.path.basename(original)}"
+        if len(itens) > limite:
+            msg += f"\n... (+{len(itens) - limite})"
+        return msg
+
+
+def _agrupar(
+    candidatos: List[_Candidato],
+    calcular: Callable[[str, int], str],
+    indice: int,
+    cache: Optional[CacheHashes],
+    pool: ThreadPoolExecutor,
+    cancelar: Optional[threading.Event],
+    resultado: ResultadoDuplicados,
+) -> Dict[Tuple[int, str], List[_Candidato]]:
+    """Agrupa por (tamanho, hash); ``indice`` 0 = parcial, 1 = completo."""
+    hashes: Dict[str, str] = {}
+    faltam: List[_Candidato] = []
+    for c in candidatos:
+        linha = cache.consultar(chave_caminho(c[0]), c[1], c[2]) if cache else None
+        guardado = linha[indice] if linha else None
+        if guardado:
+            hashes[c[0]] = guardado
+            resultado.do_cache += 1
+        else:
+            faltam.append(c)
+
+    def calcular_um(c: _Candidato) -> Optional[str]:
+        if cancelar is not None and cancelar.is_set():
+            return None
+        try:
+            return calcular(c[0], c[1])
+        except (OSError, ValueError):
+            return None  # ilegível: fica de fora (não é tratado como repetido)
+
+    for c, h in zip(faltam, pool.map(calcular_um, faltam)):
+        if h is None:
+            continue
+        hashes[c[0]] = h
+        resultado.lidos += 1
+        if cache:
+            chave = chave_caminho(c[0])
+            parcial, completo = cache.consultar(chave, c[1], c[2]) or (None, None)
+            if indice == 0:
+                # Arquivo pequeno: o parcial já é o hash do conteúdo inteiro.
+                parcial, completo = h, (h if c[1] <= 2 * _PARCIAL else completo)
+            else:
+                completo = h
+            cache.guardar(chave, c[1], c[2], (parcial, completo))
+
+    grupos: Dict[Tuple[int, str], List[_Candidato]] = {}
+    for c in candidatos:
+        h = hashes.get(c[0])
+        if h is not None:
+            grupos.setdefault((c[1], h), []).append(c)
+    return grupos
+
+
+def encontrar_duplicados(
+    arquivos: Iterable[str],
+    *,
+    tarefas: int = 4,
+    cache: Optional[CacheHashes] = None,
+    cancelar: Optional[threading.Event] = None,
+) -> ResultadoDuplicados:
+    """Arquivos de ``arquivos`` com o mesmo conteúdo de um anterior da seleção.
+
+    O primeiro de cada grupo (na ordem da seleção) é o original; os demais
+    vão para ``repetidos``. Arquivos vazios não contam como repetidos.
+    """
+    resultado = ResultadoDuplicados()
+    ordem: Dict[str, int] = {}
+    por_tamanho: Dict[int, List[_Candidato]] = {}
+    vistos = set()
+    for pos, caminho in enumerate(arquivos):
+        chave = os.path.normcase(os.path.abspath(caminho))
+        if chave in vistos:
+            continue
+        vistos.add(chave)
+        try:
+            st = os.stat(caminho)
+        except OSError:
+            continue
+        if not stat.S_ISREG(st.st_mode) or st.st_size == 0:
+            continue
+        ordem[caminho] = pos
+        por_tamanho.setdefault(st.st_size, []).append((caminho, st.st_size, st.st_mtime_ns))
+
+    candidatos = [c for grupo in por_tamanho.values() if len(grupo) > 1 for c in grupo]
+    del por_tamanho
+    if not candidatos:
+        return resultado
+
+    with ThreadPoolExecutor(max_workers=max(1, tarefas)) as pool:
+        parciais = _agrupar(candidatos, hash_parcial, 0, cache, pool, cancelar, resultado)
+        candidatos = [c for grupo in parciais.values() if len(grupo) > 1 for c in grupo]
+        grandes = [c for c in candidatos if c[1] > 2 * _PARCIAL]
+        # Nos pequenos o parcial já é o conteúdo inteiro: só os grandes são relidos.
+        completos = {k: g for k, g in parciais.items() if len(g) > 1 and k[0] <= 2 * _PARCIAL}
+        if grandes and not (cancelar is not None and cancelar.is_set()):
+            completos.update(_agrupar(grandes, hash_completo, 1, cache, pool, cancelar, resultado))
+    if cache:
+        cache.salvar()
+
+    for grupo in completos.values():
+        if len(grupo) > 1:
+            resultado.grupos.append(sorted((c[0] for c in grupo), key=ordem.__getitem__))
+    resultado.grupos.sort(key=lambda g: ordem[g[0]])
+    copias = sorted(((c, g[0]) for g in resultado.grupos for c in g[1:]), key=lambda par: ordem[par[0]])
+    resultado.repetidos = dict(copias)
+    return resultado
+
+
+def sem_repetidos(arquivos: Iterable[str], repetidos: Dict[str, str]) -> PlanoCompacto:
+    """``arquivos`` na mesma ordem, sem as cópias de ``repetidos``."""
+    return PlanoCompacto(a for a in arquivos if a not in repetidos)
@@ -0,0 +1,652 @@
+"""
+Executor de lote — planeja os destinos e roda os ``os.replace`` em paralelo.
+
+O lote é dividido em fatias por pasta de destino (arquivos consecutivos da
+mesma pasta). Cada fatia é planejada por inteiro e depois executada em ordem
+numa única thread, então a numeração de uma pasta é a mesma da execução
+serial; pastas diferentes andam em paralelo (útil em compartilhamentos de
+rede). A entrada é consumida em fluxo: só as fatias em andamento ficam em
+memória, cada uma num ``PlanoCompacto`` (sem uma string de caminho por
+arquivo), o que mantém estável o uso de memória ao varrer árvores enormes.
+
+Com ``duas_fases``, cada grupo é planejado inteiro de uma vez (``trocas``):
+os nomes da própria seleção não bloqueiam a numeração, e trocas e ciclos
+entre eles são resolvidos com um nome temporário por ciclo.
+
+Com ``processos``, o processo principal só agrupa os caminhos por pasta e
+os envia em pacotes (alguns milhares de arquivos, pastas inteiras) para um
+``ProcessPoolExecutor``: montar nomes e listar pastas deixa de disputar um
+único interpretador. Cada pasta está em um
+pacote por vez, então quem numera uma pasta é sempre um processo só. Cada
+pacote grava o próprio diário ao lado do diário do lote, e o processo
+principal o cita no diário do lote antes do envio e o copia para ele
+quando o pacote volta.
+"""
+
+import collections
+import concurrent.futures
+import contextlib
+import errno
+import logging
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .compacto import SEM_NUMERO, PlanoCompacto
+from .diario import Diario
+from .lote import ResultadoLote
+from .metricas import DIARIO, PLANEJAMENTO, RENUMERACAO, MetricasLote, log, medir_iteracao, registrar_erro
+from .nomes import PlanoNome
+from .numeracao import CacheSufixos, NumeradorLote
+from .trocas import AUSENTE, CAMINHO_REPETIDO, PlanoTrocas, planejar_trocas
+
+RENOMEADO = "renomeado"
+ERRO = "erro"
+CANCELADO = "cancelado"
+
+# Arquivos por pacote no modo ``processos`` (uma pasta nunca é dividida).
+_ARQUIVOS_POR_PACOTE = 4096
+
+
+class EventoLote:
+    __slots__ = ("tipo", "idx", "origem", "destino", "erro")
+
+    def __init__(self, tipo: str, idx: int, origem: str, destino: Optional[str] = None, erro: Optional[BaseException] = None):
+        self.tipo = tipo
+        self.idx = idx
+        self.origem = origem
+        self.destino = destino
+        self.erro = erro
+
+    def __repr__(self) -> str:
+        return f"EventoLote({self.tipo!r}, {self.idx}, {self.origem!r}, {self.destino!r})"
+
+
+class _ParcialFatia:
+    """Contagem de uma fatia; guarda só os erros, não cada arquivo."""
+
+    __slots__ = ("total", "ok", "cancelados", "erros", "encurtados", "metricas")
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.ok = 0
+        self.cancelados = 0
+        self.erros: List[Tuple[int, str]] = []
+        self.encurtados: List[Tuple[int, str]] = []  # (idx, destino) com o nome encurtado
+        self.metricas = MetricasLote()
+
+    def juntar(self, outra: "_ParcialFatia") -> None:
+        self.total += outra.total
+        self.ok += outra.ok
+        self.cancelados += outra.cancelados
+        self.erros.extend(outra.erros)
+        self.encurtados.extend(outra.encurtados)
+        self.metricas.juntar(outra.metricas)
+
+
+class ExecutorLote:
+    """Renomeia um lote com até ``max_tarefas`` pastas em paralelo.
+
+    ``ao_evento`` é chamado a partir das threads de trabalho com um
+    ``EventoLote`` por arquivo; quem precisa da thread principal (Tk)
+    deve repassar os eventos por uma fila.
+
+    ``cancelar`` é conferido antes de cada ``os.replace``: ao cancelar, cada
+    arquivo fica renomeado ou intacto, nunca pela metade.
+
+    Com ``diario``, o plano de cada fatia é gravado (e sincronizado) antes do
+    primeiro renome dela e cada resultado é registrado em seguida.
+
+    O ``ResultadoLote`` traz as ``metricas`` do lote (tempo por etapa, erros
+    por tipo, latência dos renomes); os erros também vão para o log.
+
+    ``executar_grupos`` roda vários lotes com nomes-base diferentes (um plano
+    por grupo, cada um numerado a partir de 1) no mesmo pool e no mesmo
+    diário; ``idx`` dos eventos segue a posição no conjunto dos grupos.
+
+    ``duas_fases`` troca a numeração arquivo a arquivo pelo plano do grupo
+    inteiro (``trocas.planejar_trocas``): arquivos da seleção que já têm
+    número (``-001``, ``-002``...) ficam com o seu, mesmo que um ocupe o
+    destino do outro. Os eventos de uma pasta saem na ordem de execução das
+    cadeias, não na de ``idx``.
+
+    ``sufixos`` (``numeracao.CacheSufixos``) guarda os números usados em cada
+    pasta entre um lote e outro: uma pasta que não mudou por fora desde o
+    último lote não é listada de novo. Não vale para ``duas_fases``, que
+    precisa dos nomes da pasta para saber quem é da seleção.
+
+    ``processos`` (> 1) executa as fatias em processos separados, em pacotes
+    de pastas inteiras; ``max_tarefas`` deixa de valer. Os eventos chegam
+    na thread que chamou ``executar``, um pacote de cada vez, e os erros vão
+    para o log por ela. Não vale para ``duas_fases``.
+    """
+
+    def __init__(
+        self,
+        plano: PlanoNome,
+        *,
+        max_tarefas: int = 4,
+        ao_evento: Optional[Callable[[EventoLote], None]] = None,
+        cancelar: Optional[threading.Event] = None,
+        diario: Optional[Diario] = None,
+        duas_fases: bool = False,
+        sufixos: Optional[CacheSufixos] = None,
+        processos: int = 0,
+    ):
+        self.plano = plano
+        self.max_tarefas = max(1, max_tarefas)
+        self.processos = max(0, processos)
+        self.duas_fases = duas_fases
+        self.sufixos = sufixos
+        self.ao_evento = ao_evento
+        self.cancelar = cancelar or threading.Event()
+        self.diario = diario
+
+    # ---------- Planejamento ----------
+    @staticmethod
+    def _fatias(arquivos: Iterable[str]) -> Iterator[Tuple[str, int, PlanoCompacto]]:
+        """Agrupa arquivos consecutivos da mesma pasta: (pasta, ``idx`` do primeiro, arquivos)."""
+        atual = ""
+        inicio = 1
+        fatia: Optional[PlanoCompacto] = None
+        for idx, origem in enumerate(arquivos, start=1):
+            diretorio = os.path.dirname(origem)
+            if fatia is None or diretorio != atual:
+                if fatia is not None:
+                    yield atual, inicio, fatia
+                fatia = PlanoCompacto()
+                atual = diretorio
+                inicio = idx
+            fatia.adicionar(origem)
+        if fatia is not None:
+            yield atual, inicio, fatia
+
+    @staticmethod
+    def _blocos(arquivos: Iterable[str]) -> Iterator[Tuple[str, int, List[str]]]:
+        """Como ``_fatias``, com listas de caminhos: no modo ``processos`` a fatia é montada no processo do pacote."""
+        atual = ""
+        inicio = 1
+        bloco: Optional[List[str]] = None
+        dirname = os.path.dirname
+        for idx, origem in enumerate(arquivos, start=1):
+            diretorio = dirname(origem)
+            if bloco is None or diretorio != atual:
+                if bloco is not None:
+                    yield atual, inicio, bloco
+                bloco = []
+                atual = diretorio
+                inicio = idx
+            bloco.append(origem)
+        if bloco is not None:
+            yield atual, inicio, bloco
+
+    # ---------- Execução ----------
+    def _emitir(self, evento: EventoLote) -> None:
+        if self.ao_evento:
+            self.ao_evento(evento)
+
+    def _executar_fatia(self, plano: PlanoNome, inicio: int, fatia: PlanoCompacto, deslocamento: int = 0) -> _ParcialFatia:
+        """Numera a partir de ``inicio``; ``deslocamento`` só entra no ``idx`` de eventos e diário."""
+        parcial = _ParcialFatia()
+        metricas = parcial.metricas
+        relogio = time.perf_counter
+        planejador = NumeradorLote(plano, sufixos=self.sufixos)
+        with metricas.etapa(PLANEJAMENTO):
+            fatia.planejar(plano, inicio, planejador)
+        if self.diario:
+            with metricas.etapa(DIARIO):
+                for i in range(len(fatia)):
+                    destino = fatia.destino(plano, i)
+                    if destino:
+                        self.diario.planejado(deslocamento + inicio + i, fatia.origem(i), destino)
+                self.diario.sincronizar()
+
+        # O plano supõe que tudo dá certo; depois da primeira falha na pasta,
+        # o restante da fatia é renumerado a partir de uma nova leitura dela.
+        numerador: Optional[NumeradorLote] = None
+        for i in range(len(fatia)):
+            numero = inicio + i
+            idx = deslocamento + numero
+            origem = fatia.origem(i)
+            parcial.total += 1
+            if self.cancelar.is_set():
+                parcial.cancelados += 1
+                if self.diario and fatia.numeros[i] != SEM_NUMERO:
+                    self.diario.cancelado(idx)
+                self._emitir(EventoLote(CANCELADO, idx, origem))
+                continue
+            if numerador is None:
+                destino = fatia.destino(plano, i)
+                numero_destino = fatia.numeros[i]
+            else:
+                t0 = relogio()
+                reserva = numerador.reservar(origem, numero)
+                destino = reserva[1] if reserva else None
+                numero_destino = reserva[0] if reserva else SEM_NUMERO
+                metricas.somar(RENUMERACAO, relogio() - t0)
+                metricas.contar("renumerados")
+                if reserva and reserva[0] != numero:
+                    metricas.contar("colisoes")
+                if self.diario and destino:
+                    with metricas.etapa(DIARIO):
+                        self.diario.planejado(idx, origem, destino)
+                        self.diario.sincronizar()
+            if not destino:
+                parcial.erros.append((idx, origem))
+                metricas.erro("SemNome")
+                registrar_erro(origem, None, None, idx)
+                self._emitir(EventoLote(ERRO, idx, origem))
+                continue
+            t0 = relogio()
+            try:
+                os.replace(origem, destino)
+            except Exception as e:
+                parcial.erros.append((idx, origem))
+                metricas.erro(type(e).__name__)
+                registrar_erro(origem, destino, e, idx)
+                if self.diario:
+                    self.diario.falhou(idx, e)
+                self._emitir(EventoLote(ERRO, idx, origem, destino, e))
+                if numerador is None:
+                    numerador = NumeradorLote(plano)
+                continue
+            t1 = relogio()
+            metricas.renomeado(t1 - t0)
+            if numerador is not None:
+                numerador.confirmar(origem, destino)
+            parcial.ok += 1
+            if plano.encurtado(os.path.basename(destino), fatia.ext(i), numero_destino):
+                parcial.encurtados.append((idx, destino))
+            if self.diario:
+                self.diario.concluido(idx, destino)
+                metricas.somar(DIARIO, relogio() - t1)
+            self._emitir(EventoLote(RENOMEADO, idx, origem, destino))
+        if not parcial.erros and not parcial.cancelados:
+            # Tudo como planejado: o estado da pasta é o do plano.
+            planejador.gravar()
+        return parcial
+
+    def _executar_cadeias(
+        self, plano: PlanoNome, fatia: PlanoCompacto, trocas: PlanoTrocas, id_pasta: int, deslocamento: int
+    ) -> _ParcialFatia:
+        """Renomeia as cadeias de uma pasta; ``idx`` é ``deslocamento + 1 + posição``."""
+        parcial = _ParcialFatia()
+        metricas = parcial.metricas
+        relogio = time.perf_counter
+        pasta = fatia.pastas[id_pasta]
+
+        def falhou(idx: int, origem: str, destino: Optional[str], erro: Optional[BaseException]) -> None:
+            parcial.erros.append((idx, origem))
+            metricas.erro(type(erro).__name__ if erro is not None else "SemNome")
+            registrar_erro(origem, destino, erro, idx)
+            if self.diario and destino:
+                self.diario.falhou(idx, erro)
+            self._emitir(EventoLote(ERRO, idx, origem, destino, erro))
+
+        def renomeado(idx: int, origem: str, destino: str) -> None:
+            parcial.ok += 1
+            i = idx - deslocamento - 1
+            if plano.encurtado(os.path.basename(destino), fatia.ext(i), fatia.numeros[i]):
+                parcial.encurtados.append((idx, destino))
+            if self.diario and origem != destino:
+                t0 = relogio()
+                self.diario.concluido(idx, destino)
+                metricas.somar(DIARIO, relogio() - t0)
+            self._emitir(EventoLote(RENOMEADO, idx, origem, destino))
+
+        def renomear(origem: str, destino: str) -> None:
+            t0 = relogio()
+            if origem != destino:  # já tem o nome certo: nada a fazer
+                os.replace(origem, destino)
+            metricas.renomeado(relogio() - t0)
+
+        for cadeia in trocas.cadeias(id_pasta):
+            parcial.total += len(cadeia)
+            if self.cancelar.is_set():
+                # Cadeia começada vai até o fim: o cancelamento só vale entre cadeias.
+                for i in cadeia:
+                    parcial.cancelados += 1
+                    if self.diario and fatia.numeros[i] != SEM_NUMERO:
+                        self.diario.cancelado(deslocamento + 1 + i)
+                    self._emitir(EventoLote(CANCELADO, deslocamento + 1 + i, fatia.origem(i)))
+                continue
+
+            primeiro = cadeia[0]
+            temporario = trocas.temporarios.get(primeiro)
+            if temporario is None and fatia.numeros[primeiro] == SEM_NUMERO:
+                # Sozinho e sem destino: origem que não existe (ou repetida) ou plano sem nome.
+                origem = fatia.origem(primeiro)
+                erro: Optional[BaseException] = None
+                if trocas.situacao[primeiro] in (AUSENTE, CAMINHO_REPETIDO):
+                    erro = FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), origem)
+                falhou(deslocamento + 1 + primeiro, origem, None, erro)
+                continue
+
+            # Num ciclo, o primeiro sai da frente e os eventos esperam o ciclo fechar ou ser desfeito.
+            adiados: List[Tuple[int, str, str]] = []
+            bloqueio: Optional[BaseException] = None
+            membros = cadeia
+            if temporario is not None:
+                membros = cadeia[1:]
+                origem = fatia.origem(primeiro)
+                caminho_temporario = os.path.join(pasta, temporario)
+                try:
+                    os.replace(origem, caminho_temporario)
+                except Exception as e:
+                    bloqueio = e
+            for i in membros:
+                idx = deslocamento + 1 + i
+                origem = fatia.origem(i)
+                destino = fatia.destino(plano, i) or ""  # quem está numa cadeia tem número
+                if bloqueio is not None:
+                    # O destino ainda é a origem de quem não andou: não pode ser substituído.
+                    falhou(idx, origem, destino, FileExistsError(errno.EEXIST, "destino ainda ocupado", destino))
+                    continue
+                try:
+                    renomear(origem, destino)
+                except Exception as e:
+                    bloqueio = e
+                    falhou(idx, origem, destino, e)
+                    continue
+                if temporario is None:
+                    renomeado(idx, origem, destino)
+                else:
+                    adiados.append((idx, origem, destino))
+            if temporario is None:
+                continue
+
+            idx = deslocamento + 1 + primeiro
+            origem = fatia.origem(primeiro)
+            destino = fatia.destino(plano, primeiro) or ""
+            if bloqueio is None:
+                try:
+                    if self.diario:
+                        self.diario.ciclo_fechado(idx)
+                    renomear(caminho_temporario, destino)
+                except Exception as e:
+                    bloqueio = e
+                else:
+                    for evento in adiados:
+                        renomeado(*evento)
+                    renomeado(idx, origem, destino)
+                    continue
+            # Ciclo incompleto: desfaz o que andou (do último para o primeiro) e
+            # devolve o primeiro à origem. Se algum não voltar, o que ainda está
+            # no destino fica lá, e o primeiro, no temporário (ver o log/diário).
+            desfeito = True
+            for idx_membro, origem_membro, destino_membro in reversed(adiados):
+                if desfeito:
+                    try:
+                        os.replace(destino_membro, origem_membro)
+                    except Exception:
+                        desfeito = False
+                    else:
+                        falhou(idx_membro, origem_membro, destino_membro, bloqueio)
+                        continue
+                renomeado(idx_membro, origem_membro, destino_membro)
+            if not os.path.exists(caminho_temporario):
+                falhou(idx, origem, destino, bloqueio)  # nem chegou a sair da origem
+                continue
+            if not desfeito:
+                falhou(idx, origem, caminho_temporario, bloqueio)
+                continue
+            try:
+                os.replace(caminho_temporario, origem)
+            except Exception as e:
+                falhou(idx, origem, caminho_temporario, e)
+            else:
+                falhou(idx, origem, destino, bloqueio)
+        return parcial
+
+    def _executar_em_duas_fases(
+        self, grupos: List[Tuple[PlanoNome, Iterable[str]]], metricas: MetricasLote, absorver: Callable[[_ParcialFatia], None]
+    ) -> None:
+        """Planeja cada grupo inteiro e renomeia as pastas dele em paralelo; grupos em sequência."""
+        limite = 2 * self.max_tarefas
+        deslocamento = 0
+        with ThreadPoolExecutor(max_workers=self.max_tarefas) as pool:
+            for plano, arquivos in grupos:
+                if self.cancelar.is_set():
+                    break
+                # O grafo precisa do grupo inteiro; o PlanoCompacto o mantém pequeno.
+                fatia = arquivos if isinstance(arquivos, PlanoCompacto) else PlanoCompacto(medir_iteracao(arquivos, metricas))
+                with metricas.etapa(PLANEJAMENTO):
+                    trocas = planejar_trocas(plano, fatia)
+                if trocas.ciclos:
+                    metricas.contar("ciclos", trocas.ciclos)
+                if self.diario:
+                    with metricas.etapa(DIARIO):
+                        for id_pasta, cadeia in trocas:
+                            pasta = fatia.pastas[id_pasta]
+                            for i in cadeia:
+                                origem, destino = fatia.origem(i), fatia.destino(plano, i)
+                                if destino and destino != origem:  # quem já tem o nome certo não entra
+                                    temporario = trocas.temporarios.get(i)
+                                    self.diario.planejado(
+                                        deslocamento + 1 + i,
+                                        origem,
+                                        destino,
+                                        os.path.join(pasta, temporario) if temporario else None,
+                                    )
+                        self.diario.sincronizar()
+                # Cadeias só ligam arquivos da mesma pasta: uma tarefa por pasta.
+                em_voo: Deque["Future[_ParcialFatia]"] = collections.deque()
+                for id_pasta in trocas.ordens:
+                    while len(em_voo) >= limite:
+                        absorver(em_voo.popleft().result())
+                    em_voo.append(pool.submit(self._executar_cadeias, plano, fatia, trocas, id_pasta, deslocamento))
+                while em_voo:
+                    absorver(em_voo.popleft().result())
+                deslocamento += len(fatia)
+
+    def _executar_em_processos(
+        self, blocos: Iterable[Tuple[str, PlanoNome, int, List[str], int]], absorver: Callable[[_ParcialFatia], None]
+    ) -> None:
+        """Junta blocos (pastas) em pacotes e os executa em ``processos`` processos; resultados na ordem de envio."""
+        parar = multiprocessing.Event()
+        raiz_diario = os.path.splitext(self.diario.caminho)[0] if self.diario else None
+        com_eventos = self.ao_evento is not None
+        limite = 2 * self.processos
+        em_voo: Deque[Tuple[Set[str], Optional[str], "Future[Tuple[_ParcialFatia, List[tuple]]]"]] = collections.deque()
+        ultimo_da_pasta: Dict[str, "Future[Tuple[_ParcialFatia, List[tuple]]]"] = {}
+        enviados = 0
+
+        def esperar(fut: "Future[Tuple[_ParcialFatia, List[tuple]]]") -> Tuple[_ParcialFatia, List[tuple]]:
+            # O cancelamento chega aos processos pelo ``parar``; aqui só é repassado.
+            while True:
+                if self.cancelar.is_set():
+                    parar.set()
+                try:
+                    return fut.result(timeout=0.2)
+                except concurrent.futures.TimeoutError:
+                    pass
+
+        def concluir_mais_antigo() -> None:
+            pastas, caminho_diario, fut = em_voo.popleft()
+            parcial, eventos = esperar(fut)
+            if caminho_diario and self.diario:
+                with parcial.metricas.etapa(DIARIO):
+                    self.diario.anexar(caminho_diario)
+                    os.remove(caminho_diario)
+            for tipo, idx, origem, destino, erro in eventos:
+                if tipo == ERRO:
+                    registrar_erro(origem, destino, erro, idx)
+                if com_eventos:
+                    self._emitir(EventoLote(tipo, idx, origem, destino, erro))
+            absorver(parcial)
+            for pasta in pastas:
+                if ultimo_da_pasta.get(pasta) is fut:
+                    del ultimo_da_pasta[pasta]
+
+        with ProcessPoolExecutor(
+            # No Windows o pool não passa de 61 processos.
+            max_workers=min(self.processos, 61) if os.name == "nt" else self.processos,
+            initializer=_iniciar_processo,
+            initargs=(parar, self.sufixos.caminho if self.sufixos else None),
+        ) as pool:
+
+            def enviar(pacote: List[Tuple[PlanoNome, int, List[str], int]], pastas: Set[str]) -> None:
+                nonlocal enviados
+                # Pasta que ainda está num pacote anterior: a numeração depende dele.
+                for pasta in pastas:
+                    anterior = ultimo_da_pasta.get(pasta)
+                    if anterior is not None:
+                        esperar(anterior)
+                while len(em_voo) >= limite:
+                    concluir_mais_antigo()
+                enviados += 1
+                caminho_diario = f"{raiz_diario}.p{enviados}.jsonl" if raiz_diario else None
+                if caminho_diario and self.diario:
+                    # Antes do envio: depois de uma queda, o diário do lote leva ao do pacote.
+                    self.diario.pacote(caminho_diario)
+                fut = pool.submit(_executar_pacote, pacote, caminho_diario, self.plano.base, com_eventos)
+                em_voo.append((pastas, caminho_diario, fut))
+                for pasta in pastas:
+                    ultimo_da_pasta[pasta] = fut
+
+            pacote: List[Tuple[PlanoNome, int, List[str], int]] = []
+            pastas: Set[str] = set()
+            arquivos = 0
+            for diretorio, plano, inicio, bloco, deslocamento in blocos:
+                if self.cancelar.is_set():
+                    break
+                pacote.append((plano, inicio, bloco, deslocamento))
+                pastas.add(diretorio)
+                arquivos += len(bloco)
+                if arquivos >= _ARQUIVOS_POR_PACOTE:
+                    enviar(pacote, pastas)
+                    pacote, pastas, arquivos = [], set(), 0
+            if pacote and not self.cancelar.is_set():
+                enviar(pacote, pastas)
+            while em_voo:
+                concluir_mais_antigo()
+
+    def executar(self, arquivos: Iterable[str]) -> ResultadoLote:
+        return self.executar_grupos([(self.plano, arquivos)])
+
+    def executar_grupos(self, grupos: Iterable[Tuple[PlanoNome, Iterable[str]]]) -> ResultadoLote:
+        """Executa os grupos em sequência; pastas de grupos diferentes também andam em paralelo."""
+        grupos = list(grupos)
+        resultado = ResultadoLote()
+        metricas = resultado.metricas = MetricasLote()
+        erros: List[Tuple[int, str]] = []
+        encurtados: List[Tuple[int, str]] = []
+
+        def absorver(parcial: _ParcialFatia) -> None:
+            resultado.total += parcial.total
+            resultado.ok += parcial.ok
+            resultado.cancelados += parcial.cancelados
+            erros.extend(parcial.erros)
+            encurtados.extend(parcial.encurtados)
+            metricas.juntar(parcial.metricas)
+
+        def fatias(agrupar: Callable[..., Iterator[Tuple[str, int, Any]]] = self._fatias) -> Iterator[tuple]:
+            """(pasta, plano, início, fatia, deslocamento); ``agrupar`` é ``_fatias`` ou ``_blocos``."""
+            deslocamento = 0
+            for plano, arquivos in grupos:
+                ultimo = 0
+                for diretorio, inicio, fatia in agrupar(medir_iteracao(arquivos, metricas)):
+                    yield diretorio, plano, inicio, fatia, deslocamento
+                    ultimo = inicio + len(fatia) - 1
+                deslocamento += ultimo
+
+        if self.duas_fases:
+            self._executar_em_duas_fases(grupos, metricas, absorver)
+        elif self.processos > 1:
+            self._executar_em_processos(fatias(self._blocos), absorver)
+        elif self.max_tarefas == 1:
+            for _, plano, inicio, fatia, deslocamento in fatias():
+                if self.cancelar.is_set():
+                    break
+                absorver(self._executar_fatia(plano, inicio, fatia, deslocamento))
+        else:
+            limite = 2 * self.max_tarefas
+            em_voo: Deque[Tuple[str, "Future[_ParcialFatia]"]] = collections.deque()
+            ultima_da_pasta: Dict[str, "Future[_ParcialFatia]"] = {}
+
+            def concluir_mais_antiga() -> None:
+                diretorio, fut = em_voo.popleft()
+                absorver(fut.result())
+                if ultima_da_pasta.get(diretorio) is fut:
+                    del ultima_da_pasta[diretorio]
+
+            with ThreadPoolExecutor(max_workers=self.max_tarefas) as pool:
+                for diretorio, plano, inicio, fatia, deslocamento in fatias():
+                    if self.cancelar.is_set():
+                        break
+                    # Pasta que reaparece depois: a numeração depende da fatia anterior.
+                    anterior = ultima_da_pasta.get(diretorio)
+                    if anterior is not None:
+                        anterior.result()
+                    while len(em_voo) >= limite:
+                        concluir_mais_antiga()
+                    fut = pool.submit(self._executar_fatia, plano, inicio, fatia, deslocamento)
+                    em_voo.append((diretorio, fut))
+                    ultima_da_pasta[diretorio] = fut
+                while em_voo:
+                    concluir_mais_antiga()
+
+        if self.cancelar.is_set() and all(hasattr(arquivos, "__len__") for _, arquivos in grupos):
+            # Lista conhecida (interface): o que nem chegou a ser planejado também ficou intacto.
+            restantes = sum(len(arquivos) for _, arquivos in grupos) - resultado.total  # type: ignore[arg-type]
+            resultado.cancelados += restantes
+            resultado.total += restantes
+
+        if self.sufixos:
+            self.sufixos.salvar()
+        erros.sort()
+        resultado.erros = [os.path.basename(origem) for _, origem in erros]
+        encurtados.sort()
+        resultado.encurtados = [destino for _, destino in encurtados]
+        metricas.encerrar()
+        return resultado
+
+
+# ---------- Processos ----------
+# Estado de cada processo do modo ``processos``, montado por ``_iniciar_processo``.
+_parar_processo: Any = None
+_sufixos_processo: Optional[CacheSufixos] = None
+
+
+def _iniciar_processo(parar: Any, caminho_sufixos: Optional[str]) -> None:
+    global _parar_processo, _sufixos_processo
+    _parar_processo = parar
+    # Erros vão para o log pelo processo principal: um arquivo com rotação, um escritor só.
+    for handler in list(log.handlers):
+        log.removeHandler(handler)
+    log.addHandler(logging.NullHandler())
+    _sufixos_processo = None
+    if caminho_sufixos:
+        try:
+            _sufixos_processo = CacheSufixos(caminho_sufixos)
+        except (OSError, sqlite3.Error):
+            pass
+
+
+def _executar_pacote(
+    pacote: List[Tuple[PlanoNome, int, List[str], int]], caminho_diario: Optional[str], base: str, com_eventos: bool
+) -> Tuple[_ParcialFatia, List[tuple]]:
+    """Executa as fatias de um pacote em ordem; devolve a contagem e os eventos (só erros sem ``com_eventos``)."""
+    parcial = _ParcialFatia()
+    eventos: List[tuple] = []
+
+    def coletar(ev: EventoLote) -> None:
+        if com_eventos or ev.tipo == ERRO:
+            eventos.append((ev.tipo, ev.idx, ev.origem, ev.destino, ev.erro))
+
+    with (Diario.criar(caminho_diario, base) if caminho_diario else contextlib.nullcontext()) as diario:
+        executor = ExecutorLote(
+            pacote[0][0], max_tarefas=1, ao_evento=coletar, cancelar=_parar_processo, diario=diario, sufixos=_sufixos_processo
+        )
+        for plano, inicio, bloco, deslocamento in pacote:
+            parcial.juntar(executor._executar_fatia(plano, inicio, PlanoCompacto(bloco), deslocamento))
+    if _sufixos_processo is not None:
+        try:
+            _sufixos_processo.salvar()
+        except sqlite3.Error:
+            pass  # cache ocupado por outro processo: a pasta só é listada de novo no próximo lote
+    return parcial, eventos
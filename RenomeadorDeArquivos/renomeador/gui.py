@@ -0,0 +1,1465 @@
+"""
+Interface Tk do Renomeador de Arquivos Corporativo.
+"""
+
+import itertools
+import os
+import queue
+import sys
+import threading
+import time
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from .arquivamento import ArquivadorLote
+from .catalogo import Catalogo, FonteCatalogo, IndicePrefixo, caminho_catalogo
+from .compacto import PlanoCompacto
+from .configuracao import Configuracao
+from .diario import Diario, desfazer, diarios_incompletos, limpar_antigos, novo_caminho, recuperar
+from .duplicados import ResultadoDuplicados, abrir_cache, encontrar_duplicados, sem_repetidos
+from .executor import CANCELADO, ERRO, RENOMEADO, EventoLote, ExecutorLote
+from .imagens import TAMANHOS, caminho_reduzido
+from .lote import ResultadoLote
+from .metadados import (
+    CacheMetadados,
+    Metadados,
+    PlanosPorArquivo,
+    agrupar_por_plano,
+    extrair_lote,
+    metadados_de,
+    planos_dos_arquivos,
+)
+from .metadados import abrir_cache as abrir_cache_metadados
+from .metricas import configurar_log, registrar_lote
+from .mover import mover_arquivo
+from .nomes import PLACEHOLDER_DOCUMENTO, PLACEHOLDER_VERSAO, PlanoNome, caminho_longo, data_atual
+from .numeracao import CacheSufixos
+from .numeracao import abrir_cache as abrir_cache_sufixos
+from .simulacao import escrever_relatorio, simular
+from .varredura import TIPOS_ARQUIVO, FiltroArquivos, extensoes_de_padroes, varrer
+
+
+_PREVIEW_ATRASO_MS = 150  # pausa na digitação antes de recalcular o preview
+_PREVIEW_BLOCO = 50  # nomes gerados por vez na lista do lote
+_CATALOGO_INTERVALO_MS = 3000  # conferência do arquivo de catálogo (recarga a quente)
+_SUGESTOES_MAX = 30  # opções na lista filtrada enquanto se digita
+# Relatório do tempo de cada fase da abertura (também: RenomeadorDeArquivos.py --tempos).
+VARIAVEL_TEMPOS = "RENOMEADOR_TEMPOS_INICIO"
+_TECLAS_NAVEGACAO = {"Up", "Down", "Left", "Right", "Home", "End", "Tab", "Return", "Escape",
+                     "Shift_L", "Shift_R", "Control_L", "Control_R", "Alt_L", "Alt_R"}
+
+
+def resource_path(rel_path: str) -> str:
+    base = getattr(sys, "_MEIPASS", os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return os.path.join(base, rel_path)
+
+
+class TemposInicio:
+    """Tempo de cada fase da abertura, desde ``inicio`` (``time.perf_counter``)."""
+
+    def __init__(self, inicio: Optional[float] = None):
+        self.inicio = time.perf_counter() if inicio is None else inicio
+        self.fases: List[Tuple[str, float]] = []
+        self._ultimo = self.inicio
+
+    def marcar(self, fase: str) -> None:
+        agora = time.perf_counter()
+        self.fases.append((fase, agora - self._ultimo))
+        self._ultimo = agora
+
+    def relatorio(self) -> str:
+        linhas = [f"{fase:<28} {seg * 1000:8.1f} ms" for fase, seg in self.fases]
+        linhas.append(f"{'total':<28} {(self._ultimo - self.inicio) * 1000:8.1f} ms")
+        return "\n".join(linhas)
+
+
+class RenomeadorArquivosApp(tk.Tk):
+    def __init__(self, tempos: Optional[TemposInicio] = None):
+        if tempos:
+            tempos.marcar("importações")
+        super().__init__()
+        if tempos:
+            tempos.marcar("tk.Tk()")
+        for fase in (
+            self._configurar_janela,
+            self._inicializar_variaveis,
+            self._carregar_logo,
+            self._configurar_icone,
+            self._configurar_estilo,
+            self._criar_interface,
+            self._carregar_configuracoes,
+        ):
+            fase()
+            if tempos:
+                tempos.marcar(fase.__name__)
+        if tempos:
+            # Primeira volta do mainloop: a janela já foi desenhada.
+            self.after(0, self._relatar_tempos, tempos)
+        self.after(200, self._mostrar_tutorial_se_necessario)
+        self.after(400, self._verificar_lotes_interrompidos)
+        self.after(_CATALOGO_INTERVALO_MS, self._verificar_catalogo)
+
+    def _relatar_tempos(self, tempos: TemposInicio) -> None:
+        self.update_idletasks()
+        tempos.marcar("primeira exibição")
+        relatorio = tempos.relatorio()
+        if sys.stderr:  # executável sem console não tem stderr
+            print(relatorio, file=sys.stderr)
+        try:
+            with open(os.path.join(self.config.pasta, "tempos_inicio.txt"), "a", encoding="utf-8") as f:
+                f.write(f"# {time.strftime('%Y-%m-%d %H:%M:%S')}\n{relatorio}\n")
+        except OSError:
+            pass
+
+    # ---------- Configuração básica ----------
+    def _configurar_janela(self) -> None:
+        self.title("Instituto Walkyria Fernandes - Renomeador de Arquivos")
+        self.configure(bg="#F0FFFC")
+        w, h = 550, 700
+        self.geometry(f"{w}x{h}+{(self.winfo_screenwidth()-w)//2}+{(self.winfo_screenheight()-h)//2}")
+        self.resizable(False, False)
+
+    def _inicializar_variaveis(self) -> None:
+        self.config = Configuracao()
+        self.pasta_diarios = os.path.join(self.config.pasta, "diarios")
+        configurar_log(self.config.pasta)
+
+        self.setor_selecionado = tk.StringVar()
+        self.funcionario_selecionado = tk.StringVar()
+        self.evento_selecionado = tk.StringVar()
+        self.nome_documento = tk.StringVar()
+        self.versao_arquivo = tk.StringVar()
+        self.caminho_arquivo = tk.StringVar()
+        self.pular_repetidos = tk.BooleanVar(value=False)
+        # Renumerar a seleção inteira de uma vez (quem já tem -001, -002 fica com o seu número).
+        self.renumerar = tk.BooleanVar(value=False)
+        # Data e versão de cada arquivo (EXIF/propriedades/mtime e "v2" no nome) no lugar das do formulário.
+        self.data_do_arquivo = tk.BooleanVar(value=False)
+        self.versao_do_nome = tk.BooleanVar(value=False)
+        # Arquivar: renomeia e move para outra pasta (outro volume, inclusive), com a cópia conferida.
+        self.arquivar = tk.BooleanVar(value=False)
+        self.pasta_arquivo = ""
+        # Windows: caminhos \\?\ (sem o limite de 259); só pelo arquivo de configuração.
+        self.caminhos_longos = False
+
+        self.ultimo_diretorio = os.path.expanduser("~")
+        # Seleção guardada compacta (pastas/extensões uma vez só) — seleções enormes.
+        self.arquivos_selecionados = PlanoCompacto()
+        # Modo pasta: (raiz, filtro) varrido em fluxo, sem montar a lista inteira.
+        self.pasta_selecionada: Optional[Tuple[str, FiltroArquivos]] = None
+        self.tutorial_v1_shown = False
+
+        # Lote em andamento (thread de trabalho -> fila -> self.after)
+        self._fila_lote: "queue.Queue[tuple]" = queue.Queue()
+        self._cancelar_lote: Optional[threading.Event] = None
+        self._fechar_ao_terminar = False
+        self._lote_feitos = 0
+        self._lote_total = 0
+        self._lote_fase = ""  # etapa antes dos renomes (ex.: procurar conteúdo repetido)
+
+        # Preview: recalcula só o que mudou, depois de uma pausa na digitação.
+        self._preview_after: Optional[str] = None
+        self._plano_cache: Optional[tuple] = None
+        self._planos_arquivo_cache: Optional[tuple] = None
+        self._cache_metadados: Optional[CacheMetadados] = None
+        self._cache_sufixos: Optional[CacheSufixos] = None
+        self._preview_posicoes: Dict[str, int] = {}  # nome-base -> arquivos já listados com ele
+        self._preview_lista_chave: Optional[tuple] = None
+        self._preview_lista_gerados = 0
+        self._preview_fonte: Optional[Iterator[str]] = None
+        self._selecao_versao = 0
+        # Data/versão de cada arquivo para o preview, lidas numa thread (nunca no laço do Tk).
+        self._metadados_lidos: Dict[str, Optional[Metadados]] = {}
+        self._metadados_versao = 0  # ``_selecao_versao`` de quando ``_metadados_lidos`` foi preenchido
+        self._metadados_pedidos: Set[str] = set()
+        self._preview_geracao = 0  # muda a cada vez que a lista do preview recomeça
+        self._preview_leitura: Optional[int] = None  # geração da lista com um bloco sendo lido
+
+        # Catálogo externo (se houver), relido quando o arquivo muda.
+        self.fonte_catalogo = FonteCatalogo(caminho_catalogo(self.config.pasta, self.config.get("catalogo")))
+        self._aplicar_catalogo(self.fonte_catalogo.atual())
+
+    def _aplicar_catalogo(self, catalogo: Catalogo) -> None:
+        self.catalogo = catalogo
+        self.setores: Dict[str, str] = catalogo.setores
+        self.eventos: Dict[str, str] = catalogo.eventos
+        self.funcionarios: List[str] = catalogo.funcionarios
+        self._conjunto_funcionarios = frozenset(catalogo.funcionarios)
+
+    def _imagem(self, original: str) -> Optional[str]:
+        """PNG já reduzido de ``assets/original`` (PIL só entra se faltar no pacote e no cache)."""
+        origem = resource_path(os.path.join("assets", original))
+        return caminho_reduzido(origem, TAMANHOS[original], os.path.join(self.config.pasta, "cache"))
+
+    def _carregar_logo(self) -> None:
+        self.logo_image = None
+        try:
+            p = self._imagem("logo.png")
+            if p:
+                self.logo_image = tk.PhotoImage(file=p)
+        except Exception:
+            self.logo_image = None
+
+    # ---------- Ícone (taskbar + título) ----------
+    def _configurar_icone(self) -> None:
+        ico_path = resource_path(os.path.join("assets", "logo.ico"))
+        png_path = resource_path(os.path.join("assets", "logo.png"))
+
+        if sys.platform.startswith("win") and os.path.exists(ico_path):
+            try:
+                self.iconbitmap(default=ico_path)
+            except Exception:
+                pass
+            try:
+                import ctypes
+                ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID("WF.RenomeadorArquivos")
+            except Exception:
+                pass
+            try:
+                tk_im = tk.PhotoImage(file=self._imagem("logo.ico"))
+                self.iconphoto(True, tk_im)
+                self._icon_ref = tk_im
+            except Exception:
+                pass
+        elif os.path.exists(png_path):
+            try:
+                tk_im = tk.PhotoImage(file=self._imagem("logo.ico") or png_path)
+                self.iconphoto(True, tk_im)
+                self._icon_ref = tk_im
+            except Exception:
+                pass
+
+    # ---------- Estilo ----------
+    def _configurar_estilo(self) -> None:
+        self.style = ttk.Style()
+        self.style.theme_use("clam")
+
+        self.cores = {
+            "verde_principal": "#009475",
+            "verde_escuro": "#002927",
+            "verde_fundo": "#F0FFFC",
+            "branco": "#FFFFFF",
+            "cinza_claro": "#F8FFFE",
+            "cinza_medio": "#A0B5B1",
+            "cinza_escuro": "#1A1A1A",
+            "accent": "#00C896",
+            "sombra": "#E0F5F1",
+        }
+
+        font_title = ("Segoe UI Black", 16, "bold")
+        font_subtitle = ("Segoe UI Semibold", 12, "bold")
+        font_text = ("Segoe UI", 11)
+        font_button = ("Segoe UI Semibold", 11, "bold")
+
+        self.style.configure("Main.TFrame", background=self.cores["verde_fundo"])
+        self.style.configure(
+            "Logo.TLabel",
+            font=("Arial Black", 24, "bold"),
+            foreground=self.cores["verde_principal"],
+            background=self.cores["verde_fundo"],
+        )
+        self.style.configure("Title.TLabel", font=font_title, foreground=self.cores["verde_escuro"], background=self.cores["verde_fundo"])
+        self.style.configure("Subtitle.TLabel", font=font_subtitle, foreground=self.cores["verde_principal"], background=self.cores["verde_fundo"])
+        self.style.configure("Normal.TLabel", font=font_text, foreground=self.cores["cinza_escuro"], background=self.cores["verde_fundo"])
+        self.style.configure("Normal.TCheckbutton", font=font_text, foreground=self.cores["cinza_escuro"], background=self.cores["verde_fundo"])
+
+        self.style.configure(
+            "Premium.TCombobox",
+            fieldbackground=self.cores["branco"],
+            borderwidth=3,
+            relief="solid",
+            font=font_text,
+            padding=8,
+        )
+        self.style.map("Premium.TCombobox", fieldbackground=[("focus", self.cores["cinza_claro"]), ("readonly", self.cores["branco"])])
+
+        self.style.configure(
+            "Premium.TEntry",
+            fieldbackground=self.cores["branco"],
+            borderwidth=3,
+            relief="solid",
+            font=font_text,
+            padding=8,
+        )
+        self.style.map("Premium.TEntry", fieldbackground=[("focus", self.cores["cinza_claro"])])
+
+        self.style.configure(
+            "Primary.TButton",
+            font=font_button,
+            foreground=self.cores["branco"],
+            background=self.cores["verde_principal"],
+            borderwidth=0,
+            relief="flat",
+            padding=(20, 12),
+        )
+        self.style.map("Primary.TButton", background=[("active", self.cores["accent"]), ("pressed", self.cores["verde_escuro"])])
+
+        self.style.configure(
+            "Secondary.TButton",
+            font=font_text,
+            foreground=self.cores["verde_principal"],
+            background=self.cores["branco"],
+            borderwidth=2,
+            relief="solid",
+            padding=(15, 8),
+        )
+        self.style.map("Secondary.TButton", background=[("active", self.cores["cinza_claro"]), ("pressed", self.cores["sombra"])])
+
+        self.style.configure(
+            "Help.TButton",
+            font=("Segoe UI", 9),
+            foreground=self.cores["verde_principal"],
+            background=self.cores["branco"],
+            borderwidth=1,
+            relief="solid",
+            padding=(2, 0),
+        )
+        self.style.map("Help.TButton", background=[("active", self.cores["cinza_claro"]), ("pressed", self.cores["sombra"])])
+
+        self.style.configure("Preview.TFrame", background=self.cores["branco"], relief="solid", borderwidth=3)
+
+        self.style.configure(
+            "Premium.Horizontal.TProgressbar",
+            troughcolor=self.cores["sombra"],
+            background=self.cores["verde_principal"],
+            bordercolor=self.cores["sombra"],
+            lightcolor=self.cores["accent"],
+            darkcolor=self.cores["verde_principal"],
+        )
+
+    # ---------- UI ----------
+    def _criar_interface(self) -> None:
+        self.frame_principal = ttk.Frame(self, style="Main.TFrame", padding="15")
+        self.frame_principal.grid(row=0, column=0, sticky="nsew")
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+        self.frame_principal.columnconfigure(1, weight=1)
+
+        self._criar_cabecalho()
+        self._criar_secao_data()
+        self._criar_secao_setor()
+        self._criar_secao_funcionario()
+        self._criar_secao_documento()
+        self._criar_secao_versao()
+        self._criar_secao_evento()
+        self._criar_secao_arquivo()
+        self._criar_secao_preview()
+        self._criar_secao_botoes()
+
+    def _criar_cabecalho(self) -> None:
+        header = ttk.Frame(self.frame_principal, style="Main.TFrame")
+        header.grid(row=0, column=0, columnspan=2, pady=(0, 20), sticky="ew")
+        header.columnconfigure(1, weight=1)
+
+        logo_widget = ttk.Label(header, image=self.logo_image, style="Logo.TLabel") if self.logo_image else ttk.Label(header, text="WF", style="Logo.TLabel")
+        logo_widget.grid(row=0, column=0, rowspan=2, padx=(0, 15), sticky="w")
+
+        titles = ttk.Frame(header, style="Main.TFrame")
+        titles.grid(row=0, column=1, sticky="ew")
+        ttk.Label(titles, text="Renomeador de Arquivos", style="Title.TLabel").grid(row=0, column=0, sticky="w")
+        ttk.Label(titles, text="Instituto Walkyria Fernandes", style="Subtitle.TLabel").grid(row=1, column=0, sticky="w")
+
+        self.btn_ajuda = ttk.Button(header, text="?", command=self._mostrar_tutorial, style="Help.TButton", width=1, cursor="hand2", takefocus=False)
+        header.update_idletasks()
+        self.btn_ajuda.place(relx=0.985, rely=0.10, anchor="ne")
+
+    def _criar_secao_data(self) -> None:
+        ttk.Label(self.frame_principal, text="📅 Data:", style="Normal.TLabel").grid(row=1, column=0, sticky="w", pady=3)
+        frame_data = ttk.Frame(self.frame_principal, style="Main.TFrame")
+        frame_data.grid(row=1, column=1, sticky="ew", pady=3)
+        ttk.Label(
+            frame_data,
+            text=self._obter_data_atual(),
+            font=("Consolas", 10, "bold"),
+            foreground=self.cores["verde_principal"],
+            background=self.cores["verde_fundo"],
+        ).grid(row=0, column=0, sticky="w")
+        ttk.Checkbutton(
+            frame_data,
+            text="usar a data de cada arquivo",
+            variable=self.data_do_arquivo,
+            command=self._agendar_preview,
+            style="Normal.TCheckbutton",
+        ).grid(row=0, column=1, sticky="w", padx=(12, 0))
+
+    def _criar_secao_setor(self) -> None:
+        ttk.Label(self.frame_principal, text="🏢 Setor:", style="Normal.TLabel").grid(row=2, column=0, sticky="w", pady=3)
+        self.combo_setor = ttk.Combobox(self.frame_principal, textvariable=self.setor_selecionado, values=list(self.setores.keys()), style="Premium.TCombobox", width=25)
+        self.combo_setor.grid(row=2, column=1, sticky="ew", pady=3)
+        self.combo_setor.bind("<<ComboboxSelected>>", self._agendar_preview)
+        self._configurar_busca(self.combo_setor, self.setor_selecionado, lambda: self.catalogo.busca_setores)
+
+    def _criar_secao_funcionario(self) -> None:
+        ttk.Label(self.frame_principal, text="👤 Funcionário:", style="Normal.TLabel").grid(row=3, column=0, sticky="w", pady=3)
+        self.combo_funcionario = ttk.Combobox(self.frame_principal, textvariable=self.funcionario_selecionado, values=self.funcionarios, style="Premium.TCombobox", width=25)
+        self.combo_funcionario.grid(row=3, column=1, sticky="ew", pady=3)
+        self.combo_funcionario.bind("<<ComboboxSelected>>", self._agendar_preview)
+        self._configurar_busca(self.combo_funcionario, self.funcionario_selecionado, lambda: self.catalogo.busca_funcionarios)
+
+    def _criar_secao_evento(self) -> None:
+        ttk.Label(self.frame_principal, text="🎉 Evento:", style="Normal.TLabel").grid(row=4, column=0, sticky="w", pady=3)
+        self.combo_evento = ttk.Combobox(self.frame_principal, textvariable=self.evento_selecionado, values=list(self.eventos.keys()), style="Premium.TCombobox", width=25)
+        self.combo_evento.grid(row=4, column=1, sticky="ew", pady=4)
+        self.combo_evento.bind("<<ComboboxSelected>>", self._agendar_preview)
+        self._configurar_busca(self.combo_evento, self.evento_selecionado, lambda: self.catalogo.busca_eventos)
+
+    def _criar_secao_documento(self) -> None:
+        ttk.Label(self.frame_principal, text="📄 Documento:", style="Normal.TLabel").grid(row=5, column=0, sticky="w", pady=3)
+        self.entry_documento = ttk.Entry(self.frame_principal, textvariable=self.nome_documento, style="Premium.TEntry")
+        self.entry_documento.grid(row=5, column=1, sticky="ew", pady=3)
+        self._configurar_placeholder(self.entry_documento, PLACEHOLDER_DOCUMENTO)
+        self.entry_documento.bind("<KeyRelease>", self._agendar_preview)
+
+    def _criar_secao_versao(self) -> None:
+        ttk.Label(self.frame_principal, text="🔢 Versão:", style="Normal.TLabel").grid(row=6, column=0, sticky="w", pady=3)
+        frame_versao = ttk.Frame(self.frame_principal, style="Main.TFrame")
+        frame_versao.grid(row=6, column=1, sticky="ew", pady=3)
+        frame_versao.columnconfigure(0, weight=1)
+        self.entry_versao = ttk.Entry(frame_versao, textvariable=self.versao_arquivo, style="Premium.TEntry")
+        self.entry_versao.grid(row=0, column=0, sticky="ew")
+        ttk.Checkbutton(
+            frame_versao,
+            text="do nome",
+            variable=self.versao_do_nome,
+            command=self._agendar_preview,
+            style="Normal.TCheckbutton",
+        ).grid(row=0, column=1, sticky="w", padx=(8, 0))
+        self._configurar_placeholder(self.entry_versao, PLACEHOLDER_VERSAO)
+        self.entry_versao.bind("<KeyRelease>", self._validar_versao)
+        self.entry_versao.bind("<FocusOut>", self._agendar_preview)
+
+    def _criar_secao_arquivo(self) -> None:
+        ttk.Label(self.frame_principal, text="📁 Arquivo:", style="Normal.TLabel").grid(row=7, column=0, sticky="w", pady=3)
+        frame_botoes = ttk.Frame(self.frame_principal, style="Main.TFrame")
+        frame_botoes.grid(row=7, column=1, sticky="ew", pady=3)
+        frame_botoes.columnconfigure(0, weight=1)
+        frame_botoes.columnconfigure(1, weight=1)
+        ttk.Button(frame_botoes, text="📂 Selecionar", command=self._selecionar_arquivos, style="Primary.TButton").grid(row=0, column=0, sticky="ew", padx=(0, 4))
+        ttk.Button(frame_botoes, text="🗂️ Pasta", command=self._selecionar_pasta, style="Secondary.TButton").grid(row=0, column=1, sticky="ew")
+
+    def _criar_secao_preview(self) -> None:
+        ttk.Label(self.frame_principal, text="👁️ Preview:", style="Normal.TLabel").grid(row=9, column=0, columnspan=2, sticky="w", pady=(15, 3))
+        self.frame_preview = ttk.Frame(self.frame_principal, style="Preview.TFrame", padding="8")
+        self.frame_preview.grid(row=10, column=0, columnspan=2, sticky="ew", pady=3)
+        self.frame_preview.columnconfigure(0, weight=1)
+
+        self.label_preview = ttk.Label(self.frame_preview, text="Complete os campos para ver o preview", font=("Consolas", 9, "bold"), foreground=self.cores["cinza_medio"], background=self.cores["branco"], wraplength=480)
+        self.label_preview.grid(row=0, column=0, sticky="ew")
+
+        # Lista dos nomes do lote, preenchida aos poucos conforme a rolagem.
+        self.frame_preview_lista = ttk.Frame(self.frame_preview, style="Preview.TFrame")
+        self.frame_preview_lista.grid(row=1, column=0, sticky="ew", pady=(6, 0))
+        self.frame_preview_lista.columnconfigure(0, weight=1)
+        self.lista_preview = tk.Listbox(
+            self.frame_preview_lista,
+            height=4,
+            font=("Consolas", 8),
+            foreground=self.cores["verde_escuro"],
+            background=self.cores["cinza_claro"],
+            borderwidth=0,
+            highlightthickness=0,
+            activestyle="none",
+        )
+        self.lista_preview.grid(row=0, column=0, sticky="ew")
+        self.scroll_preview = ttk.Scrollbar(self.frame_preview_lista, orient="vertical", command=self.lista_preview.yview)
+        self.scroll_preview.grid(row=0, column=1, sticky="ns")
+        self.lista_preview.configure(yscrollcommand=self._rolagem_preview)
+        self.frame_preview_lista.grid_remove()
+
+        self.label_arquivo = ttk.Label(self.frame_principal, text="Nenhum arquivo selecionado", style="Normal.TLabel", foreground=self.cores["cinza_medio"], wraplength=400)
+        self.label_arquivo.grid(row=8, column=0, columnspan=2, sticky="w", pady=3)
+
+    def _criar_secao_botoes(self) -> None:
+        self.btn_renomear = ttk.Button(self.frame_principal, text="✨ RENOMEAR ARQUIVO", command=self._renomear_arquivo, style="Primary.TButton")
+        self.btn_renomear.grid(row=11, column=0, columnspan=2, pady=(20, 8), sticky="ew")
+        frame_secundarios = ttk.Frame(self.frame_principal, style="Main.TFrame")
+        frame_secundarios.grid(row=12, column=0, columnspan=2, pady=3, sticky="ew")
+        frame_secundarios.columnconfigure(0, weight=1)
+        frame_secundarios.columnconfigure(1, weight=1)
+        self.btn_simular = ttk.Button(frame_secundarios, text="🔍 Simular", command=self._simular_lote, style="Secondary.TButton")
+        self.btn_simular.grid(row=0, column=0, sticky="ew", padx=(0, 4))
+        self.btn_limpar = ttk.Button(frame_secundarios, text="🗑️ Limpar", command=self._limpar_campos, style="Secondary.TButton")
+        self.btn_limpar.grid(row=0, column=1, sticky="ew")
+        ttk.Checkbutton(
+            frame_secundarios,
+            text="Pular arquivos repetidos (mesmo conteúdo)",
+            variable=self.pular_repetidos,
+            style="Normal.TCheckbutton",
+        ).grid(row=1, column=0, columnspan=2, sticky="w", pady=(6, 0))
+        self.check_arquivar = ttk.Checkbutton(
+            frame_secundarios,
+            variable=self.arquivar,
+            command=self._alternar_arquivar,
+            style="Normal.TCheckbutton",
+        )
+        self.check_arquivar.grid(row=2, column=0, columnspan=2, sticky="w", pady=(2, 0))
+        self._atualizar_rotulo_arquivar()
+        ttk.Checkbutton(
+            frame_secundarios,
+            text="Renumerar a seleção (quem já tem -001, -002 mantém o número)",
+            variable=self.renumerar,
+            style="Normal.TCheckbutton",
+        ).grid(row=3, column=0, columnspan=2, sticky="w", pady=(2, 0))
+
+        # Progresso do lote — só aparece enquanto há um lote rodando.
+        self.frame_progresso = ttk.Frame(self.frame_principal, style="Main.TFrame")
+        self.frame_progresso.grid(row=13, column=0, columnspan=2, pady=(8, 0), sticky="ew")
+        self.frame_progresso.columnconfigure(0, weight=1)
+        self.barra_progresso = ttk.Progressbar(self.frame_progresso, mode="determinate", style="Premium.Horizontal.TProgressbar")
+        self.barra_progresso.grid(row=0, column=0, sticky="ew", padx=(0, 8))
+        self.btn_cancelar = ttk.Button(self.frame_progresso, text="✖ Cancelar", command=self._cancelar_renomeacao, style="Secondary.TButton")
+        self.btn_cancelar.grid(row=0, column=1, sticky="e")
+        self.label_progresso = ttk.Label(self.frame_progresso, text="", style="Normal.TLabel")
+        self.label_progresso.grid(row=1, column=0, columnspan=2, sticky="w")
+        self.frame_progresso.grid_remove()
+        self.protocol("WM_DELETE_WINDOW", self._ao_fechar)
+
+    # ---------- Helpers ----------
+    def _alternar_arquivar(self) -> None:
+        if self.arquivar.get():
+            pasta = filedialog.askdirectory(
+                title="Pasta para onde os arquivos renomeados vão",
+                initialdir=self.pasta_arquivo or self.ultimo_diretorio,
+                mustexist=False,
+            )
+            if pasta:
+                self.pasta_arquivo = pasta
+            else:
+                self.arquivar.set(False)
+        self._atualizar_rotulo_arquivar()
+
+    def _atualizar_rotulo_arquivar(self) -> None:
+        if self.arquivar.get() and self.pasta_arquivo:
+            nome = os.path.basename(os.path.normpath(self.pasta_arquivo)) or self.pasta_arquivo
+            self.check_arquivar.configure(text=f"Mover para: {nome}")
+        else:
+            self.check_arquivar.configure(text="Mover para outra pasta (arquivo)…")
+
+    def _pasta_destino(self) -> Optional[str]:
+        """Pasta de arquivamento escolhida, ou ``None`` (renomeia na mesma pasta)."""
+        if not (self.arquivar.get() and self.pasta_arquivo):
+            return None
+        return caminho_longo(self.pasta_arquivo) if self.caminhos_longos else self.pasta_arquivo
+
+    def _configurar_placeholder(self, entry: ttk.Entry, placeholder: str) -> None:
+        def on_focus_in(_):
+            if entry.get() == placeholder:
+                entry.delete(0, tk.END)
+                entry.configure(foreground=self.cores["cinza_escuro"])
+
+        def on_focus_out(_):
+            if not entry.get():
+                entry.insert(0, placeholder)
+                entry.configure(foreground=self.cores["cinza_medio"])
+
+        entry.insert(0, placeholder)
+        entry.configure(foreground=self.cores["cinza_medio"])
+        entry.bind("<FocusIn>", on_focus_in)
+        entry.bind("<FocusOut>", on_focus_out)
+
+    def _configurar_busca(self, combo: ttk.Combobox, var: tk.StringVar, indice: Callable[[], IndicePrefixo]) -> None:
+        """Digitar filtra a lista (início de qualquer palavra, sem acento) e completa o nome."""
+
+        def ao_digitar(evento) -> None:
+            if evento.keysym in _TECLAS_NAVEGACAO:
+                return
+            texto = combo.get()
+            sugestoes = indice().buscar(texto, _SUGESTOES_MAX)
+            combo.configure(values=sugestoes)
+            # Completa só quando o texto é o começo do nome e o cursor está no fim.
+            if (
+                sugestoes
+                and evento.char
+                and evento.char.isprintable()
+                and combo.index(tk.INSERT) == len(texto)
+                and sugestoes[0].casefold().startswith(texto.casefold())
+            ):
+                combo.delete(0, tk.END)
+                combo.insert(0, sugestoes[0])
+                combo.select_range(len(texto), tk.END)
+                combo.icursor(len(texto))
+            self._agendar_preview()
+
+        def confirmar(_=None) -> None:
+            busca = indice()
+            texto = combo.get()
+            nome = busca.exato(texto)
+            if nome is None and texto.strip():
+                sugestoes = busca.buscar(texto, 2)
+                nome = sugestoes[0] if len(sugestoes) == 1 else None
+            combo.configure(values=busca.todos)
+            combo.selection_clear()
+            if var.get() != (nome or ""):
+                var.set(nome or "")
+            self._agendar_preview()
+
+        combo.bind("<KeyRelease>", ao_digitar)
+        combo.bind("<Return>", confirmar)
+        combo.bind("<FocusOut>", confirmar)
+
+    def _validar_versao(self, _=None) -> None:
+        v = self.versao_arquivo.get()
+        if v and v != PLACEHOLDER_VERSAO:
+            self.versao_arquivo.set("".join(c for c in v if c.isdigit()))
+        self._agendar_preview()
+
+    def _obter_data_atual(self) -> str:
+        return data_atual()
+
+    # --- Tutorial ---
+    def _tutorial_texto(self) -> str:
+        return (
+            "Bem-vindo!\n\n"
+            "Este programa renomeia seus arquivos de forma clara e padronizada.\n\n"
+            "O que você precisa saber:\n"
+            "• Todos os campos são OPCIONAIS — use só o que fizer sentido para você.\n"
+            "• Você pode selecionar UM ou VÁRIOS arquivos.\n"
+            "  - Windows: segure Ctrl (múltiplos) ou Shift (intervalo).\n"
+            "  - Mac: segure Command (múltiplos) ou Shift (intervalo).\n"
+            "• Com “🗂️ Pasta”, renomeia todos os arquivos de uma pasta e das subpastas (com filtros).\n"
+            "• “🔍 Simular” salva um relatório (CSV/JSON) com o nome que cada arquivo vai receber, sem renomear nada.\n"
+            "• Em Setor, Funcionário e Evento dá para digitar: a lista filtra (sem acento) e Enter confirma.\n"
+            "• “usar a data de cada arquivo” troca a data de hoje pela da foto (EXIF), do PDF/Office ou da última modificação;\n"
+            "  “do nome” (em Versão) aproveita a versão já escrita no nome (v2, rev 3). Cada data/versão é numerada à parte.\n"
+            "• “Pular arquivos repetidos” confere o conteúdo antes do lote: cópias do mesmo arquivo não viram -001 e -002.\n"
+            "• O nome sugerido aparece em “Preview”.\n"
+            "• Os arquivos são renomeados na MESMA pasta — ou movidos, com “Mover para outra pasta”\n"
+            "  (serve outro disco ou rede: a cópia é conferida antes de apagar o original).\n"
+            "• Em lote, a numeração será: -001, -002, -003, ...\n"
+            "  (se um número já existir, o app usa o próximo livre apenas para aquele arquivo;\n"
+            "  com “Renumerar a seleção”, arquivos selecionados não ocupam números uns dos outros).\n"
+            "• O campo Documento fica MAIÚSCULO e sem espaços (não usa hífens).\n\n"
+            "Passo a passo:\n"
+            "1) Clique em “📂 Selecionar” e escolha o(s) arquivo(s).\n"
+            "2) (Opcional) Preencha Setor, Evento, Funcionário, Documento e Versão.\n"
+            "3) Confira o “Preview”.\n"
+            "4) Clique em “✨ RENOMEAR ARQUIVO”.\n\n"
+            "Dica: use “🗑️ Limpar” para recomeçar quando quiser."
+        )
+
+    def _mostrar_tutorial(self) -> None:
+        messagebox.showinfo("Guia rápido", self._tutorial_texto())
+
+    def _mostrar_tutorial_se_necessario(self) -> None:
+        if self.tutorial_v1_shown:
+            return
+        try:
+            messagebox.showinfo("Guia rápido (primeira vez)", self._tutorial_texto())
+        finally:
+            self.tutorial_v1_shown = True
+            self._salvar_configuracoes()
+
+    # --- Seleção de arquivos ---
+    def _selecionar_arquivos(self) -> None:
+        paths = filedialog.askopenfilenames(
+            title="Selecionar arquivo(s) para renomear",
+            initialdir=self.ultimo_diretorio,
+            filetypes=TIPOS_ARQUIVO,
+        )
+        if not paths:
+            return
+
+        self.pasta_selecionada = None
+        self.arquivos_selecionados = PlanoCompacto(sorted(paths, key=lambda p: os.path.basename(p).lower()))
+        self._selecao_versao += 1
+        primeiro = self.arquivos_selecionados[0]
+        self.caminho_arquivo.set(primeiro)
+        self.ultimo_diretorio = os.path.dirname(primeiro)
+
+        if len(self.arquivos_selecionados) == 1:
+            nome = os.path.basename(primeiro)
+            if len(nome) > 45:
+                nome = nome[:42] + "..."
+            self.label_arquivo.config(text=f"📎 {nome}", foreground=self.cores["verde_principal"])
+        else:
+            self.label_arquivo.config(text=f"📎 {len(self.arquivos_selecionados)} arquivos selecionados", foreground=self.cores["verde_principal"])
+        self._atualizar_preview()
+
+    def _selecionar_pasta(self) -> None:
+        pasta = filedialog.askdirectory(title="Selecionar pasta para renomear", initialdir=self.ultimo_diretorio, mustexist=True)
+        if not pasta:
+            return
+        filtro = self._pedir_filtro_pasta()
+        if filtro is None:
+            return
+
+        # Só o primeiro arquivo é procurado agora; o resto é varrido durante o lote.
+        primeiro = next(varrer(pasta, filtro), None)
+        if primeiro is None:
+            messagebox.showwarning("Pasta vazia", "Nenhum arquivo da pasta atende aos filtros escolhidos.")
+            return
+
+        self.pasta_selecionada = (pasta, filtro)
+        self.arquivos_selecionados = PlanoCompacto()
+        self._selecao_versao += 1
+        self.caminho_arquivo.set(primeiro)
+        self.ultimo_diretorio = pasta
+        nome = os.path.basename(os.path.normpath(pasta)) or pasta
+        self.label_arquivo.config(text=f"🗂️ {nome} (pasta e subpastas)", foreground=self.cores["verde_principal"])
+        self._atualizar_preview()
+
+    def _pedir_filtro_pasta(self) -> Optional[FiltroArquivos]:
+        janela = tk.Toplevel(self)
+        janela.title("Filtros da pasta")
+        janela.configure(bg=self.cores["verde_fundo"])
+        janela.resizable(False, False)
+        janela.transient(self)
+
+        frame = ttk.Frame(janela, style="Main.TFrame", padding="15")
+        frame.grid(row=0, column=0, sticky="nsew")
+        frame.columnconfigure(1, weight=1)
+
+        tipo = tk.StringVar(value=TIPOS_ARQUIVO[0][0])
+        incluir = tk.StringVar()
+        excluir = tk.StringVar()
+        profundidade = tk.StringVar()
+        campos = [
+            ("Tipo:", ttk.Combobox(frame, textvariable=tipo, values=[t[0] for t in TIPOS_ARQUIVO], state="readonly", width=28)),
+            ("Incluir:", ttk.Entry(frame, textvariable=incluir, width=30)),
+            ("Excluir:", ttk.Entry(frame, textvariable=excluir, width=30)),
+            ("Subníveis:", ttk.Entry(frame, textvariable=profundidade, width=30)),
+        ]
+        for linha, (rotulo, campo) in enumerate(campos):
+            ttk.Label(frame, text=rotulo, style="Normal.TLabel").grid(row=linha, column=0, sticky="w", pady=3)
+            campo.grid(row=linha, column=1, sticky="ew", pady=3, padx=(8, 0))
+        ttk.Label(
+            frame,
+            text="Padrões separados por “;” (ex.: *.pdf; rascunho*).\nSubníveis em branco = todas as subpastas; 0 = só a pasta.",
+            style="Normal.TLabel",
+            foreground=self.cores["cinza_medio"],
+        ).grid(row=len(campos), column=0, columnspan=2, sticky="w", pady=(6, 10))
+
+        resultado: List[FiltroArquivos] = []
+
+        def confirmar() -> None:
+            texto = profundidade.get().strip()
+            if texto and not texto.isdigit():
+                messagebox.showerror("Erro", "Subníveis deve ser um número inteiro.", parent=janela)
+                return
+            padroes = dict(TIPOS_ARQUIVO).get(tipo.get(), "*.*")
+            resultado.append(FiltroArquivos(
+                incluir=[p.strip() for p in incluir.get().split(";") if p.strip()],
+                excluir=[p.strip() for p in excluir.get().split(";") if p.strip()],
+                extensoes=extensoes_de_padroes(padroes),
+                profundidade_max=int(texto) if texto else None,
+            ))
+            janela.destroy()
+
+        ttk.Button(frame, text="OK", command=confirmar, style="Primary.TButton").grid(row=len(campos) + 1, column=0, columnspan=2, sticky="ew", pady=3)
+        ttk.Button(frame, text="Cancelar", command=janela.destroy, style="Secondary.TButton").grid(row=len(campos) + 2, column=0, columnspan=2, sticky="ew", pady=3)
+        janela.bind("<Return>", lambda _: confirmar())
+        janela.bind("<Escape>", lambda _: janela.destroy())
+
+        janela.grab_set()
+        self.wait_window(janela)
+        return resultado[0] if resultado else None
+
+    def _em_lote(self) -> bool:
+        return self.pasta_selecionada is not None or len(self.arquivos_selecionados) > 1
+
+    def _fonte_arquivos(self) -> Iterable[str]:
+        """Arquivos do lote: a lista selecionada ou a varredura da pasta (em fluxo)."""
+        if self.pasta_selecionada is not None:
+            arquivos: Iterable[str] = varrer(*self.pasta_selecionada)
+        else:
+            arquivos = self.arquivos_selecionados
+        if not self.caminhos_longos:
+            return arquivos
+        if isinstance(arquivos, PlanoCompacto):
+            # Continua compacta (e com o total conhecido, para a barra de progresso).
+            return arquivos.com_pastas(caminho_longo)
+        return map(caminho_longo, arquivos)
+
+    # --- Montagem do nome ---
+    def _plano_atual(self) -> PlanoNome:
+        chave = (
+            self.setor_selecionado.get(),
+            self.evento_selecionado.get(),
+            self.funcionario_selecionado.get(),
+            self.nome_documento.get(),
+            self.versao_arquivo.get(),
+            data_atual(),
+        )
+        if self._plano_cache is None or self._plano_cache[0] != chave:
+            setor, evento, funcionario, documento, versao, data = chave
+            if funcionario not in self._conjunto_funcionarios:
+                funcionario = ""  # ainda digitando: só entra no nome quando bate com o catálogo
+            plano = PlanoNome.criar(
+                setor=setor,
+                evento=evento,
+                funcionario=funcionario,
+                documento=documento,
+                versao=versao,
+                setores=self.setores,
+                eventos=self.eventos,
+                data=data,
+            )
+            self._plano_cache = (chave, plano)
+        return self._plano_cache[1]
+
+    def _planos_por_arquivo(self) -> Optional[PlanosPorArquivo]:
+        """Planos por data/versão de cada arquivo, ou ``None`` se as duas opções estão desligadas."""
+        if not (self.data_do_arquivo.get() or self.versao_do_nome.get()):
+            return None
+        self._plano_atual()  # mesma chave e mesma regra do funcionário
+        chave = (self._plano_cache[0], self.data_do_arquivo.get(), self.versao_do_nome.get())
+        if self._planos_arquivo_cache is None or self._planos_arquivo_cache[0] != chave:
+            setor, evento, funcionario, documento, versao, _ = chave[0]
+            if funcionario not in self._conjunto_funcionarios:
+                funcionario = ""
+            planos = PlanosPorArquivo(
+                self.setores,
+                self.eventos,
+                usar_data=chave[1],
+                usar_versao=chave[2],
+                setor=setor,
+                evento=evento,
+                funcionario=funcionario,
+                documento=documento,
+                versao=versao,
+            )
+            self._planos_arquivo_cache = (chave, planos)
+        return self._planos_arquivo_cache[1]
+
+    def _metadados(self) -> Optional[CacheMetadados]:
+        if self._cache_metadados is None:
+            self._cache_metadados = abrir_cache_metadados(self.config.pasta)
+        return self._cache_metadados
+
+    def _sufixos(self) -> Optional[CacheSufixos]:
+        if self._cache_sufixos is None:
+            self._cache_sufixos = abrir_cache_sufixos(self.config.pasta)
+        return self._cache_sufixos
+
+    def _plano_para(self, arquivo: str) -> PlanoNome:
+        """Plano de ``arquivo`` lendo os metadados na hora (só ao renomear, nunca no preview)."""
+        planos = self._planos_por_arquivo()
+        if planos is None:
+            return self._plano_atual()
+        if arquivo in self._metadados_lidos and self._metadados_versao == self._selecao_versao:
+            return planos.plano_para(self._metadados_lidos[arquivo])
+        return planos.plano_para(metadados_de(arquivo, self._metadados()))
+
+    def _plano_preview(self, arquivo: str) -> Optional[PlanoNome]:
+        """Plano de ``arquivo`` para o preview; ``None`` enquanto os metadados dele não foram lidos."""
+        planos = self._planos_por_arquivo()
+        if planos is None:
+            return self._plano_atual()
+        if self._metadados_versao != self._selecao_versao:
+            self._metadados_lidos = {}
+            self._metadados_versao = self._selecao_versao
+        if arquivo not in self._metadados_lidos:
+            return None
+        return planos.plano_para(self._metadados_lidos[arquivo])
+
+    def _ler_metadados(self, arquivos: List[str], ao_terminar: Callable[[], None]) -> None:
+        """Lê os metadados de ``arquivos`` numa thread e chama ``ao_terminar`` no laço do Tk."""
+        fila: "queue.Queue[Dict[str, Optional[Metadados]]]" = queue.Queue()
+        cache = self._metadados()
+        versao = self._selecao_versao
+        self._metadados_pedidos.update(arquivos)
+
+        def trabalho() -> None:
+            try:
+                lidos = dict(extrair_lote(arquivos, tarefas=min(8, os.cpu_count() or 4), cache=cache))
+            except Exception:
+                lidos = {a: None for a in arquivos}  # ilegível: fica com a data de hoje
+            fila.put(lidos)
+
+        threading.Thread(target=trabalho, daemon=True).start()
+        self.after(50, self._aguardar_metadados, fila, versao, arquivos, ao_terminar)
+
+    def _aguardar_metadados(
+        self,
+        fila: "queue.Queue[Dict[str, Optional[Metadados]]]",
+        versao: int,
+        arquivos: List[str],
+        ao_terminar: Callable[[], None],
+    ) -> None:
+        try:
+            lidos = fila.get_nowait()
+        except queue.Empty:
+            self.after(50, self._aguardar_metadados, fila, versao, arquivos, ao_terminar)
+            return
+        self._metadados_pedidos.difference_update(arquivos)
+        if versao == self._metadados_versao:  # a seleção não mudou durante a leitura
+            self._metadados_lidos.update(lidos)
+        ao_terminar()
+
+    def _gerar_nome_final(self) -> Optional[str]:
+        arquivo = self.caminho_arquivo.get()
+        if not arquivo:
+            return None
+        plano = self._plano_preview(arquivo)
+        if plano is None:
+            # Data de hoje até a leitura terminar; depois o preview é refeito.
+            if arquivo not in self._metadados_pedidos:
+                self._ler_metadados([arquivo], self._atualizar_preview)
+            plano = self._plano_atual()
+        return plano.nome_para(arquivo, 1 if self._em_lote() else None)
+
+    # --- Preview ---
+    def _agendar_preview(self, _=None) -> None:
+        if self._preview_after is not None:
+            self.after_cancel(self._preview_after)
+        self._preview_after = self.after(_PREVIEW_ATRASO_MS, self._atualizar_preview)
+
+    def _atualizar_preview(self, _=None) -> None:
+        if self._preview_after is not None:
+            self.after_cancel(self._preview_after)
+            self._preview_after = None
+
+        nome = self._gerar_nome_final()
+        if nome:
+            texto, cor = nome, self.cores["verde_principal"]
+        else:
+            texto, cor = "Complete os campos para ver o preview", self.cores["cinza_medio"]
+        if self.label_preview.cget("text") != texto:
+            self.label_preview.config(text=texto, foreground=cor)
+        self._atualizar_preview_lista()
+
+    def _atualizar_preview_lista(self) -> None:
+        if not self._em_lote():
+            self._preview_lista_chave = None
+            self._preview_fonte = None
+            self.frame_preview_lista.grid_remove()
+            return
+        plano = self._plano_atual()
+        chave = (plano.base, self._selecao_versao, self.data_do_arquivo.get(), self.versao_do_nome.get())
+        if chave == self._preview_lista_chave:
+            return
+        self._preview_lista_chave = chave
+        self._preview_geracao += 1
+        self.lista_preview.delete(0, tk.END)
+        self._preview_lista_gerados = 0
+        self._preview_posicoes = {}
+        self._preview_fonte = iter(self._fonte_arquivos())
+        self.frame_preview_lista.grid()
+        self._carregar_preview_lista(_PREVIEW_BLOCO)
+
+    def _carregar_preview_lista(self, quantidade: int) -> None:
+        if self._preview_fonte is None or self._preview_leitura == self._preview_geracao:
+            return
+        bloco = list(itertools.islice(self._preview_fonte, quantidade))
+        if len(bloco) < quantidade:
+            self._preview_fonte = None  # fonte esgotada
+        faltam = [a for a in bloco if self._plano_preview(a) is None]
+        if not faltam:
+            self._inserir_preview(bloco)
+            return
+        # Metadados lidos numa thread; o bloco entra na lista quando chegarem.
+        geracao = self._preview_leitura = self._preview_geracao
+
+        def pronto() -> None:
+            if self._preview_leitura == geracao:
+                self._preview_leitura = None
+            if self._preview_geracao == geracao:
+                self._inserir_preview(bloco)
+
+        self._ler_metadados(faltam, pronto)
+
+    def _inserir_preview(self, bloco: List[str]) -> None:
+        for origem in bloco:
+            # Cada nome-base (data/versão do arquivo) tem a sua própria numeração.
+            plano = self._plano_preview(origem) or self._plano_atual()
+            posicao = self._preview_posicoes[plano.base] = self._preview_posicoes.get(plano.base, 0) + 1
+            nome = plano.nome_para(origem, posicao) or "—"
+            self.lista_preview.insert(tk.END, f"{os.path.basename(origem)}  →  {nome}")
+        self._preview_lista_gerados += len(bloco)
+
+    def _rolagem_preview(self, primeiro: str, ultimo: str) -> None:
+        self.scroll_preview.set(primeiro, ultimo)
+        if float(ultimo) >= 0.9 and self._preview_fonte is not None:
+            self._carregar_preview_lista(_PREVIEW_BLOCO)
+
+    def _validar_campos(self) -> bool:
+        if not self.caminho_arquivo.get() and not self.arquivos_selecionados:
+            messagebox.showerror("Erro", "Selecione pelo menos um arquivo.")
+            return False
+        return True
+
+    def _renomear_arquivo(self) -> None:
+        if not self._validar_campos():
+            return
+        try:
+            self._salvar_configuracoes()
+
+            if self._em_lote():
+                self._iniciar_lote(self._plano_atual(), self._fonte_arquivos(), self._planos_por_arquivo())
+                return
+
+            origem = self.caminho_arquivo.get()
+            if self.caminhos_longos:
+                origem = caminho_longo(origem)
+            pasta_destino = self._pasta_destino()
+            pasta = pasta_destino or os.path.dirname(origem)
+            plano = self._plano_para(origem)
+            ext = os.path.splitext(origem)[1]
+            nome_final = plano.nome_em(pasta, ext)
+            if not nome_final:
+                messagebox.showerror("Erro", "Não foi possível gerar o nome final.")
+                return
+
+            destino = os.path.join(pasta, nome_final)
+
+            if os.path.exists(destino) and not messagebox.askyesno(
+                "Arquivo Existe", f"O arquivo '{os.path.basename(destino)}' já existe.\nSubstituir?"
+            ):
+                return
+
+            if pasta_destino:
+                os.makedirs(pasta_destino, exist_ok=True)
+                mover_arquivo(origem, destino, verificar=True)
+            else:
+                os.replace(origem, destino)
+            aviso = "\n\n(nome encurtado pelo limite de caminho)" if plano.encurtado(nome_final, ext) else ""
+            messagebox.showinfo("Sucesso! ✅", f"Arquivo renomeado!\n\n{os.path.basename(destino)}{aviso}")
+            self._limpar_campos()
+
+        except Exception as e:
+            messagebox.showerror("Erro ❌", f"Erro ao renomear:\n{e}")
+
+    # --- Simulação (sem renomear) ---
+    def _simular_lote(self) -> None:
+        if not self._validar_campos():
+            return
+        plano = self._plano_atual()
+        if not plano.base:
+            messagebox.showerror("Erro", "Não foi possível gerar o nome final.")
+            return
+        caminho = filedialog.asksaveasfilename(
+            title="Salvar relatório da simulação",
+            initialdir=self.ultimo_diretorio,
+            initialfile=f"simulacao-{data_atual()}.csv",
+            defaultextension=".csv",
+            filetypes=[("Planilha CSV", "*.csv"), ("JSON", "*.json")],
+        )
+        if not caminho:
+            return
+
+        arquivos = self._fonte_arquivos()
+        numerar = self._em_lote()
+        pular_repetidos = numerar and self.pular_repetidos.get()
+        planos = self._planos_por_arquivo()
+        cache = self._metadados() if planos is not None else None
+        pasta_destino = self._pasta_destino()
+        duas_fases = self.renumerar.get()
+        fila: "queue.Queue[tuple]" = queue.Queue()
+
+        def trabalho() -> None:
+            try:
+                repetidos = None
+                if pular_repetidos:
+                    selecao, dup = self._procurar_repetidos(arquivos)
+                    repetidos = dup.repetidos
+                else:
+                    selecao = arquivos
+                plano_de = None
+                if planos is not None:
+                    selecao = selecao if isinstance(selecao, PlanoCompacto) else PlanoCompacto(selecao)
+                    por_arquivo = dict(planos_dos_arquivos(selecao, planos, tarefas=min(8, os.cpu_count() or 4), cache=cache))
+                    plano_de = por_arquivo.__getitem__
+                itens = simular(
+                    plano,
+                    selecao,
+                    numerar=numerar,
+                    repetidos=repetidos,
+                    plano_de=plano_de,
+                    pasta_destino=pasta_destino,
+                    duas_fases=duas_fases,
+                )
+                fila.put(("fim", escrever_relatorio(itens, caminho)))
+            except Exception as e:
+                fila.put(("falha", e))
+
+        for botao in (self.btn_renomear, self.btn_simular, self.btn_limpar):
+            botao.state(["disabled"])
+        self.configure(cursor="watch")
+        threading.Thread(target=trabalho, daemon=True).start()
+        self.after(100, self._aguardar_simulacao, fila, caminho)
+
+    def _aguardar_simulacao(self, fila: "queue.Queue[tuple]", caminho: str) -> None:
+        try:
+            tipo, valor = fila.get_nowait()
+        except queue.Empty:
+            self.after(100, self._aguardar_simulacao, fila, caminho)
+            return
+        self.configure(cursor="")
+        for botao in (self.btn_renomear, self.btn_simular, self.btn_limpar):
+            botao.state(["!disabled"])
+        if tipo == "falha":
+            messagebox.showerror("Erro ❌", f"Erro ao simular:\n{valor}")
+            return
+        messagebox.showinfo("Simulação 🔍", f"{valor.resumo()}\n\nRelatório salvo em:\n{caminho}")
+
+    # --- Lote em segundo plano ---
+    def _iniciar_lote(self, plano: PlanoNome, arquivos: Iterable[str], planos: Optional[PlanosPorArquivo] = None) -> None:
+        self._cancelar_lote = threading.Event()
+        self._lote_feitos = 0
+        self._lote_fase = ""
+        # Varredura de pasta: o total só é conhecido no fim (barra indeterminada).
+        self._lote_total = len(arquivos) if isinstance(arquivos, PlanoCompacto) else 0
+        if self._lote_total:
+            self.barra_progresso.configure(mode="determinate", maximum=self._lote_total, value=0)
+        else:
+            self.barra_progresso.configure(mode="indeterminate", value=0)
+            self.barra_progresso.start(15)
+        self._atualizar_label_progresso()
+        self.btn_cancelar.state(["!disabled"])
+        self.btn_renomear.state(["disabled"])
+        self.btn_simular.state(["disabled"])
+        self.btn_limpar.state(["disabled"])
+        self.frame_progresso.grid()
+
+        try:
+            diario: Optional[Diario] = Diario.criar(novo_caminho(self.pasta_diarios), plano.base)
+        except OSError:
+            diario = None
+        pasta_destino = self._pasta_destino()
+        executor: Union[ExecutorLote, ArquivadorLote]
+        if pasta_destino:
+            executor = ArquivadorLote(
+                plano,
+                pasta_destino,
+                verificar=True,
+                ao_evento=self._fila_lote.put,
+                cancelar=self._cancelar_lote,
+                diario=diario,
+                sufixos=self._sufixos(),
+            )
+        else:
+            executor = ExecutorLote(
+                plano,
+                ao_evento=self._fila_lote.put,
+                cancelar=self._cancelar_lote,
+                diario=diario,
+                duas_fases=self.renumerar.get(),
+                sufixos=self._sufixos(),
+            )
+        pular_repetidos = self.pular_repetidos.get()
+        cache = self._metadados() if planos is not None else None
+        threading.Thread(
+            target=self._trabalho_lote, args=(executor, arquivos, pular_repetidos, planos, cache), daemon=True
+        ).start()
+        self.after(100, self._processar_fila_lote)
+
+    def _procurar_repetidos(
+        self, arquivos: Iterable[str], cancelar: Optional[threading.Event] = None
+    ) -> Tuple[PlanoCompacto, ResultadoDuplicados]:
+        """Na thread de trabalho: a seleção inteira (compacta) e as cópias de mesmo conteúdo nela."""
+        selecao = arquivos if isinstance(arquivos, PlanoCompacto) else PlanoCompacto(arquivos)
+        cache = abrir_cache(self.config.pasta)
+        try:
+            return selecao, encontrar_duplicados(selecao, tarefas=min(8, os.cpu_count() or 4), cache=cache, cancelar=cancelar)
+        finally:
+            if cache:
+                cache.fechar()
+
+    def _trabalho_lote(
+        self,
+        executor: Union[ExecutorLote, ArquivadorLote],
+        arquivos: Iterable[str],
+        pular_repetidos: bool = False,
+        planos: Optional[PlanosPorArquivo] = None,
+        cache: Optional[CacheMetadados] = None,
+    ) -> None:
+        try:
+            repetidos: List[Tuple[str, str]] = []
+            total: Optional[int] = None
+            preparo: Dict[str, float] = {}  # etapas antes dos renomes -> segundos
+            t0 = time.perf_counter()
+            if pular_repetidos:
+                self._fila_lote.put(("fase", "Procurando arquivos repetidos…"))
+                selecao, dup = self._procurar_repetidos(arquivos, executor.cancelar)
+                repetidos = list(dup.repetidos.items())
+                arquivos = sem_repetidos(selecao, dup.repetidos) if repetidos else selecao
+                total = len(arquivos)
+                preparo["repetidos"] = time.perf_counter() - t0
+                t0 = time.perf_counter()
+            grupos = None
+            if planos is not None and not executor.cancelar.is_set():
+                self._fila_lote.put(("fase", "Lendo a data e a versão de cada arquivo…"))
+                pares = planos_dos_arquivos(
+                    arquivos, planos, tarefas=min(8, os.cpu_count() or 4), cache=cache, cancelar=executor.cancelar
+                )
+                grupos = agrupar_por_plano(pares)
+                total = sum(len(g) for _, g in grupos)
+                preparo["metadados"] = time.perf_counter() - t0
+            if total is not None:
+                self._fila_lote.put(("total", total))
+            if total is not None and executor.cancelar.is_set():
+                # Cancelado ainda na preparação: nenhum arquivo foi tocado.
+                resultado = ResultadoLote()
+                resultado.cancelados = total
+            elif grupos is not None:
+                resultado = executor.executar_grupos(grupos)
+            else:
+                resultado = executor.executar(arquivos)
+            resultado.repetidos = repetidos
+            if resultado.metricas is not None:
+                for etapa, segundos in preparo.items():
+                    resultado.metricas.somar(etapa, segundos)
+            registrar_lote(resultado, {"origem": "interface", "tarefas": executor.max_tarefas})
+            if executor.diario:
+                executor.diario.fechar()
+                limpar_antigos(self.pasta_diarios)
+            self._fila_lote.put(("fim", resultado))
+        except Exception as e:
+            if executor.diario:
+                executor.diario.fechar(terminado=False)
+            self._fila_lote.put(("falha", e))
+
+    def _processar_fila_lote(self) -> None:
+        fim = None
+        try:
+            while True:
+                item = self._fila_lote.get_nowait()
+                if isinstance(item, EventoLote):
+                    if item.tipo in (RENOMEADO, ERRO, CANCELADO):
+                        self._lote_feitos += 1
+                elif item[0] == "fase":
+                    self._lote_fase = item[1]
+                elif item[0] == "total":
+                    self._lote_fase = ""
+                    self._lote_total = item[1]
+                    self.barra_progresso.stop()
+                    self.barra_progresso.configure(mode="determinate", maximum=max(1, self._lote_total), value=0)
+                else:
+                    fim = item
+        except queue.Empty:
+            pass
+
+        if self._lote_total:
+            self.barra_progresso.configure(value=self._lote_feitos)
+        self._atualizar_label_progresso()
+        if fim is None:
+            self.after(100, self._processar_fila_lote)
+            return
+        self._finalizar_lote(*fim)
+
+    def _atualizar_label_progresso(self) -> None:
+        if self._lote_fase:
+            self.label_progresso.config(text=self._lote_fase)
+        elif self._lote_total:
+            self.label_progresso.config(text=f"{self._lote_feitos}/{self._lote_total}")
+        else:
+            self.label_progresso.config(text=f"{self._lote_feitos} arquivo(s)…")
+
+    def _esconder_progresso(self) -> None:
+        self._cancelar_lote = None
+        self.barra_progresso.stop()
+        self.frame_progresso.grid_remove()
+        self.btn_renomear.state(["!disabled"])
+        self.btn_simular.state(["!disabled"])
+        self.btn_limpar.state(["!disabled"])
+
+    def _finalizar_lote(self, tipo: str, valor) -> None:
+        self._esconder_progresso()
+        if self._fechar_ao_terminar:
+            self.destroy()
+            return
+        if tipo == "falha":
+            messagebox.showerror("Erro ❌", f"Erro ao renomear:\n{valor}")
+            return
+        resultado: ResultadoLote = valor
+        messagebox.showinfo("Cancelado" if resultado.cancelados else "Concluído ✅", resultado.resumo())
+        self._limpar_campos()
+
+    def _cancelar_renomeacao(self) -> None:
+        if self._cancelar_lote is not None:
+            self._cancelar_lote.set()
+            self.btn_cancelar.state(["disabled"])
+            self.label_progresso.config(text="Cancelando… (os arquivos em andamento terminam)")
+
+    def destroy(self) -> None:
+        if self._cache_metadados is not None:
+            self._cache_metadados.fechar()
+            self._cache_metadados = None
+        if self._cache_sufixos is not None:
+            self._cache_sufixos.fechar()
+            self._cache_sufixos = None
+        super().destroy()
+
+    def _ao_fechar(self) -> None:
+        if self._cancelar_lote is None:
+            self.destroy()
+            return
+        # Fecha só depois que a thread parar: nenhum arquivo fica pela metade.
+        self._fechar_ao_terminar = True
+        self._cancelar_renomeacao()
+
+    # --- Lotes interrompidos (diário) ---
+    # Ler e refazer um diário grande leva tempo: tudo roda na thread de trabalho,
+    # e a janela só pergunta o que fazer com cada lote e mostra o resultado.
+    def _verificar_lotes_interrompidos(self) -> None:
+        fila: "queue.Queue[tuple]" = queue.Queue()
+
+        def trabalho() -> None:
+            try:
+                fila.put(("fim", diarios_incompletos(self.pasta_diarios)))
+            except Exception as e:
+                fila.put(("falha", e))
+
+        threading.Thread(target=trabalho, daemon=True).start()
+        self.after(100, self._aguardar_diarios, fila, None)
+
+    def _aguardar_diarios(self, fila: "queue.Queue[tuple]", restantes: Optional[List[str]]) -> None:
+        """Espera a thread de trabalho; ``restantes`` são os diários ainda não oferecidos."""
+        try:
+            tipo, valor = fila.get_nowait()
+        except queue.Empty:
+            self.after(100, self._aguardar_diarios, fila, restantes)
+            return
+        if restantes is not None:
+            self._esconder_progresso()
+            if self._fechar_ao_terminar:
+                self.destroy()
+                return
+            if tipo == "falha":
+                messagebox.showerror("Erro ❌", f"Erro ao processar o diário:\n{valor}")
+            else:
+                messagebox.showinfo("Concluído ✅", valor.resumo())
+        elif tipo == "falha":
+            return
+        else:
+            restantes = valor
+        self._oferecer_diarios(restantes)
+
+    def _oferecer_diarios(self, caminhos: List[str]) -> None:
+        if self._cancelar_lote is not None:
+            # Um lote começou enquanto os diários eram lidos: oferece depois dele.
+            self.after(500, self._oferecer_diarios, caminhos)
+            return
+        while caminhos:
+            caminho = caminhos.pop(0)
+            resposta = messagebox.askyesnocancel(
+                "Lote interrompido",
+                "Um lote de renomeação anterior não terminou.\n\n"
+                f"{os.path.basename(caminho)}\n\n"
+                "Sim: concluir os renomes que faltaram\n"
+                "Não: desfazer o lote inteiro\n"
+                "Cancelar: decidir depois",
+            )
+            if resposta is not None:
+                self._iniciar_recuperacao(caminho, resposta, caminhos)
+                return
+
+    def _iniciar_recuperacao(self, caminho: str, concluir: bool, restantes: List[str]) -> None:
+        # Sem cancelamento (o diário é refeito inteiro), mas fechar a janela espera o fim.
+        self._cancelar_lote = threading.Event()
+        self._lote_fase = "Concluindo o lote interrompido…" if concluir else "Desfazendo o lote interrompido…"
+        self._lote_total = 0
+        self.barra_progresso.configure(mode="indeterminate", value=0)
+        self.barra_progresso.start(15)
+        self._atualizar_label_progresso()
+        self.btn_cancelar.state(["disabled"])
+        self.btn_renomear.state(["disabled"])
+        self.btn_simular.state(["disabled"])
+        self.btn_limpar.state(["disabled"])
+        self.frame_progresso.grid()
+
+        fila: "queue.Queue[tuple]" = queue.Queue()
+
+        def trabalho() -> None:
+            try:
+                fila.put(("fim", recuperar(caminho) if concluir else desfazer(caminho)))
+            except Exception as e:
+                fila.put(("falha", e))
+
+        threading.Thread(target=trabalho, daemon=True).start()
+        self.after(100, self._aguardar_diarios, fila, restantes)
+
+    def _limpar_campos(self) -> None:
+        self.setor_selecionado.set("")
+        self.evento_selecionado.set("")
+        self.funcionario_selecionado.set("")
+        self.nome_documento.set(PLACEHOLDER_DOCUMENTO)
+        self.versao_arquivo.set(PLACEHOLDER_VERSAO)
+        self.caminho_arquivo.set("")
+        self.arquivos_selecionados = PlanoCompacto()
+        self.pasta_selecionada = None
+        self._selecao_versao += 1
+        self.entry_documento.configure(foreground=self.cores["cinza_medio"])
+        self.entry_versao.configure(foreground=self.cores["cinza_medio"])
+        self.label_arquivo.config(text="Nenhum arquivo selecionado", foreground=self.cores["cinza_medio"])
+        self._atualizar_preview()
+
+    # ---------- Catálogo ----------
+    def _verificar_catalogo(self) -> None:
+        catalogo = self.fonte_catalogo.atual()
+        if catalogo is not self.catalogo:
+            self._aplicar_catalogo(catalogo)
+            self.combo_setor.configure(values=list(self.setores.keys()))
+            self.combo_evento.configure(values=list(self.eventos.keys()))
+            self.combo_funcionario.configure(values=self.funcionarios)
+            # Opções removidas do catálogo deixam de valer.
+            if self.setor_selecionado.get() not in self.setores:
+                self.setor_selecionado.set("")
+            if self.evento_selecionado.get() not in self.eventos:
+                self.evento_selecionado.set("")
+            if self.funcionario_selecionado.get() not in self._conjunto_funcionarios:
+                self.funcionario_selecionado.set("")
+            self._plano_cache = None
+            self._preview_lista_chave = None
+            self._atualizar_preview()
+        self.after(_CATALOGO_INTERVALO_MS, self._verificar_catalogo)
+
+    # ---------- Persistência ----------
+    def _carregar_configuracoes(self) -> None:
+        s = self.config.get("ultimo_setor")
+        e = self.config.get("ultimo_evento")
+        fcx = self.config.get("ultimo_funcionario")
+        ult_dir = self.config.get("ultimo_diretorio")
+        self.tutorial_v1_shown = bool(self.config.get("tutorial_v1_shown", False))
+        self.pular_repetidos.set(bool(self.config.get("pular_repetidos", False)))
+        self.renumerar.set(bool(self.config.get("renumerar", False)))
+        self.caminhos_longos = bool(self.config.get("caminhos_longos", False))
+        self.data_do_arquivo.set(bool(self.config.get("data_do_arquivo", False)))
+        self.versao_do_nome.set(bool(self.config.get("versao_do_nome", False)))
+        pasta_arquivo = self.config.get("pasta_arquivo")
+        if isinstance(pasta_arquivo, str) and pasta_arquivo:
+            self.pasta_arquivo = pasta_arquivo
+            self.arquivar.set(bool(self.config.get("arquivar", False)))
+            self._atualizar_rotulo_arquivar()
+
+        if s in self.setores:
+            self.setor_selecionado.set(s)
+        if e in self.eventos:
+            self.evento_selecionado.set(e)
+        if fcx in self._conjunto_funcionarios:
+            self.funcionario_selecionado.set(fcx)
+        if isinstance(ult_dir, str) and os.path.isdir(ult_dir):
+            self.ultimo_diretorio = ult_dir
+
+    def _salvar_configuracoes(self) -> None:
+        try:
+            self.config.atualizar(
+                {
+                    "ultimo_setor": self.setor_selecionado.get(),
+                    "ultimo_evento": self.evento_selecionado.get(),
+                    "ultimo_funcionario": self.funcionario_selecionado.get(),
+                    "ultimo_diretorio": self.ultimo_diretorio,
+                    "tutorial_v1_shown": self.tutorial_v1_shown,
+                    "pular_repetidos": self.pular_repetidos.get(),
+                    "renumerar": self.renumerar.get(),
+                    "data_do_arquivo": self.data_do_arquivo.get(),
+                    "versao_do_nome": self.versao_do_nome.get(),
+                    "arquivar": self.arquivar.get(),
+                    "pasta_arquivo": self.pasta_arquivo,
+                },
+                carimbo="data_ultima_utilizacao",
+            )
+        except OSError:
+            pass
+
+
+def main(inicio: Optional[float] = None, medir: bool = False):
+    """``inicio``: instante (``time.perf_counter``) em que o programa começou, para medir as importações."""
+    tempos = TemposInicio(inicio) if medir or os.environ.get(VARIAVEL_TEMPOS) else None
+    app = RenomeadorArquivosApp(tempos)
+    app.mainloop()
+
+
+if __name__ == "__main__":
+    main()
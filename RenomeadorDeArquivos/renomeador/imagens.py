@@ -0,0 +1,89 @@
+"""
+Imagens da interface — versões já no tamanho de uso, abertas com ``tk.PhotoImage``.
+
+O logo original é grande e reduzi-lo com PIL a cada abertura atrasa a janela,
+principalmente no executável de arquivo único. As versões reduzidas acompanham
+o programa em ``assets`` (``logo_520x110.png``, ``logo_32x32.png``); se uma
+faltar, é gerada uma vez com PIL (importado só nessa hora) e guardada na
+pasta de cache, identificada pelo conteúdo do original.
+
+``python -m renomeador.imagens`` regera as versões de ``assets`` (requer PIL).
+"""
+
+import contextlib
+import hashlib
+import os
+import sys
+import tempfile
+from typing import Dict, Optional, Tuple
+
+# Original -> tamanho em que a interface usa.
+TAMANHOS: Dict[str, Tuple[int, int]] = {
+    "logo.png": (520, 110),
+    "logo.ico": (32, 32),
+}
+
+
+def nome_reduzido(origem: str, tamanho: Tuple[int, int]) -> str:
+    radical = os.path.splitext(os.path.basename(origem))[0]
+    return f"{radical}_{tamanho[0]}x{tamanho[1]}.png"
+
+
+def _assinatura(origem: str) -> str:
+    # Pelo conteúdo, não pelo mtime: o executável de arquivo único extrai
+    # os assets de novo (com outra data) a cada execução.
+    with open(origem, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+
+
+def gerar_reduzida(origem: str, tamanho: Tuple[int, int], destino: str) -> None:
+    """Grava ``origem`` redimensionada (LANCZOS) em PNG; a troca é atômica."""
+    from PIL import Image
+
+    with Image.open(origem) as img:
+        reduzida = img.resize(tamanho, Image.Resampling.LANCZOS)
+    fd, temporario = tempfile.mkstemp(prefix=".img-", suffix=".png", dir=os.path.dirname(destino) or ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            reduzida.save(f, "PNG", optimize=True)
+        os.chmod(temporario, 0o644)  # mkstemp cria só para o dono
+        os.replace(temporario, destino)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temporario)
+        raise
+
+
+def caminho_reduzido(origem: str, tamanho: Tuple[int, int], pasta_cache: Optional[str]) -> Optional[str]:
+    """PNG de ``origem`` em ``tamanho``: o que acompanha o programa, o do cache ou um novo (PIL)."""
+    nome = nome_reduzido(origem, tamanho)
+    pronto = os.path.join(os.path.dirname(origem), nome)
+    if os.path.isfile(pronto):
+        return pronto
+    if not pasta_cache:
+        return None
+    try:
+        radical, ext = os.path.splitext(nome)
+        em_cache = os.path.join(pasta_cache, f"{radical}-{_assinatura(origem)}{ext}")
+        if os.path.isfile(em_cache):
+            return em_cache
+        os.makedirs(pasta_cache, exist_ok=True)
+        gerar_reduzida(origem, tamanho, em_cache)
+    except (OSError, ImportError, ValueError):
+        return None
+    return em_cache
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    pasta = argv[0] if argv else os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+    for original, tamanho in TAMANHOS.items():
+        origem = os.path.join(pasta, original)
+        destino = os.path.join(pasta, nome_reduzido(origem, tamanho))
+        gerar_reduzida(origem, tamanho, destino)
+        print(f"{destino} ({tamanho[0]}x{tamanho[1]})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
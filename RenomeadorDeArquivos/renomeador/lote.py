@@ -0,0 +1,96 @@
+"""
+Renomeação em lote — mesma regra de numeração da interface, sem Tk.
+"""
+
+import os
+import time
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from .metricas import PLANEJAMENTO, MetricasLote, medir_iteracao, registrar_erro
+from .nomes import PlanoNome
+from .numeracao import CacheSufixos, NumeradorLote
+
+
+class ResultadoLote:
+    __slots__ = ("total", "ok", "erros", "cancelados", "repetidos", "encurtados", "metricas")
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.ok = 0
+        self.erros: List[str] = []
+        self.cancelados = 0
+        # Pulados antes do lote por terem o mesmo conteúdo de outro: (cópia, original).
+        self.repetidos: List[Tuple[str, str]] = []
+        # Destinos com o nome encurtado pelo limite de caminho (número e versão ficam).
+        self.encurtados: List[str] = []
+        self.metricas: Optional[MetricasLote] = None
+
+    def resumo(self) -> str:
+        msg = f"Renomeados: {self.ok}/{self.total} arquivo(s)."
+        if self.erros:
+            msg += "\nNão foi possível renomear:\n- " + "\n- ".join(self.erros[:10])
+            if len(self.erros) > 10:
+                msg += f"\n... (+{len(self.erros)-10})"
+        if self.cancelados:
+            msg += f"\nCancelado: {self.cancelados} arquivo(s) não foram alterados."
+        if self.repetidos:
+            msg += f"\nNão renomeados por terem o mesmo conteúdo de outro da seleção: {len(self.repetidos)}"
+            for copia, original in self.repetidos[:10]:
+                msg += f"\n- {os.path.basename(copia)} = {os.path.basename(original)}"
+            if len(self.repetidos) > 10:
+                msg += f"\n... (+{len(self.repetidos)-10})"
+        if self.encurtados:
+            msg += f"\nNomes encurtados pelo limite de caminho: {len(self.encurtados)}"
+            for destino in self.encurtados[:10]:
+                msg += f"\n- {os.path.basename(destino)}"
+            if len(self.encurtados) > 10:
+                msg += f"\n... (+{len(self.encurtados)-10})"
+        return msg
+
+
+def renomear_lote(
+    plano: PlanoNome,
+    arquivos: Iterable[str],
+    *,
+    ao_renomear: Optional[Callable[[str, str], None]] = None,
+    sufixos: Optional[CacheSufixos] = None,
+) -> ResultadoLote:
+    """Renomeia ``arquivos`` em fluxo (-001, -002, ...) na mesma pasta de cada um.
+
+    ``sufixos``: números usados guardados entre lotes (ver ``ExecutorLote``).
+    """
+    resultado = ResultadoLote()
+    metricas = resultado.metricas = MetricasLote()
+    numerador = NumeradorLote(plano, sufixos=sufixos)
+    for idx, origem in enumerate(medir_iteracao(arquivos, metricas), start=1):
+        resultado.total += 1
+        t0 = time.perf_counter()
+        reserva = numerador.reservar(origem, idx)
+        t1 = time.perf_counter()
+        metricas.somar(PLANEJAMENTO, t1 - t0)
+        if not reserva:
+            resultado.erros.append(os.path.basename(origem))
+            metricas.erro("SemNome")
+            registrar_erro(origem, None, None, idx)
+            continue
+        destino = reserva[1]
+        try:
+            os.replace(origem, destino)
+            resultado.ok += 1
+        except Exception as e:
+            resultado.erros.append(os.path.basename(origem))
+            metricas.erro(type(e).__name__)
+            registrar_erro(origem, destino, e, idx)
+            continue
+        metricas.renomeado(time.perf_counter() - t1)
+        numerador.confirmar(origem, destino)
+        if plano.encurtado(os.path.basename(destino), os.path.splitext(origem)[1], reserva[0]):
+            resultado.encurtados.append(destino)
+        if ao_renomear:
+            ao_renomear(origem, destino)
+    if sufixos:
+        # Só renomes confirmados mudam o numerador: ele está como as pastas.
+        numerador.gravar()
+        sufixos.salvar()
+    metricas.encerrar()
+    return resultado
@@ -0,0 +1,389 @@
+"""
+Metadados de arquivo — a data e a versão de cada arquivo, para nomear acervos antigos.
+
+A data vem do próprio conteúdo quando há um extrator para a extensão (EXIF de
+fotos, propriedades de PDF e de documentos Office/ODF), senão da data de
+modificação. Os extratores leem só os cabeçalhos necessários (segmentos
+iniciais do JPEG, início e fim do PDF, ``docProps/core.xml`` do zip), nunca o
+arquivo inteiro; outros podem ser incluídos com ``registrar_extrator``.
+
+A versão sai do nome atual (``contrato_v2``, ``Rev 3``, ``versão 4``, ``-v02``).
+
+``extrair_lote`` roda os extratores num pool de threads, em fluxo e na ordem
+da entrada, com cache em disco por (caminho, tamanho, mtime).
+"""
+
+import collections
+import datetime
+import io
+import os
+import re
+import sqlite3
+import struct
+import threading
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .cache import CacheArquivos, caminho_cache, chave_caminho
+from .compacto import PlanoCompacto
+from .nomes import PlanoNome
+
+NOME_CACHE = "metadados.db"
+
+FONTE_EXIF = "exif"
+FONTE_PDF = "pdf"
+FONTE_OFFICE = "office"
+FONTE_MTIME = "mtime"
+
+# caminho -> data "AAAAMMDD" (ou None se o arquivo não tiver a informação)
+Extrator = Callable[[str], Optional[str]]
+
+
+class Metadados:
+    __slots__ = ("data", "fonte", "versao")
+
+    def __init__(self, data: str, fonte: str, versao: Optional[str]):
+        self.data = data  # AAAAMMDD
+        self.fonte = fonte  # de onde veio a data (FONTE_*)
+        self.versao = versao  # dígitos, ou None se o nome não tiver versão
+
+    def __repr__(self) -> str:
+        return f"Metadados({self.data!r}, {self.fonte!r}, {self.versao!r})"
+
+
+# ---------- Datas ----------
+def _data_valida(ano: int, mes: int, dia: int) -> Optional[str]:
+    # Câmeras sem relógio gravam 0000:00:00; zips sem data, 1980-01-01.
+    if not 1981 <= ano <= 2100:
+        return None
+    try:
+        return datetime.date(ano, mes, dia).strftime("%Y%m%d")
+    except ValueError:
+        return None
+
+
+def _data_iso(texto: str) -> Optional[str]:
+    """``2024-03-05T10:00:00Z`` -> ``20240305`` (no fuso local, como a data de modificação)."""
+    texto = texto.strip()
+    try:
+        momento = datetime.datetime.fromisoformat(texto)
+    except ValueError:
+        m = re.match(r"(\d{4})-(\d{2})-(\d{2})", texto)
+        return _data_valida(int(m.group(1)), int(m.group(2)), int(m.group(3))) if m else None
+    if momento.tzinfo is not None:
+        momento = momento.astimezone()
+    return _data_valida(momento.year, momento.month, momento.day)
+
+
+# ---------- EXIF (JPEG / TIFF) ----------
+_TAG_EXIF_IFD = 0x8769
+_TAG_DATA_ORIGINAL = 0x9003
+_TAG_DATA_DIGITALIZADA = 0x9004
+_TAG_DATA = 0x0132
+_MAX_ENTRADAS_IFD = 1024
+
+
+def _data_tiff(f: IO[bytes], base: int = 0) -> Optional[str]:
+    """Data de um cabeçalho TIFF (também o bloco EXIF do JPEG) em ``base``; lê só as IFDs."""
+    f.seek(base)
+    cabecalho = f.read(8)
+    if cabecalho[:2] == b"II":
+        ordem = "<"
+    elif cabecalho[:2] == b"MM":
+        ordem = ">"
+    else:
+        return None
+    marca, ifd0 = struct.unpack(ordem + "HI", cabecalho[2:8])
+    if marca != 42:
+        return None
+
+    def ler_ifd(offset: int) -> Dict[int, Tuple[int, int, bytes]]:
+        f.seek(base + offset)
+        n = struct.unpack(ordem + "H", f.read(2))[0]
+        if n > _MAX_ENTRADAS_IFD:
+            return {}
+        dados = f.read(12 * n)
+        entradas = {}
+        for i in range(0, len(dados) - 11, 12):
+            tag, tipo, qtd = struct.unpack(ordem + "HHI", dados[i:i + 8])
+            entradas[tag] = (tipo, qtd, dados[i + 8:i + 12])
+        return entradas
+
+    def texto(entrada: Tuple[int, int, bytes]) -> Optional[str]:
+        tipo, qtd, valor = entrada
+        if tipo != 2 or not 10 <= qtd <= 64:  # ASCII "AAAA:MM:DD HH:MM:SS"
+            return None
+        f.seek(base + struct.unpack(ordem + "I", valor)[0])
+        return f.read(qtd).decode("ascii", "replace")
+
+    def data_de(entrada: Optional[Tuple[int, int, bytes]]) -> Optional[str]:
+        bruto = texto(entrada) if entrada else None
+        m = re.match(r"(\d{4})[:-](\d{2})[:-](\d{2})", bruto or "")
+        return _data_valida(int(m.group(1)), int(m.group(2)), int(m.group(3))) if m else None
+
+    principal = ler_ifd(ifd0)
+    exif = principal.get(_TAG_EXIF_IFD)
+    if exif:
+        sub = ler_ifd(struct.unpack(ordem + "I", exif[2])[0])
+        data = data_de(sub.get(_TAG_DATA_ORIGINAL)) or data_de(sub.get(_TAG_DATA_DIGITALIZADA))
+        if data:
+            return data
+    return data_de(principal.get(_TAG_DATA))
+
+
+def data_tiff(caminho: str) -> Optional[str]:
+    with open(caminho, "rb") as f:
+        return _data_tiff(f)
+
+
+def data_jpeg(caminho: str) -> Optional[str]:
+    """Percorre os segmentos do início do JPEG até o APP1/EXIF (para no início da imagem)."""
+    with open(caminho, "rb") as f:
+        if f.read(2) != b"\xff\xd8":
+            return None
+        while True:
+            marca = f.read(2)
+            if len(marca) < 2 or marca[0] != 0xFF:
+                return None
+            tipo = marca[1]
+            if tipo == 0xFF:  # preenchimento
+                f.seek(-1, os.SEEK_CUR)
+                continue
+            if tipo in (0xD9, 0xDA):  # fim da imagem / início dos dados
+                return None
+            if 0xD0 <= tipo <= 0xD7 or tipo == 0x01:  # marcadores sem tamanho
+                continue
+            tam = struct.unpack(">H", f.read(2))[0]
+            if tipo == 0xE1:
+                dados = f.read(tam - 2)
+                if dados[:6] == b"Exif\0\0":
+                    return _data_tiff(io.BytesIO(dados), 6)
+            else:
+                f.seek(tam - 2, os.SEEK_CUR)
+
+
+# ---------- PDF ----------
+_BLOCO_PDF = 64 * 1024
+_RE_PDF_DATA = re.compile(rb"/CreationDate\s*\(\s*(?:D:)?(\d{4})(\d{2})(\d{2})")
+_RE_XMP_DATA = re.compile(rb"xmp:CreateDate\s*(?:>|=\s*[\"'])\s*(\d{4})-(\d{2})-(\d{2})")
+
+
+def data_pdf(caminho: str) -> Optional[str]:
+    """``/CreationDate`` ou ``xmp:CreateDate`` no fim (dicionário Info) ou no início (linearizado).
+
+    Em PDFs que guardam o Info num fluxo comprimido a data não é encontrada
+    e vale a de modificação.
+    """
+    with open(caminho, "rb") as f:
+        inicio = f.read(_BLOCO_PDF)
+        f.seek(0, os.SEEK_END)
+        tamanho = f.tell()
+        fim = b""
+        if tamanho > _BLOCO_PDF:
+            f.seek(max(_BLOCO_PDF, tamanho - _BLOCO_PDF))
+            fim = f.read()
+    for bloco in (fim, inicio):
+        for regex in (_RE_PDF_DATA, _RE_XMP_DATA):
+            m = regex.search(bloco)
+            if m:
+                data = _data_valida(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+                if data:
+                    return data
+    return None
+
+
+# ---------- Office / ODF ----------
+_RE_OOXML_DATA = re.compile(rb"<dcterms:created[^>]*>([^<]+)<")
+_RE_ODF_DATA = re.compile(rb"<meta:creation-date>([^<]+)<")
+
+
+def _membro_zip(caminho: str, membro: str, regex: "re.Pattern[bytes]") -> Optional[str]:
+    # O zipfile lê só o diretório central (no fim) e o membro pedido.
+    with zipfile.ZipFile(caminho) as z:
+        try:
+            xml = z.read(membro)
+        except KeyError:
+            return None
+    m = regex.search(xml)
+    return _data_iso(m.group(1).decode("ascii", "replace")) if m else None
+
+
+def data_office(caminho: str) -> Optional[str]:
+    return _membro_zip(caminho, "docProps/core.xml", _RE_OOXML_DATA)
+
+
+def data_odf(caminho: str) -> Optional[str]:
+    return _membro_zip(caminho, "meta.xml", _RE_ODF_DATA)
+
+
+# ---------- Registro de extratores ----------
+_EXTRATORES: Dict[str, Tuple[str, Extrator]] = {}
+
+
+def registrar_extrator(fonte: str, extensoes: Iterable[str], extrator: Extrator) -> None:
+    """Usa ``extrator`` para as ``extensoes`` (com ponto, ex.: ``".heic"``); substitui o anterior."""
+    for ext in extensoes:
+        _EXTRATORES[ext.lower()] = (fonte, extrator)
+
+
+registrar_extrator(FONTE_EXIF, (".jpg", ".jpeg", ".jpe", ".jfif"), data_jpeg)
+registrar_extrator(FONTE_EXIF, (".tif", ".tiff", ".dng", ".nef", ".cr2", ".arw"), data_tiff)
+registrar_extrator(FONTE_PDF, (".pdf",), data_pdf)
+registrar_extrator(FONTE_OFFICE, (".docx", ".docm", ".xlsx", ".xlsm", ".pptx", ".pptm"), data_office)
+registrar_extrator(FONTE_OFFICE, (".odt", ".ods", ".odp"), data_odf)
+
+
+# ---------- Versão ----------
+_RE_VERSAO = re.compile(
+    r"(?:^|[^a-z0-9])(?:v|ver|vers[aã]o|version|rev|revis[aã]o)[\s._-]?(\d{1,3})(?![0-9])",
+    re.IGNORECASE,
+)
+
+
+def versao_do_nome(caminho: str) -> Optional[str]:
+    """Última versão escrita no nome (``relatorio_v2.pdf`` -> ``"2"``), sem zeros à esquerda."""
+    radical = os.path.splitext(os.path.basename(caminho))[0]
+    achados = _RE_VERSAO.findall(radical)
+    return str(int(achados[-1])) if achados else None
+
+
+# ---------- Extração ----------
+def extrair(caminho: str, st: Optional[os.stat_result] = None) -> Metadados:
+    """Metadados de ``caminho``; a data de modificação é o último recurso (``OSError`` se nem stat der)."""
+    data = None
+    fonte = FONTE_MTIME
+    registrado = _EXTRATORES.get(os.path.splitext(caminho)[1].lower())
+    if registrado:
+        try:
+            data = registrado[1](caminho)
+        except Exception:
+            # Arquivo corrompido ou fora do padrão: cai para a data de modificação.
+            data = None
+        if data:
+            fonte = registrado[0]
+    if not data:
+        st = st or os.stat(caminho)
+        data = datetime.date.fromtimestamp(st.st_mtime).strftime("%Y%m%d")
+    return Metadados(data, fonte, versao_do_nome(caminho))
+
+
+class CacheMetadados(CacheArquivos):
+    def __init__(self, caminho: str):
+        # A versão no nome da tabela descarta o cache quando os extratores mudam.
+        super().__init__(caminho, "metadados_v1", ("data", "fonte", "versao"))
+
+
+def abrir_cache(pasta_config: str) -> Optional[CacheMetadados]:
+    """Cache em ``<configuração>/cache``; ``None`` se não der para abrir (segue sem cache)."""
+    try:
+        return CacheMetadados(caminho_cache(pasta_config, NOME_CACHE))
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def metadados_de(caminho: str, cache: Optional[CacheMetadados] = None) -> Optional[Metadados]:
+    """Metadados de ``caminho`` (do cache, se o arquivo não mudou); ``None`` se o arquivo não existe."""
+    try:
+        st = os.stat(caminho)
+    except OSError:
+        return None
+    chave = chave_caminho(caminho) if cache else ""
+    if cache:
+        linha = cache.consultar(chave, st.st_size, st.st_mtime_ns)
+        if linha:
+            return Metadados(*linha)  # type: ignore[arg-type]
+    meta = extrair(caminho, st)
+    if cache:
+        cache.guardar(chave, st.st_size, st.st_mtime_ns, (meta.data, meta.fonte, meta.versao))
+    return meta
+
+
+def extrair_lote(
+    arquivos: Iterable[str],
+    *,
+    tarefas: int = 4,
+    cache: Optional[CacheMetadados] = None,
+    cancelar: Optional[threading.Event] = None,
+) -> Iterator[Tuple[str, Optional[Metadados]]]:
+    """``(caminho, metadados)`` na ordem de ``arquivos``, com até ``4 * tarefas`` leituras em andamento."""
+
+    def um(caminho: str) -> Optional[Metadados]:
+        if cancelar is not None and cancelar.is_set():
+            return None
+        return metadados_de(caminho, cache)
+
+    limite = 4 * max(1, tarefas)
+    em_voo: Deque[Tuple[str, "Future[Optional[Metadados]]"]] = collections.deque()
+    with ThreadPoolExecutor(max_workers=max(1, tarefas)) as pool:
+        for caminho in arquivos:
+            em_voo.append((caminho, pool.submit(um, caminho)))
+            if len(em_voo) >= limite:
+                caminho, fut = em_voo.popleft()
+                yield caminho, fut.result()
+        while em_voo:
+            caminho, fut = em_voo.popleft()
+            yield caminho, fut.result()
+    if cache:
+        cache.salvar()
+
+
+# ---------- Planos por arquivo ----------
+class PlanosPorArquivo:
+    """``PlanoNome`` de cada arquivo: os campos fixos do lote mais a data e/ou a versão dele.
+
+    A versão digitada nos campos tem precedência sobre a do nome. Arquivos com
+    a mesma data e versão dividem o mesmo plano (e a mesma numeração).
+    """
+
+    def __init__(
+        self,
+        setores: Dict[str, str],
+        eventos: Dict[str, str],
+        *,
+        usar_data: bool = True,
+        usar_versao: bool = True,
+        **campos: str,
+    ):
+        self.setores = setores
+        self.eventos = eventos
+        self.usar_data = usar_data
+        versao = (campos.pop("versao", "") or "").strip()
+        self.versao_fixa = versao if versao.isdigit() else ""
+        self.usar_versao = usar_versao and not self.versao_fixa
+        self.campos = campos
+        self._planos: Dict[Tuple[Optional[str], str], PlanoNome] = {}
+
+    def plano_para(self, meta: Optional[Metadados]) -> PlanoNome:
+        data = meta.data if meta and self.usar_data else None
+        versao = (meta.versao or "") if meta and self.usar_versao else self.versao_fixa
+        chave = (data, versao)
+        plano = self._planos.get(chave)
+        if plano is None:
+            plano = self._planos[chave] = PlanoNome.criar(
+                versao=versao, setores=self.setores, eventos=self.eventos, data=data, **self.campos
+            )
+        return plano
+
+
+def planos_dos_arquivos(
+    arquivos: Iterable[str],
+    planos: PlanosPorArquivo,
+    *,
+    tarefas: int = 4,
+    cache: Optional[CacheMetadados] = None,
+    cancelar: Optional[threading.Event] = None,
+) -> Iterator[Tuple[str, PlanoNome]]:
+    for caminho, meta in extrair_lote(arquivos, tarefas=tarefas, cache=cache, cancelar=cancelar):
+        yield caminho, planos.plano_para(meta)
+
+
+def agrupar_por_plano(pares: Iterable[Tuple[str, PlanoNome]]) -> List[Tuple[PlanoNome, PlanoCompacto]]:
+    """Um grupo por nome-base, na ordem em que aparecem; dentro dele, a ordem da seleção."""
+    grupos: Dict[str, Tuple[PlanoNome, PlanoCompacto]] = {}
+    for caminho, plano in pares:
+        grupo = grupos.get(plano.base)
+        if grupo is None:
+            grupo = grupos[plano.base] = (plano, PlanoCompacto())
+        grupo[1].adicionar(caminho)
+    return list(grupos.values())
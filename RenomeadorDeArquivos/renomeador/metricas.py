@@ -0,0 +1,253 @@
+"""
+Métricas e log estruturado dos lotes — para separar compartilhamento lento de código lento.
+
+``MetricasLote`` soma o tempo de cada etapa (varredura da entrada,
+planejamento, renumeração depois de falha, ``os.replace``, diário), conta
+erros por tipo de exceção e guarda a latência de cada renome num histograma
+logarítmico (memória fixa, p50/p99 com ~9% de resolução). Cada thread de
+trabalho usa a sua instância e o executor junta tudo no fim; não há trava no
+caminho quente.
+
+O log fica em ``<configuração>/logs/renomeador.log``: uma linha JSON por
+evento (erros de renome com o caminho completo, resumo de cada lote),
+com rotação por tamanho.
+"""
+
+import contextlib
+import datetime
+import json
+import logging
+import logging.handlers
+import math
+import os
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+PASTA_LOGS = "logs"  # dentro da pasta de configuração
+NOME_LOG = "renomeador.log"
+_LOG_TAMANHO = 1024 * 1024
+_LOG_COPIAS = 5
+
+# Etapas medidas
+VARREDURA = "varredura"  # leitura da entrada (lista, stdin, varredura de pasta)
+PLANEJAMENTO = "planejamento"  # leitura da pasta + numeração de cada fatia
+RENUMERACAO = "renumeracao"  # novo número depois de uma falha na pasta
+RENOMEACAO = "renomeacao"  # os.replace
+DIARIO = "diario"  # gravação (e fsync) do diário
+
+log = logging.getLogger("renomeador")
+log.addHandler(logging.NullHandler())  # sem log configurado, nada vai para o stderr
+
+
+# ---------- Histograma ----------
+_PASSOS_POR_OITAVA = 8
+_MENOR = 1e-6  # 1 µs
+_BALDES = 27 * _PASSOS_POR_OITAVA  # até ~2 min
+
+
+class Histograma:
+    """Latências em baldes de razão 2**(1/8) a partir de 1 µs."""
+
+    __slots__ = ("contagens", "n", "soma", "maximo")
+
+    def __init__(self) -> None:
+        self.contagens: List[int] = [0] * (_BALDES + 1)
+        self.n = 0
+        self.soma = 0.0
+        self.maximo = 0.0
+
+    def adicionar(self, segundos: float) -> None:
+        if segundos <= _MENOR:
+            balde = 0
+        else:
+            balde = min(_BALDES, int(math.log2(segundos / _MENOR) * _PASSOS_POR_OITAVA) + 1)
+        self.contagens[balde] += 1
+        self.n += 1
+        self.soma += segundos
+        if segundos > self.maximo:
+            self.maximo = segundos
+
+    def juntar(self, outro: "Histograma") -> None:
+        for i, c in enumerate(outro.contagens):
+            if c:
+                self.contagens[i] += c
+        self.n += outro.n
+        self.soma += outro.soma
+        self.maximo = max(self.maximo, outro.maximo)
+
+    def percentil(self, p: float) -> Optional[float]:
+        """Limite superior do balde que contém o percentil ``p`` (0–100); ``None`` se vazio."""
+        if not self.n:
+            return None
+        alvo = max(1, math.ceil(self.n * p / 100))
+        acumulado = 0
+        for balde, c in enumerate(self.contagens):
+            acumulado += c
+            if acumulado >= alvo:
+                return min(self.maximo, _MENOR * 2 ** (balde / _PASSOS_POR_OITAVA))
+        return self.maximo
+
+
+# ---------- Métricas ----------
+class MetricasLote:
+    __slots__ = ("etapas", "contadores", "erros_por_tipo", "latencia", "inicio", "fim")
+
+    def __init__(self) -> None:
+        self.etapas: Dict[str, float] = {}  # etapa -> segundos
+        self.contadores: Dict[str, int] = {}
+        self.erros_por_tipo: Dict[str, int] = {}
+        self.latencia = Histograma()  # de cada os.replace
+        self.inicio = time.perf_counter()
+        self.fim: Optional[float] = None
+
+    def somar(self, etapa: str, segundos: float) -> None:
+        self.etapas[etapa] = self.etapas.get(etapa, 0.0) + segundos
+
+    @contextlib.contextmanager
+    def etapa(self, nome: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.somar(nome, time.perf_counter() - t0)
+
+    def contar(self, nome: str, n: int = 1) -> None:
+        self.contadores[nome] = self.contadores.get(nome, 0) + n
+
+    def erro(self, tipo: str) -> None:
+        self.erros_por_tipo[tipo] = self.erros_por_tipo.get(tipo, 0) + 1
+
+    def renomeado(self, segundos: float) -> None:
+        self.latencia.adicionar(segundos)
+
+    def juntar(self, outra: "MetricasLote") -> None:
+        """Soma as métricas de uma fatia; com fatias em paralelo, o tempo das etapas soma o de todas as threads."""
+        for etapa, s in outra.etapas.items():
+            self.somar(etapa, s)
+        for nome, n in outra.contadores.items():
+            self.contar(nome, n)
+        for tipo, n in outra.erros_por_tipo.items():
+            self.erros_por_tipo[tipo] = self.erros_por_tipo.get(tipo, 0) + n
+        self.latencia.juntar(outra.latencia)
+
+    def encerrar(self) -> None:
+        self.fim = time.perf_counter()
+
+    @property
+    def duracao(self) -> float:
+        return (self.fim if self.fim is not None else time.perf_counter()) - self.inicio
+
+    def como_dict(self) -> Dict[str, object]:
+        etapas = dict(self.etapas)
+        if self.latencia.n:
+            etapas[RENOMEACAO] = self.latencia.soma
+        p50 = self.latencia.percentil(50)
+        p99 = self.latencia.percentil(99)
+        duracao = self.duracao
+        return {
+            "duracao_s": round(duracao, 4),
+            "renomeados": self.latencia.n,
+            "arquivos_s": round(self.latencia.n / duracao, 1) if duracao > 0 else None,
+            "p50_ms": None if p50 is None else round(p50 * 1000, 3),
+            "p99_ms": None if p99 is None else round(p99 * 1000, 3),
+            "max_ms": round(self.latencia.maximo * 1000, 3) if self.latencia.n else None,
+            "etapas_s": {k: round(v, 4) for k, v in etapas.items()},
+            "contadores": dict(self.contadores),
+            "erros_por_tipo": dict(self.erros_por_tipo),
+        }
+
+    def resumo(self) -> str:
+        d = self.como_dict()
+        msg = f"Tempo: {d['duracao_s']:.2f} s"
+        if d["renomeados"]:
+            msg += f" — {d['arquivos_s']} arquivo(s)/s; renome p50 {d['p50_ms']} ms, p99 {d['p99_ms']} ms"
+        etapas = d["etapas_s"]
+        if etapas:
+            msg += "\nEtapas: " + ", ".join(f"{k} {v:.2f} s" for k, v in etapas.items())  # type: ignore[union-attr]
+        if self.contadores:
+            msg += "\nContagens: " + ", ".join(f"{k} {v}" for k, v in self.contadores.items())
+        if self.erros_por_tipo:
+            msg += "\nErros por tipo: " + ", ".join(f"{k} {v}" for k, v in self.erros_por_tipo.items())
+        return msg
+
+
+def medir_iteracao(itens: Iterable[T], metricas: MetricasLote, etapa: str = VARREDURA) -> Iterator[T]:
+    """Repassa ``itens`` somando em ``etapa`` o tempo gasto para obter cada um (ex.: varredura de pasta)."""
+    it = iter(itens)
+    relogio = time.perf_counter
+    while True:
+        t0 = relogio()
+        try:
+            item = next(it)
+        except StopIteration:
+            return
+        metricas.somar(etapa, relogio() - t0)
+        yield item
+
+
+# ---------- Log ----------
+class _FormatoJson(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        registro: Dict[str, object] = {
+            "ts": datetime.datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "nivel": record.levelname,
+            "evento": record.getMessage(),
+        }
+        registro.update(getattr(record, "dados", None) or {})
+        if record.exc_info:
+            registro["excecao"] = self.formatException(record.exc_info)
+        return json.dumps(registro, ensure_ascii=False, default=str)
+
+
+def caminho_log(pasta_config: str) -> str:
+    return os.path.join(pasta_config, PASTA_LOGS, NOME_LOG)
+
+
+def configurar_log(pasta_config: str) -> Optional[str]:
+    """Liga o log JSON com rotação na pasta de configuração; devolve o caminho (``None`` se não deu)."""
+    caminho = caminho_log(pasta_config)
+    for h in log.handlers:
+        if isinstance(h, logging.handlers.RotatingFileHandler) and h.baseFilename == os.path.abspath(caminho):
+            return caminho
+    try:
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        # delay: o arquivo só é aberto na primeira linha gravada.
+        handler = logging.handlers.RotatingFileHandler(
+            caminho, maxBytes=_LOG_TAMANHO, backupCount=_LOG_COPIAS, encoding="utf-8", delay=True
+        )
+    except OSError:
+        return None
+    handler.setFormatter(_FormatoJson())
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+    return caminho
+
+
+def registrar_erro(origem: str, destino: Optional[str], erro: Optional[BaseException], idx: int) -> None:
+    log.warning(
+        "erro_renomear",
+        extra={"dados": {
+            "idx": idx,
+            "origem": origem,
+            "destino": destino,
+            "tipo": type(erro).__name__ if erro is not None else "SemNome",
+            "mensagem": str(erro) if erro is not None else "nome final não pôde ser gerado",
+        }},
+    )
+
+
+def registrar_lote(resultado, contexto: Optional[Dict[str, object]] = None) -> None:
+    """Uma linha com o resultado de um ``ResultadoLote`` e as métricas dele."""
+    dados: Dict[str, object] = dict(contexto or {})
+    dados.update(
+        total=resultado.total,
+        ok=resultado.ok,
+        erros=len(resultado.erros),
+        cancelados=resultado.cancelados,
+        encurtados=len(resultado.encurtados),
+    )
+    if resultado.metricas is not None:
+        dados.update(resultado.metricas.como_dict())
+    log.info("lote", extra={"dados": dados})
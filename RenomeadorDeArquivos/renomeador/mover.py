@@ -0,0 +1,106 @@
+"""
+Mover arquivo para outra pasta — inclusive em outro volume (arquivo central, compartilhamento).
+
+Na mesma partição é um ``os.replace``. Entre partições (``EXDEV``) o conteúdo
+é copiado pelo kernel quando dá (``os.copy_file_range``, depois
+``os.sendfile``), senão em blocos grandes, para um temporário oculto na pasta
+de destino; o temporário recebe as datas e permissões da origem, é
+sincronizado em disco, opcionalmente conferido por hash, e só então vira o
+destino (``os.replace``) e a origem é apagada. Uma falha no meio deixa a
+origem intacta e não deixa destino pela metade.
+"""
+
+import contextlib
+import errno
+import os
+import shutil
+import sys
+import tempfile
+
+from .duplicados import hash_completo
+
+_BLOCO_COPIA = 8 * 1024 * 1024
+# Erros com que as cópias pelo kernel recusam o par de arquivos (tenta o próximo método).
+_SEM_SUPORTE = {errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF, errno.EPERM}
+
+
+class ErroVerificacao(OSError):
+    """A cópia não confere com a origem (hash diferente); a origem foi mantida."""
+
+
+# ---------- Cópia ----------
+def _copiar_kernel(fn, fd_origem: int, fd_destino: int, tamanho: int) -> bool:
+    """Copia com ``fn(fd_origem, fd_destino, offset, n)``; ``False`` se o método não serve (nada copiado)."""
+    copiado = 0
+    while copiado < tamanho:
+        try:
+            n = fn(fd_origem, fd_destino, copiado, min(_BLOCO_COPIA, tamanho - copiado))
+        except OSError as e:
+            if copiado == 0 and e.errno in _SEM_SUPORTE:
+                return False
+            raise
+        if n == 0:
+            break  # arquivo encolheu durante a cópia
+        copiado += n
+    return True
+
+
+def _copy_file_range(fd_origem: int, fd_destino: int, offset: int, n: int) -> int:
+    return os.copy_file_range(fd_origem, fd_destino, n, offset, offset)
+
+
+def _sendfile(fd_origem: int, fd_destino: int, offset: int, n: int) -> int:
+    return os.sendfile(fd_destino, fd_origem, offset, n)
+
+
+def copiar_conteudo(origem, destino) -> None:
+    """Copia o arquivo aberto ``origem`` para ``destino`` (ambos binários, destino vazio)."""
+    fd_origem, fd_destino = origem.fileno(), destino.fileno()
+    tamanho = os.fstat(fd_origem).st_size
+    if hasattr(os, "copy_file_range") and _copiar_kernel(_copy_file_range, fd_origem, fd_destino, tamanho):
+        return
+    # sendfile para arquivo comum só no Linux (no macOS o destino tem de ser socket).
+    if sys.platform.startswith("linux") and _copiar_kernel(_sendfile, fd_origem, fd_destino, tamanho):
+        return
+    buf = bytearray(_BLOCO_COPIA)
+    with memoryview(buf) as mv:
+        while True:
+            n = origem.readinto(buf)
+            if not n:
+                break
+            destino.write(mv[:n])
+
+
+# ---------- Mover ----------
+def mover_arquivo(origem: str, destino: str, *, verificar: bool = False) -> bool:
+    """Move ``origem`` para ``destino`` (substitui, como ``os.replace``). Devolve se precisou copiar.
+
+    ``verificar`` confere o hash da cópia contra o da origem antes de apagar a
+    origem (só vale entre volumes; na mesma partição nada é copiado).
+    """
+    try:
+        os.replace(origem, destino)
+        return False
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+
+    pasta = os.path.dirname(destino) or "."
+    fd, temporario = tempfile.mkstemp(prefix=".renomeador-", suffix=".parcial", dir=pasta)
+    try:
+        with os.fdopen(fd, "wb") as f_destino, open(origem, "rb") as f_origem:
+            copiar_conteudo(f_origem, f_destino)
+            f_destino.flush()
+            os.fsync(f_destino.fileno())
+        shutil.copystat(origem, temporario)
+        if verificar:
+            tamanho = os.path.getsize(origem)
+            if hash_completo(origem, tamanho) != hash_completo(temporario, tamanho):
+                raise ErroVerificacao(errno.EIO, "a cópia não confere com a origem", origem)
+        os.replace(temporario, destino)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temporario)
+        raise
+    os.remove(origem)
+    return True
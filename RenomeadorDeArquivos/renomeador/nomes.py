@@ -0,0 +1,210 @@
+"""
+Montagem de nomes — sanitização e plano de nome reutilizável em lote.
+"""
+
+import datetime
+import functools
+import os
+import re
+import unicodedata
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+PLACEHOLDER_DOCUMENTO = "Ex: ADITIVO CONTRATUAL"
+PLACEHOLDER_VERSAO = "Ex: 1"
+
+_RE_INVALIDO_COMPONENTE = re.compile(r"[^A-Za-z0-9\-_]+")
+_RE_HIFENS = re.compile(r"-{2,}")
+_RE_INVALIDO_DOCUMENTO = re.compile(r"[^A-Za-z0-9]")
+
+# Setor, evento, funcionário e documento se repetem em todo o lote e em cada
+# atualização do preview; o cache evita refazer NFKD + regex a cada chamada.
+_TAM_CACHE = 1024
+
+
+# ---------- Sanitização ----------
+def ascii_sem_acentos(s: str) -> str:
+    return unicodedata.normalize("NFKD", s).encode("ascii", "ignore").decode("ascii")
+
+
+@functools.lru_cache(maxsize=_TAM_CACHE)
+def sanitizar_componente(texto: str, *, upper: bool = False) -> str:
+    if not texto:
+        return ""
+    s = texto.strip()
+    if not s:
+        return ""
+    if upper:
+        s = s.upper()
+    s = ascii_sem_acentos(s)
+    s = s.replace(" ", "-")
+    s = _RE_INVALIDO_COMPONENTE.sub("-", s)
+    s = _RE_HIFENS.sub("-", s)
+    return s.strip("-_.")
+
+
+@functools.lru_cache(maxsize=_TAM_CACHE)
+def sanitizar_documento(texto: str) -> str:
+    if not texto:
+        return ""
+    s = texto.strip()
+    if not s:
+        return ""
+    s = ascii_sem_acentos(s.upper())
+    s = s.replace(" ", "")
+    return _RE_INVALIDO_DOCUMENTO.sub("", s)
+
+
+# ---------- Numeração / data ----------
+def formatar_numero(n: int) -> str:
+    return f"{n:03d}"
+
+
+def data_atual() -> str:
+    return datetime.date.today().strftime("%Y%m%d")
+
+
+# ---------- Limites de caminho ----------
+_MAX_FULL = 259 if os.name == "nt" else 4096
+_MAX_LONGO = 32767  # caminhos "\\?\" do Windows
+_MAX_NOME = 255
+PREFIXO_LONGO = "\\\\?\\"
+
+# Pasta absoluta -> ``limite_do_nome``.
+_LIMITES: Dict[str, int] = {}
+
+# O que nunca sai ao encurtar: a versão (-vNN) e o número (-NNN) no fim do nome.
+_RE_CAUDA = re.compile(r"(?:-v\d{2,})?(?:-\d{3,})?$")
+
+
+def caminho_longo(caminho: str) -> str:
+    """``caminho`` absoluto com o ``PREFIXO_LONGO`` do Windows, que libera o limite de 259 caracteres.
+
+    Nos demais sistemas devolve ``caminho`` sem mudança.
+    """
+    if os.name != "nt" or caminho.startswith(PREFIXO_LONGO):
+        return caminho
+    absoluto = os.path.abspath(caminho)
+    if absoluto.startswith("\\\\"):
+        return PREFIXO_LONGO + "UNC\\" + absoluto[2:]
+    return PREFIXO_LONGO + absoluto
+
+
+def limite_do_nome(diretorio: str) -> int:
+    """Caracteres disponíveis para um nome de arquivo (com a extensão) em ``diretorio``.
+
+    Calculado sobre o caminho absoluto e guardado por pasta; uma pasta
+    relativa é resolvida a cada vez (o limite dela muda com a pasta de
+    trabalho). Em pastas com o ``PREFIXO_LONGO`` só vale o limite de 255 do
+    próprio nome.
+    """
+    limite = _LIMITES.get(diretorio)
+    if limite is not None:
+        return limite
+    if diretorio.startswith(PREFIXO_LONGO):
+        limite = min(_MAX_NOME, _MAX_LONGO - len(diretorio) - 1)
+    else:
+        absoluto = os.path.abspath(diretorio)
+        reserva = 5 if os.name == "nt" else 0
+        limite = min(_MAX_NOME, _MAX_FULL - len(absoluto) - 1 - reserva)
+        if absoluto != diretorio:
+            return limite
+    if len(_LIMITES) >= _TAM_CACHE:
+        _LIMITES.clear()
+    _LIMITES[diretorio] = limite
+    return limite
+
+
+def _encurtar(nome: str, fim: str, limite: int) -> Optional[str]:
+    """``nome + fim`` em até ``limite`` caracteres, cortando o meio de ``nome``.
+
+    ``fim`` (número e extensão) e a versão/número no fim de ``nome`` ficam
+    inteiros; ``None`` se nem eles cabem.
+    """
+    if len(nome) + len(fim) <= limite:
+        return nome + fim
+    cauda = _RE_CAUDA.search(nome).group()  # type: ignore[union-attr]
+    corpo = nome[: len(nome) - len(cauda)]
+    cabe = limite - len(fim) - len(cauda)
+    corpo = corpo[:cabe].rstrip("-_.") if cabe > 0 else ""
+    if not corpo:
+        return None
+    return f"{corpo}{cauda}{fim}"
+
+
+def encurtar_se_preciso(diretorio: str, filename: str) -> Optional[str]:
+    """Nome que cabe em ``diretorio``; encurta o meio, nunca a versão (-vNN) nem o número (-NNN)."""
+    basename = os.path.basename(filename)
+    name, ext = os.path.splitext(basename)
+    return _encurtar(name, ext, limite_do_nome(diretorio))
+
+
+# ---------- Plano de nome ----------
+class PlanoNome:
+    """Prefixo já sanitizado para um lote; só sufixo e extensão variam por arquivo."""
+
+    __slots__ = ("base",)
+
+    def __init__(self, base: str):
+        self.base = base
+
+    @classmethod
+    def criar(
+        cls,
+        *,
+        setor: str = "",
+        evento: str = "",
+        funcionario: str = "",
+        documento: str = "",
+        versao: str = "",
+        setores: Dict[str, str],
+        eventos: Dict[str, str],
+        data: Optional[str] = None,
+    ) -> "PlanoNome":
+        documento = (documento or "").strip()
+        versao = (versao or "").strip()
+
+        partes: List[str] = [sanitizar_componente(data if data is not None else data_atual())]
+        if setor in setores:
+            partes.append(sanitizar_componente(setores[setor]))
+        if evento in eventos:
+            partes.append(sanitizar_componente(eventos[evento]))
+        if funcionario:
+            partes.append(sanitizar_componente(funcionario))
+        if documento and documento != PLACEHOLDER_DOCUMENTO:
+            partes.append(sanitizar_documento(documento))
+        if versao and versao != PLACEHOLDER_VERSAO and versao.isdigit():
+            partes.append(f"v{int(versao):02d}")
+
+        return cls("-".join(p for p in partes if p))
+
+    def nome_para(self, arquivo: str, sufixo_num: Optional[int] = None) -> Optional[str]:
+        if not arquivo:
+            return None
+        return self.nome_em(os.path.dirname(arquivo), os.path.splitext(arquivo)[1], sufixo_num)
+
+    def nome_em(self, diretorio: str, ext: str, sufixo_num: Optional[int] = None) -> Optional[str]:
+        """Como ``nome_para``, a partir da pasta e da extensão já separadas.
+
+        Acima do limite da pasta (``limite_do_nome``), o meio da base é
+        cortado; a versão e o número ficam, então nomes distintos continuam
+        distintos. ``None`` se nem isso cabe.
+        """
+        if not self.base:
+            return None
+        fim = ext if sufixo_num is None else f"-{formatar_numero(sufixo_num)}{ext}"
+        limite = limite_do_nome(diretorio)
+        if len(self.base) + len(fim) <= limite:
+            return self.base + fim
+        return _encurtar(self.base, fim, limite)
+
+    def encurtado(self, nome: str, ext: str, sufixo_num: Optional[int] = None) -> bool:
+        """``nome`` (de ``nome_em``) perdeu parte da base pelo limite de caminho."""
+        completo = len(self.base) + len(ext)
+        if sufixo_num is not None:
+            completo += 1 + len(formatar_numero(sufixo_num))
+        return len(nome) < completo
+
+    def nomes(self, arquivos: Iterable[str], inicio: Optional[int] = 1) -> Iterator[Tuple[str, Optional[str]]]:
+        """Gera (origem, nome) em fluxo; ``inicio=None`` desliga a numeração."""
+        for idx, arquivo in enumerate(arquivos, start=inicio or 0):
+            yield arquivo, self.nome_para(arquivo, idx if inicio is not None else None)
@@ -0,0 +1,314 @@
+"""
+Numeração em lote — índice em memória dos nomes já usados em cada pasta.
+
+Cada pasta é listada uma única vez com ``os.scandir``; o próximo número livre
+sai do índice, sem ``os.path.exists`` por tentativa. O resultado é o mesmo da
+regra original: começa em ``idx`` e avança até o primeiro nome que não existe.
+
+Com ``CacheSufixos``, os números já usados por um nome-base numa pasta ficam
+gravados em disco (em faixas: ``1-40`` numa pasta numerada sem buracos) junto
+com o mtime da pasta. Enquanto a pasta não muda por fora, o próximo lote
+começa das faixas gravadas, sem listar a pasta: numerar custa o tamanho do
+lote, não o da pasta.
+"""
+
+import bisect
+import json
+import os
+import sqlite3
+from typing import Dict, List, Optional, Set, Tuple
+
+from .cache import CacheArquivos, caminho_cache
+from .nomes import PlanoNome, formatar_numero
+
+NOME_CACHE = "sufixos.db"
+
+
+class IndiceDiretorio:
+    """Nomes presentes numa pasta (``os.path.normcase``), lidos uma vez."""
+
+    __slots__ = ("diretorio", "nomes")
+
+    def __init__(self, diretorio: str):
+        self.diretorio = diretorio
+        self.nomes: Set[str] = set()
+        try:
+            with os.scandir(diretorio or ".") as it:
+                for entrada in it:
+                    self.nomes.add(os.path.normcase(entrada.name))
+        except OSError:
+            pass
+
+    def copia(self) -> "IndiceDiretorio":
+        """Outro índice com os mesmos nomes, sem reler a pasta."""
+        novo = IndiceDiretorio.__new__(IndiceDiretorio)
+        novo.diretorio = self.diretorio
+        novo.nomes = set(self.nomes)
+        return novo
+
+    def contem(self, nome: str) -> bool:
+        return os.path.normcase(nome) in self.nomes
+
+    def adicionar(self, nome: str) -> None:
+        self.nomes.add(os.path.normcase(nome))
+
+    def remover(self, nome: str) -> None:
+        self.nomes.discard(os.path.normcase(nome))
+
+
+class NumerosOcupados:
+    """Conjunto de sufixos ocupados com busca do próximo livre em tempo quase constante.
+
+    ``_prox`` é um union-find com compressão de caminho (n -> candidato seguinte);
+    números liberados depois de ocupados ficam em ``_liberados`` (ordenada),
+    que tem precedência sobre os saltos já comprimidos.
+    """
+
+    __slots__ = ("_prox", "_liberados")
+
+    def __init__(self) -> None:
+        self._prox: Dict[int, int] = {}
+        self._liberados: List[int] = []
+
+    def ocupar(self, n: int) -> None:
+        i = bisect.bisect_left(self._liberados, n)
+        if i < len(self._liberados) and self._liberados[i] == n:
+            del self._liberados[i]
+        self._prox.setdefault(n, n + 1)
+
+    def liberar(self, n: int) -> None:
+        if n not in self._prox:
+            return
+        i = bisect.bisect_left(self._liberados, n)
+        if i == len(self._liberados) or self._liberados[i] != n:
+            self._liberados.insert(i, n)
+
+    def ocupar_faixa(self, inicio: int, fim: int) -> None:
+        for n in range(inicio, fim + 1):
+            self.ocupar(n)
+
+    def faixas(self) -> List[Tuple[int, int]]:
+        """Números ocupados em faixas contíguas ``(início, fim)``, em ordem."""
+        liberados = set(self._liberados)
+        faixas: List[Tuple[int, int]] = []
+        for n in sorted(self._prox):
+            if n in liberados:
+                continue
+            if faixas and faixas[-1][1] == n - 1:
+                faixas[-1] = (faixas[-1][0], n)
+            else:
+                faixas.append((n, n))
+        return faixas
+
+    def proximo_livre(self, n: int) -> int:
+        prox = self._prox
+        caminho = []
+        livre = n
+        while livre in prox:
+            caminho.append(livre)
+            livre = prox[livre]
+        for k in caminho:
+            prox[k] = livre
+        i = bisect.bisect_left(self._liberados, n)
+        if i < len(self._liberados) and self._liberados[i] < livre:
+            return self._liberados[i]
+        return livre
+
+
+# ---------- Cache em disco ----------
+def mtime_pasta(diretorio: str) -> Optional[int]:
+    """mtime da pasta em ns; ``None`` se não der para ler ou se o sistema de
+    arquivos só guarda segundos (FAT, alguns compartilhamentos): lá, uma
+    mudança no mesmo segundo do último lote não mudaria o mtime."""
+    try:
+        mtime = os.stat(diretorio or ".").st_mtime_ns
+    except OSError:
+        return None
+    return None if mtime % 1_000_000_000 == 0 else mtime
+
+
+class CacheSufixos(CacheArquivos):
+    """Faixas de números já usados por nome-base em cada pasta, válidas enquanto o mtime da pasta não muda."""
+
+    def __init__(self, caminho: str):
+        super().__init__(caminho, "sufixos_v1", ("faixas",))
+
+    @staticmethod
+    def _chave(diretorio: str, base: str) -> str:
+        return os.path.join(os.path.normcase(os.path.abspath(diretorio or ".")), os.path.normcase(base))
+
+    def consultar_faixas(self, diretorio: str, base: str) -> Optional[Dict[str, List[List[int]]]]:
+        """``{extensão: [[início, fim], ...]}`` gravado para a pasta como ela está; ``None`` se ela mudou."""
+        mtime = mtime_pasta(diretorio)
+        if mtime is None:
+            return None
+        linha = self.consultar(self._chave(diretorio, base), 0, mtime)
+        return json.loads(linha[0]) if linha else None  # type: ignore[arg-type]
+
+    def guardar_faixas(self, diretorio: str, base: str, mtime: int, ocupados: Dict[str, "NumerosOcupados"]) -> None:
+        faixas = {ext: o.faixas() for ext, o in ocupados.items()}
+        self.guardar(self._chave(diretorio, base), 0, mtime, (json.dumps(faixas, separators=(",", ":")),))
+
+
+def abrir_cache(pasta_config: str) -> Optional[CacheSufixos]:
+    """Cache em ``<configuração>/cache``; ``None`` se não der para abrir (segue sem cache)."""
+    try:
+        return CacheSufixos(caminho_cache(pasta_config, NOME_CACHE))
+    except (OSError, sqlite3.Error):
+        return None
+
+
+class NumeradorLote:
+    """Distribui os sufixos -NNN de um lote a partir dos índices das pastas.
+
+    ``indices`` pode ser compartilhado entre numeradores de planos diferentes
+    no mesmo lote (ex.: um por data): cada pasta é lida uma vez só.
+
+    Com ``sufixos``, uma pasta que não mudou desde o último lote não é lida:
+    os números vêm do cache (o índice de nomes só é montado se um nome
+    precisar ser encurtado). Só vale para quem renomeia de verdade e chama
+    ``gravar`` depois: a simulação altera o índice sem tocar no disco.
+    """
+
+    def __init__(
+        self,
+        plano: PlanoNome,
+        indices: Optional[Dict[str, IndiceDiretorio]] = None,
+        sufixos: Optional[CacheSufixos] = None,
+    ):
+        self.plano = plano
+        self._base = os.path.normcase(plano.base + "-")
+        self._indices: Dict[str, IndiceDiretorio] = {} if indices is None else indices
+        self._sufixos = sufixos
+        self._semeados: Set[str] = set()  # pastas cujos números deste plano já foram lidos do índice
+        self._ocupados: Dict[Tuple[str, str], NumerosOcupados] = {}
+
+    def _numero_de(self, nome_normcase: str) -> Optional[Tuple[int, str]]:
+        if not nome_normcase.startswith(self._base):
+            return None
+        resto, ext = os.path.splitext(nome_normcase[len(self._base):])
+        if not resto.isdigit() or not resto.isascii():
+            return None
+        n = int(resto)
+        if formatar_numero(n) != resto:
+            return None
+        return n, ext
+
+    def indice(self, diretorio: str) -> IndiceDiretorio:
+        indice = self._indices.get(diretorio)
+        mtime = None
+        if indice is None:
+            # mtime lido antes da listagem: uma mudança durante ela invalida o que for gravado.
+            mtime = mtime_pasta(diretorio) if self._sufixos is not None else None
+            indice = self._indices[diretorio] = IndiceDiretorio(diretorio)
+        if diretorio not in self._semeados:
+            self._semeados.add(diretorio)
+            for nome in indice.nomes:
+                achado = self._numero_de(nome)
+                if achado:
+                    self._ocupados_de(diretorio, achado[1]).ocupar(achado[0])
+            if mtime is not None and self._sufixos is not None:
+                self._sufixos.guardar_faixas(diretorio, self.plano.base, mtime, self._ocupados_da_pasta(diretorio))
+        return indice
+
+    def _semear(self, diretorio: str) -> None:
+        """Números deste plano em ``diretorio``: do cache, se a pasta não mudou, ou de uma listagem."""
+        if diretorio in self._semeados:
+            return
+        if self._sufixos is not None and diretorio not in self._indices:
+            faixas = self._sufixos.consultar_faixas(diretorio, self.plano.base)
+            if faixas is not None:
+                self._semeados.add(diretorio)
+                for ext, lista in faixas.items():
+                    ocupados = self._ocupados_de(diretorio, ext)
+                    for inicio, fim in lista:
+                        ocupados.ocupar_faixa(inicio, fim)
+                return
+        self.indice(diretorio)
+
+    def _ocupados_da_pasta(self, diretorio: str) -> Dict[str, NumerosOcupados]:
+        return {ext: o for (d, ext), o in self._ocupados.items() if d == diretorio}
+
+    def gravar(self) -> None:
+        """Grava no cache os números de cada pasta já vista, com o mtime de agora.
+
+        Chamar depois que os renomes planejados aconteceram todos: o que foi
+        reservado e não aconteceu (erro, cancelamento) ficaria como usado.
+        """
+        if self._sufixos is None:
+            return
+        por_pasta: Dict[str, Dict[str, NumerosOcupados]] = {d: {} for d in self._semeados}
+        for (d, ext), ocupados in self._ocupados.items():
+            if d in por_pasta:
+                por_pasta[d][ext] = ocupados
+        for diretorio, ocupados_pasta in por_pasta.items():
+            mtime = mtime_pasta(diretorio)
+            if mtime is not None:
+                self._sufixos.guardar_faixas(diretorio, self.plano.base, mtime, ocupados_pasta)
+
+    def _ocupados_de(self, diretorio: str, ext_normcase: str) -> NumerosOcupados:
+        chave = (diretorio, ext_normcase)
+        ocupados = self._ocupados.get(chave)
+        if ocupados is None:
+            ocupados = self._ocupados[chave] = NumerosOcupados()
+        return ocupados
+
+    def reservar(self, origem: str, idx: int) -> Optional[Tuple[int, str]]:
+        """(número, destino) com o número ``idx`` ou o próximo livre na pasta."""
+        if not origem:
+            return None
+        diretorio = os.path.dirname(origem)
+        reserva = self.reservar_em(diretorio, os.path.splitext(origem)[1], idx)
+        if not reserva:
+            return None
+        return reserva[0], os.path.join(diretorio, reserva[1])
+
+    def reservar_em(self, diretorio: str, ext: str, idx: int) -> Optional[Tuple[int, str]]:
+        """Como ``reservar``, mas devolve só o nome (sem a pasta) — não monta o caminho."""
+        if not self.plano.base:
+            return None
+        self._semear(diretorio)
+
+        n = self._ocupados_de(diretorio, os.path.normcase(ext)).proximo_livre(idx)
+        nome = self.plano.nome_em(diretorio, ext, n)
+        if nome is None:
+            return None
+        if self.plano.encurtado(nome, ext, n):
+            # Nome encurtado pelo limite de caminho: confere nome a nome no índice
+            # (o número fica no nome encurtado, então cada ``n`` dá um nome diferente).
+            indice = self.indice(diretorio)
+            n = idx
+            nome = self.plano.nome_em(diretorio, ext, n)
+            while nome is not None and indice.contem(nome):
+                n += 1
+                nome = self.plano.nome_em(diretorio, ext, n)
+            if nome is None:
+                return None
+        return n, nome
+
+    def confirmar(self, origem: str, destino: str) -> None:
+        """Atualiza o índice depois de ``os.replace(origem, destino)`` bem-sucedido."""
+        self.confirmar_em(os.path.dirname(origem), os.path.basename(origem), os.path.basename(destino))
+
+    def confirmar_em(self, diretorio: str, nome_origem: str, nome_destino: str) -> None:
+        """Como ``confirmar``, com os nomes (origem e destino na mesma ``diretorio``)."""
+        self._semear(diretorio)
+        nome_origem = os.path.normcase(nome_origem)
+        indice = self._indices.get(diretorio)
+        if indice is not None:
+            indice.remover(nome_origem)
+        achado = self._numero_de(nome_origem)
+        if achado:
+            self._ocupados_de(diretorio, achado[1]).liberar(achado[0])
+
+        self.ocupar_em(diretorio, nome_destino)
+
+    def ocupar_em(self, diretorio: str, nome: str) -> None:
+        """Registra ``nome`` como usado em ``diretorio`` (arquivo que chega de outra pasta)."""
+        self._semear(diretorio)
+        indice = self._indices.get(diretorio)
+        if indice is not None:
+            indice.adicionar(nome)
+        achado = self._numero_de(os.path.normcase(nome))
+        if achado:
+            self._ocupados_de(diretorio, achado[1]).ocupar(achado[0])
@@ -0,0 +1,572 @@
+"""
+Serviço local — gerar nome, planejar e executar lotes para outras ferramentas.
+
+Um processo só, de vida longa: o catálogo (``FonteCatalogo``, relido quando o
+arquivo muda), o cache de metadados e os índices das pastas ficam em memória
+entre as chamadas, em vez de um ``python -m renomeador`` por arquivo.
+
+Protocolo: JSON Lines sobre socket Unix (``socket=``) ou TCP em 127.0.0.1
+(``porta=``; no Windows, só este). Cada linha é um pedido e recebe uma linha
+de resposta com o mesmo ``id``; uma linha com uma lista de pedidos recebe a
+lista das respostas, na mesma ordem::
+
+    {"id": 1, "op": "nome", "campos": {"setor": "Financeiro", "documento": "ata"},
+     "itens": [{"arquivo": "/dados/a.pdf"}, {"arquivo": "/dados/b.pdf"}], "numerar": true}
+    {"id": 1, "ok": true, "itens": [{"nome": "...-001.pdf", "numero": 1}, ...]}
+
+    {"id": 2, "op": "planejar", "campos": {...}, "arquivos": ["/dados/a.pdf", ...]}
+    {"id": 2, "ok": true, "itens": [{"idx": 1, "origem": ..., "destino": ..., ...}], "resumo": {...}}
+
+    {"id": 3, "op": "executar", "campos": {...}, "arquivos": [...], "diario": "/dados/lote.jsonl"}
+    {"id": 3, "ok": true, "total": 2, "renomeados": [[origem, destino], ...], "erros": [], ...}
+
+Erros do pedido voltam como ``{"id": ..., "ok": false, "erro": "..."}``.
+
+``planejar`` e ``nome`` usam cópias dos índices guardados, que só são
+relidos quando o mtime da pasta muda; ``executar`` numera como a interface
+(pasta lida de novo, ou o cache de sufixos se ela não mudou por fora) e
+roda um lote por vez, para dois lotes não disputarem o mesmo número.
+"""
+
+import asyncio
+import contextlib
+import datetime
+import json
+import os
+import socket
+import stat
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .arquivamento import ArquivadorLote
+from .catalogo import Catalogo, FonteCatalogo
+from .diario import Diario
+from .executor import ERRO, RENOMEADO, EventoLote, ExecutorLote
+from .lote import ResultadoLote
+from .metadados import CacheMetadados, PlanosPorArquivo, agrupar_por_plano, metadados_de, planos_dos_arquivos
+from .metricas import MetricasLote, log, registrar_erro, registrar_lote
+from .mover import mover_arquivo
+from .nomes import PlanoNome, formatar_numero
+from .numeracao import CacheSufixos, IndiceDiretorio, NumeradorLote
+from .simulacao import ResumoSimulacao, simular
+
+# Um lote grande vem numa linha só.
+_LIMITE_LINHA = 256 * 1024 * 1024
+
+
+class ErroPedido(Exception):
+    """Pedido inválido: vira ``{"ok": false, "erro": ...}`` na resposta."""
+
+
+# ---------- Índices em memória ----------
+class IndicesQuentes:
+    """Índices de pasta guardados entre chamadas, válidos enquanto o mtime da pasta não muda.
+
+    Criar, apagar ou renomear um arquivo muda o mtime da pasta; o mtime é lido
+    antes da listagem, então uma mudança durante ela só faz a próxima chamada
+    reler a pasta. Guarda até ``limite`` pastas (as menos usadas saem antes).
+    """
+
+    def __init__(self, limite: int = 1024):
+        self.limite = limite
+        self._pastas: "OrderedDict[str, Tuple[int, IndiceDiretorio]]" = OrderedDict()
+        self._trava = threading.Lock()
+        self.leituras = 0
+        self.reaproveitados = 0
+
+    def copias(self, pastas: Iterable[str]) -> Dict[str, IndiceDiretorio]:
+        """Uma cópia do índice de cada pasta (a simulação altera os índices)."""
+        copias: Dict[str, IndiceDiretorio] = {}
+        for pasta in pastas:
+            if pasta in copias:
+                continue
+            try:
+                mtime = os.stat(pasta or ".").st_mtime_ns
+            except OSError:
+                continue
+            with self._trava:
+                guardado = self._pastas.get(pasta)
+                if guardado is not None and guardado[0] == mtime:
+                    self._pastas.move_to_end(pasta)
+                    self.reaproveitados += 1
+                    copias[pasta] = guardado[1].copia()
+                    continue
+            indice = IndiceDiretorio(pasta)
+            with self._trava:
+                self.leituras += 1
+                self._pastas[pasta] = (mtime, indice)
+                self._pastas.move_to_end(pasta)
+                while len(self._pastas) > self.limite:
+                    self._pastas.popitem(last=False)
+                copias[pasta] = indice.copia()
+        return copias
+
+    def __len__(self) -> int:
+        return len(self._pastas)
+
+
+# ---------- Operações ----------
+class ServicoRenomeador:
+    """As operações do serviço, sem a parte de rede (podem ser chamadas de qualquer thread)."""
+
+    def __init__(
+        self,
+        fonte: FonteCatalogo,
+        *,
+        tarefas: int = 4,
+        cache: Optional[CacheMetadados] = None,
+        indices: Optional[IndicesQuentes] = None,
+        sufixos: Optional[CacheSufixos] = None,
+    ):
+        self.fonte = fonte
+        self.tarefas = max(1, tarefas)
+        self.cache = cache
+        self.sufixos = sufixos
+        self.indices = indices or IndicesQuentes()
+        self._lote = threading.Lock()
+        self.pedidos = 0
+        self._operacoes: Dict[str, Callable[[dict], dict]] = {
+            "nome": self._nome,
+            "planejar": self._planejar,
+            "executar": self._executar,
+            "estado": self._estado,
+        }
+
+    def atender(self, pedido: object) -> dict:
+        """Resposta de um pedido já decodificado; nunca levanta exceção."""
+        if not isinstance(pedido, dict):
+            return {"ok": False, "erro": "o pedido deve ser um objeto JSON"}
+        resposta: dict = {"id": pedido.get("id")}
+        self.pedidos += 1
+        try:
+            op = pedido.get("op")
+            operacao = self._operacoes.get(op) if isinstance(op, str) else None
+            if operacao is None:
+                raise ErroPedido(f"operação desconhecida: {pedido.get('op')!r} (use {', '.join(self._operacoes)})")
+            resposta.update(operacao(pedido))
+            resposta["ok"] = True
+        except ErroPedido as e:
+            resposta.update(ok=False, erro=str(e))
+        except (OSError, ValueError) as e:
+            resposta.update(ok=False, erro=f"{type(e).__name__}: {e}")
+        except Exception as e:
+            # Um pedido com defeito não derruba a conexão nem os outros pedidos da mesma linha.
+            log.warning("erro_servico", exc_info=True, extra={"dados": {"op": str(pedido.get("op"))}})
+            resposta.update(ok=False, erro=f"erro interno: {type(e).__name__}: {e}")
+        return resposta
+
+    # ---------- Campos e planos ----------
+    def _campos(self, pedido: dict, catalogo: Catalogo) -> Dict[str, str]:
+        """Campos do nome validados pelo catálogo (aceita o nome sem acento/caixa)."""
+        dados = pedido.get("campos") or {}
+        if not isinstance(dados, dict):
+            raise ErroPedido("'campos' deve ser um objeto")
+        data = dados.get("data")
+        if data is not None and not isinstance(data, str):
+            raise ErroPedido("'data' deve ser um texto AAAAMMDD")
+        campos = {c: str(dados.get(c) or "") for c in ("setor", "evento", "funcionario", "documento", "versao", "data")}
+        if campos["data"] and not _data_valida(campos["data"]):
+            raise ErroPedido(f"data inválida: {campos['data']!r} (use AAAAMMDD)")
+        for campo, rotulo, busca in (
+            ("setor", "setor", catalogo.busca_setores),
+            ("evento", "evento", catalogo.busca_eventos),
+            ("funcionario", "funcionário", catalogo.busca_funcionarios),
+        ):
+            if not campos[campo]:
+                continue
+            nome = busca.exato(campos[campo])
+            if nome is None:
+                sugestoes = busca.buscar(campos[campo], limite=10) or busca.todos
+                raise ErroPedido(f"{rotulo} desconhecido: {campos[campo]!r} (opções: {', '.join(sugestoes)})")
+            campos[campo] = nome
+        if campos["versao"] and not campos["versao"].isdigit():
+            raise ErroPedido("a versão deve conter apenas dígitos")
+        return campos
+
+    def _plano(self, pedido: dict) -> Tuple[PlanoNome, Optional[PlanosPorArquivo]]:
+        catalogo = self.fonte.atual()
+        campos = self._campos(pedido, catalogo)
+        plano = PlanoNome.criar(
+            setor=campos["setor"],
+            evento=campos["evento"],
+            funcionario=campos["funcionario"],
+            documento=campos["documento"],
+            versao=campos["versao"],
+            setores=catalogo.setores,
+            eventos=catalogo.eventos,
+            data=campos["data"] or None,
+        )
+        if not plano.base:
+            raise ErroPedido("não foi possível gerar o nome final")
+        planos = None
+        if pedido.get("data_do_arquivo") or pedido.get("versao_do_nome"):
+            planos = PlanosPorArquivo(
+                catalogo.setores,
+                catalogo.eventos,
+                usar_data=bool(pedido.get("data_do_arquivo")),
+                usar_versao=bool(pedido.get("versao_do_nome")),
+                setor=campos["setor"],
+                evento=campos["evento"],
+                funcionario=campos["funcionario"],
+                documento=campos["documento"],
+                versao=campos["versao"],
+            )
+        return plano, planos
+
+    @staticmethod
+    def _caminho(pedido: dict, chave: str) -> Optional[str]:
+        """Caminho opcional do pedido (``arquivar``, ``diario``): texto ou ausente."""
+        valor = pedido.get(chave)
+        if valor is None or valor == "":
+            return None
+        if not isinstance(valor, str):
+            raise ErroPedido(f"'{chave}' deve ser um caminho")
+        return valor
+
+    @staticmethod
+    def _arquivos(pedido: dict) -> List[str]:
+        arquivos = pedido.get("arquivos")
+        if not isinstance(arquivos, list) or not all(isinstance(a, str) and a for a in arquivos):
+            raise ErroPedido("'arquivos' deve ser uma lista de caminhos")
+        if not arquivos:
+            raise ErroPedido("nenhum arquivo informado")
+        return arquivos
+
+    def _planos_de(self, arquivos: Iterable[str], planos: PlanosPorArquivo) -> Dict[str, PlanoNome]:
+        try:
+            return dict(planos_dos_arquivos(arquivos, planos, tarefas=self.tarefas, cache=self.cache))
+        finally:
+            if self.cache:
+                self.cache.salvar()
+
+    # ---------- nome ----------
+    def _nome(self, pedido: dict) -> dict:
+        """Nome de cada item; com ``numerar``, o número livre na pasta (sem reservar nada no disco)."""
+        plano, _ = self._plano(pedido)
+        itens = pedido.get("itens") or [{}]
+        if not isinstance(itens, list) or not all(isinstance(it, dict) for it in itens):
+            raise ErroPedido("'itens' deve ser uma lista de objetos")
+        numerar = bool(pedido.get("numerar"))
+        pastas = [os.path.dirname(it["arquivo"]) for it in itens if isinstance(it.get("arquivo"), str)]
+        numerador = NumeradorLote(plano, self.indices.copias(pastas)) if numerar else None
+        posicoes: Dict[str, int] = {}
+        saida = []
+        for it in itens:
+            arquivo = it.get("arquivo")
+            if not isinstance(arquivo, str) or not arquivo:
+                # Sem arquivo: só o nome-base (com a extensão, se vier).
+                saida.append({"nome": plano.base + str(it.get("ext") or ""), "numero": None})
+                continue
+            pasta, ext = os.path.dirname(arquivo), os.path.splitext(arquivo)[1]
+            if numerador is None:
+                saida.append({"nome": plano.nome_em(pasta, ext), "numero": None})
+                continue
+            posicao = posicoes[pasta] = posicoes.get(pasta, 0) + 1
+            numero = it.get("numero")
+            if numero is None:
+                numero = posicao
+            elif isinstance(numero, bool) or not isinstance(numero, int) or numero < 1:
+                raise ErroPedido(f"'numero' deve ser um inteiro a partir de 1: {numero!r}")
+            reserva = numerador.reservar_em(pasta, ext, numero)
+            if not reserva:
+                saida.append({"nome": None, "numero": None})
+                continue
+            numerador.ocupar_em(pasta, reserva[1])
+            saida.append({"nome": reserva[1], "numero": reserva[0], "sufixo": formatar_numero(reserva[0])})
+        return {"base": plano.base, "itens": saida}
+
+    # ---------- planejar ----------
+    def _planejar(self, pedido: dict) -> dict:
+        plano, planos = self._plano(pedido)
+        arquivos = self._arquivos(pedido)
+        arquivar = self._caminho(pedido, "arquivar")
+        pastas = {os.path.dirname(a) for a in arquivos}
+        if arquivar:
+            pastas.add(arquivar)
+        plano_de = self._planos_de(arquivos, planos).__getitem__ if planos is not None else None
+        resumo = ResumoSimulacao()
+        itens = []
+        for it in simular(
+            plano,
+            arquivos,
+            numerar=len(arquivos) > 1,
+            plano_de=plano_de,
+            pasta_destino=arquivar,
+            duas_fases=bool(pedido.get("renumerar")),
+            indices=self.indices.copias(pastas),
+        ):
+            resumo.contar(it)
+            itens.append(it.como_dict())
+        return {
+            "base": plano.base,
+            "itens": itens,
+            "resumo": {"total": resumo.total, "com_aviso": resumo.com_aviso, "avisos": resumo.contagem},
+        }
+
+    # ---------- executar ----------
+    def _executar(self, pedido: dict) -> dict:
+        plano, planos = self._plano(pedido)
+        arquivos = self._arquivos(pedido)
+        arquivar = self._caminho(pedido, "arquivar")
+        caminho_diario = self._caminho(pedido, "diario")
+        renumerar = bool(pedido.get("renumerar"))
+        if arquivar and renumerar:
+            raise ErroPedido("'renumerar' não vale com 'arquivar' (a numeração é a da pasta de destino)")
+        renomeados: List[List[str]] = []
+        erros: List[Dict[str, object]] = []
+
+        def ao_evento(ev: EventoLote) -> None:
+            # list.append é atômico: eventos de várias threads sem trava.
+            if ev.tipo == RENOMEADO:
+                renomeados.append([ev.origem, ev.destino or ""])
+            elif ev.tipo == ERRO:
+                erros.append({"idx": ev.idx, "origem": ev.origem, "destino": ev.destino, "erro": str(ev.erro)})
+
+        if len(arquivos) == 1:
+            # Um único arquivo segue a regra da interface: sem sufixo numérico.
+            return self._executar_um(plano, planos, arquivos[0], arquivar, bool(pedido.get("verificar")), caminho_diario)
+        grupos = None
+        if planos is not None:
+            por_arquivo = self._planos_de(arquivos, planos)
+            grupos = agrupar_por_plano((a, por_arquivo[a]) for a in arquivos)
+        with self._lote:
+            with (Diario.criar(caminho_diario, plano.base) if caminho_diario else contextlib.nullcontext()) as diario:
+                if arquivar:
+                    executor = ArquivadorLote(
+                        plano,
+                        arquivar,
+                        max_tarefas=self.tarefas,
+                        verificar=bool(pedido.get("verificar")),
+                        ao_evento=ao_evento,
+                        diario=diario,
+                        sufixos=self.sufixos,
+                    )
+                else:
+                    executor = ExecutorLote(
+                        plano,
+                        max_tarefas=self.tarefas,
+                        ao_evento=ao_evento,
+                        diario=diario,
+                        duas_fases=renumerar,
+                        sufixos=self.sufixos,
+                    )
+                resultado = executor.executar_grupos(grupos) if grupos is not None else executor.executar(arquivos)
+        return self._resposta_lote(resultado, renomeados, erros)
+
+    def _resposta_lote(self, resultado: ResultadoLote, renomeados: List[List[str]], erros: List[Dict[str, object]]) -> dict:
+        registrar_lote(resultado, {"origem": "servico", "tarefas": self.tarefas})
+        return {
+            "total": resultado.total,
+            "renomeados": renomeados,
+            "erros": erros,
+            "cancelados": resultado.cancelados,
+            "encurtados": resultado.encurtados,
+            "metricas": resultado.metricas.como_dict() if resultado.metricas is not None else None,
+        }
+
+    def _executar_um(
+        self,
+        plano: PlanoNome,
+        planos: Optional[PlanosPorArquivo],
+        origem: str,
+        arquivar: Optional[str],
+        verificar: bool,
+        caminho_diario: Optional[str],
+    ) -> dict:
+        """Um arquivo, sem sufixo; mesmo diário e mesmo log de um lote."""
+        if planos is not None:
+            plano = planos.plano_para(metadados_de(origem, self.cache))
+        pasta = arquivar or os.path.dirname(origem)
+        ext = os.path.splitext(origem)[1]
+        nome = plano.nome_em(pasta, ext)
+        if not nome:
+            raise ErroPedido("não foi possível gerar o nome final")
+        destino = os.path.join(pasta, nome)
+        resultado = ResultadoLote()
+        resultado.metricas = MetricasLote()
+        resultado.total = 1
+        renomeados: List[List[str]] = []
+        erros: List[Dict[str, object]] = []
+        with self._lote:
+            if os.path.exists(destino):
+                raise ErroPedido(f"o arquivo '{nome}' já existe")
+            with (Diario.criar(caminho_diario, plano.base) if caminho_diario else contextlib.nullcontext()) as diario:
+                if diario:
+                    diario.planejado(1, origem, destino)
+                    diario.sincronizar()
+                t0 = time.perf_counter()
+                try:
+                    if arquivar:
+                        os.makedirs(pasta, exist_ok=True)
+                        mover_arquivo(origem, destino, verificar=verificar)
+                    else:
+                        os.replace(origem, destino)
+                except OSError as e:
+                    registrar_erro(origem, destino, e, 1)
+                    resultado.metricas.erro(type(e).__name__)
+                    resultado.erros.append(os.path.basename(origem))
+                    erros.append({"idx": 1, "origem": origem, "destino": destino, "erro": str(e)})
+                    if diario:
+                        diario.falhou(1, e)
+                else:
+                    resultado.metricas.renomeado(time.perf_counter() - t0)
+                    resultado.ok = 1
+                    renomeados.append([origem, destino])
+                    if plano.encurtado(nome, ext):
+                        resultado.encurtados.append(destino)
+                    if diario:
+                        diario.concluido(1, destino)
+        resultado.metricas.encerrar()
+        return self._resposta_lote(resultado, renomeados, erros)
+
+    # ---------- estado ----------
+    def _estado(self, pedido: dict) -> dict:
+        catalogo = self.fonte.atual()
+        return {
+            "catalogo": catalogo.origem,
+            "erro_catalogo": self.fonte.erro,
+            "pedidos": self.pedidos,
+            "pastas_em_memoria": len(self.indices),
+            "leituras_de_pasta": self.indices.leituras,
+            "pastas_reaproveitadas": self.indices.reaproveitados,
+        }
+
+
+def _data_valida(data: str) -> bool:
+    """``AAAAMMDD`` de um dia que existe (a data que a interface usa no nome)."""
+    if len(data) != 8 or not data.isdigit() or not data.isascii():
+        return False
+    try:
+        datetime.datetime.strptime(data, "%Y%m%d")
+    except ValueError:
+        return False
+    return True
+
+
+# ---------- Rede ----------
+async def _atender_conexao(
+    servico: ServicoRenomeador, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter
+) -> None:
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            try:
+                linha = await leitor.readline()
+            except (asyncio.LimitOverrunError, ValueError):
+                escritor.write(b'{"id": null, "ok": false, "erro": "linha grande demais"}\n')
+                break
+            if not linha:
+                break
+            if not linha.strip():
+                continue
+            try:
+                pedido = json.loads(linha)
+            except ValueError as e:
+                resposta: object = {"id": None, "ok": False, "erro": f"JSON inválido: {e}"}
+            else:
+                # O trabalho (disco, hash, renomes) roda em threads; o laço só cuida das conexões.
+                if isinstance(pedido, list):
+                    resposta = await loop.run_in_executor(None, lambda: [servico.atender(p) for p in pedido])
+                else:
+                    resposta = await loop.run_in_executor(None, servico.atender, pedido)
+            escritor.write(json.dumps(resposta, ensure_ascii=False).encode("utf-8") + b"\n")
+            await escritor.drain()
+    except ConnectionError:
+        pass
+    finally:
+        escritor.close()
+
+
+def _liberar_socket(caminho: str) -> None:
+    """Apaga um socket Unix esquecido por um serviço que morreu; erro se outro ainda atende nele."""
+    try:
+        st = os.stat(caminho)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(st.st_mode):
+        raise FileExistsError(f"{caminho} existe e não é um socket")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        try:
+            s.connect(caminho)
+        except OSError:
+            os.unlink(caminho)
+            return
+    raise OSError(f"já há um serviço atendendo em {caminho}")
+
+
+async def servir(
+    servico: ServicoRenomeador,
+    *,
+    socket_unix: Optional[str] = None,
+    porta: Optional[int] = None,
+    parar: Optional[asyncio.Event] = None,
+    ao_iniciar: Optional[Callable[[str], None]] = None,
+) -> None:
+    """Atende até ``parar`` ser sinalizado; o socket Unix fica só para o usuário (0600)."""
+    parar = parar or asyncio.Event()
+
+    async def atender(leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        await _atender_conexao(servico, leitor, escritor)
+
+    if socket_unix:
+        _liberar_socket(socket_unix)
+        mascara = os.umask(0o177)
+        try:
+            servidor = await asyncio.start_unix_server(atender, socket_unix, limit=_LIMITE_LINHA)
+        finally:
+            os.umask(mascara)
+        endereco = socket_unix
+    else:
+        servidor = await asyncio.start_server(atender, "127.0.0.1", porta or 0, limit=_LIMITE_LINHA)
+        endereco = "127.0.0.1:%d" % servidor.sockets[0].getsockname()[1]
+    try:
+        async with servidor:
+            if ao_iniciar:
+                ao_iniciar(endereco)
+            await parar.wait()
+    finally:
+        if socket_unix:
+            try:
+                os.unlink(socket_unix)
+            except OSError:
+                pass
+
+
+# ---------- Cliente ----------
+class ClienteServico:
+    """Cliente síncrono mínimo, para ferramentas em Python (uma conexão, pedidos em sequência)."""
+
+    def __init__(self, socket_unix: Optional[str] = None, porta: Optional[int] = None, timeout: Optional[float] = None):
+        if socket_unix:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(timeout)
+            self._sock.connect(socket_unix)
+        else:
+            self._sock = socket.create_connection(("127.0.0.1", porta or 0), timeout=timeout)
+        self._arquivo = self._sock.makefile("rb")
+        self._proximo_id = 0
+
+    def pedir(self, op: str, **dados: object) -> dict:
+        """Envia um pedido e devolve a resposta; ``ErroPedido`` se ela vier com ``ok: false``."""
+        self._proximo_id += 1
+        pedido = dict(dados, id=self._proximo_id, op=op)
+        self._sock.sendall(json.dumps(pedido, ensure_ascii=False).encode("utf-8") + b"\n")
+        linha = self._arquivo.readline()
+        if not linha:
+            raise ConnectionError("o serviço fechou a conexão")
+        resposta = json.loads(linha)
+        if not resposta.get("ok"):
+            raise ErroPedido(resposta.get("erro") or "erro desconhecido")
+        return resposta
+
+    def fechar(self) -> None:
+        self._arquivo.close()
+        self._sock.close()
+
+    def __enter__(self) -> "ClienteServico":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.fechar()
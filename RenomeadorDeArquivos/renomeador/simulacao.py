@@ -0,0 +1,272 @@
+"""
+Simulação de lote — o plano origem -> destino completo, sem renomear nada.
+
+Usa a mesma numeração da renomeação (um ``os.scandir`` por pasta), então o
+plano é o que o lote faria se nada mudar no disco até lá. Cada item traz os
+avisos encontrados; o relatório CSV/JSON é escrito em fluxo, uma linha por
+arquivo, numa única passada.
+"""
+
+import csv
+import json
+import os
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .compacto import SEM_NUMERO, PlanoCompacto
+from .nomes import PREFIXO_LONGO, PlanoNome
+from .numeracao import IndiceDiretorio, NumeradorLote
+from .trocas import AUSENTE, CAMINHO_REPETIDO, CICLO, planejar_trocas
+
+# Avisos por arquivo
+DUPLICADO = "duplicado"
+ORIGEM_AUSENTE = "origem_ausente"
+SEM_NOME = "sem_nome"
+COLISAO = "colisao"
+SUBSTITUI = "substitui"
+ENCURTADO = "encurtado"
+LIMITE_WINDOWS = "limite_windows"
+REPETIDO = "conteudo_repetido"
+TROCA = "troca"
+
+DESCRICOES: Dict[str, str] = {
+    DUPLICADO: "arquivo repetido na seleção",
+    ORIGEM_AUSENTE: "arquivo de origem não encontrado",
+    SEM_NOME: "nome final não pôde ser gerado",
+    COLISAO: "número já usado na pasta (vai para o próximo livre)",
+    SUBSTITUI: "destino já existe e seria substituído",
+    ENCURTADO: "nome encurtado pelo limite de caminho",
+    LIMITE_WINDOWS: "caminho passa de 259 caracteres (limite do Windows)",
+    REPETIDO: "mesmo conteúdo de outro arquivo da seleção",
+    TROCA: "troca de nome em ciclo com outros da seleção (passa por um nome temporário)",
+}
+
+_MAX_WINDOWS = 259
+_CAMPOS_CSV = ("idx", "origem", "destino", "numero", "avisos")
+
+
+class ItemSimulacao:
+    __slots__ = ("idx", "origem", "destino", "numero", "avisos")
+
+    def __init__(self, idx: int, origem: str, destino: Optional[str], numero: Optional[int], avisos: List[str]):
+        self.idx = idx
+        self.origem = origem
+        self.destino = destino
+        self.numero = numero
+        self.avisos = avisos
+
+    def como_dict(self) -> Dict[str, object]:
+        return {"idx": self.idx, "origem": self.origem, "destino": self.destino, "numero": self.numero, "avisos": self.avisos}
+
+
+class ResumoSimulacao:
+    __slots__ = ("total", "com_aviso", "contagem")
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.com_aviso = 0
+        self.contagem: Dict[str, int] = {}
+
+    def contar(self, item: ItemSimulacao) -> None:
+        self.total += 1
+        if item.avisos:
+            self.com_aviso += 1
+            for aviso in item.avisos:
+                self.contagem[aviso] = self.contagem.get(aviso, 0) + 1
+
+    def resumo(self) -> str:
+        msg = f"Simulação: {self.total} arquivo(s), {self.com_aviso} com aviso."
+        for aviso, descricao in DESCRICOES.items():
+            if self.contagem.get(aviso):
+                msg += f"\n- {descricao}: {self.contagem[aviso]}"
+        return msg
+
+
+def simular(
+    plano: PlanoNome,
+    arquivos: Iterable[str],
+    *,
+    numerar: bool = True,
+    repetidos: Optional[Dict[str, str]] = None,
+    pular_repetidos: bool = True,
+    plano_de: Optional[Callable[[str], PlanoNome]] = None,
+    pasta_destino: Optional[str] = None,
+    duas_fases: bool = False,
+    indices: Optional[Dict[str, IndiceDiretorio]] = None,
+) -> Iterator[ItemSimulacao]:
+    """Plano de ``arquivos`` em fluxo; ``numerar=False`` é a regra de um único arquivo (sem sufixo).
+
+    ``repetidos`` (de ``duplicados.encontrar_duplicados``) marca as cópias;
+    com ``pular_repetidos`` elas ficam sem destino e não ocupam número, como
+    no lote que as pula.
+
+    ``plano_de`` dá o plano de cada arquivo (data/versão do próprio arquivo);
+    cada nome-base é numerado à parte, como nos grupos de ``executar_grupos``.
+
+    ``pasta_destino`` simula o arquivamento (``ArquivadorLote``): os números
+    são os livres na pasta de destino e os nomes de origem continuam ocupados.
+
+    ``duas_fases`` simula o ``ExecutorLote(duas_fases=True)``: a seleção é lida
+    inteira e os nomes dela não bloqueiam a numeração (``trocas``).
+
+    ``indices`` são índices de pasta já lidos (o serviço os mantém entre
+    chamadas); a simulação os altera, então devem ser cópias.
+    """
+    indices = {} if indices is None else indices
+    if duas_fases and numerar and pasta_destino is None:
+        yield from _simular_duas_fases(plano, arquivos, repetidos, pular_repetidos, plano_de, indices)
+        return
+    numeradores: Dict[str, NumeradorLote] = {}
+    posicoes: Dict[str, int] = {}
+    vistos: Set[str] = set()
+    # Tamanho do caminho absoluto de cada pasta, para o limite do Windows.
+    tam_pasta: Dict[str, int] = {}
+    for idx, origem in enumerate(arquivos, start=1):
+        avisos: List[str] = []
+        if repetidos and origem in repetidos:
+            if pular_repetidos:
+                yield ItemSimulacao(idx, origem, None, None, [REPETIDO])
+                continue
+            avisos.append(REPETIDO)
+        plano_arquivo = plano_de(origem) if plano_de else plano
+        # Posição do arquivo no seu grupo: é o número que ele recebe se a pasta estiver livre.
+        posicao = posicoes[plano_arquivo.base] = posicoes.get(plano_arquivo.base, 0) + 1
+        chave = os.path.normcase(origem)
+        if chave in vistos:
+            yield ItemSimulacao(idx, origem, None, None, [DUPLICADO])
+            continue
+        vistos.add(chave)
+        numerador = numeradores.get(plano_arquivo.base)
+        if numerador is None:
+            numerador = numeradores[plano_arquivo.base] = NumeradorLote(plano_arquivo, indices)
+
+        diretorio, nome_origem = os.path.split(origem)
+        indice = numerador.indice(diretorio)
+        if not indice.contem(nome_origem):
+            # Falharia no os.replace e não ocuparia número: os seguintes não mudam.
+            yield ItemSimulacao(idx, origem, None, None, [ORIGEM_AUSENTE])
+            continue
+
+        ext = os.path.splitext(nome_origem)[1]
+        pasta = diretorio if pasta_destino is None else pasta_destino
+        if numerar:
+            reserva = numerador.reservar_em(pasta, ext, posicao)
+            if not reserva:
+                yield ItemSimulacao(idx, origem, None, None, [SEM_NOME])
+                continue
+            numero, nome = reserva
+            destino = os.path.join(pasta, nome)
+            if numero != posicao:
+                avisos.append(COLISAO)
+        else:
+            nome = plano_arquivo.nome_em(pasta, ext)
+            if not nome:
+                yield ItemSimulacao(idx, origem, None, None, [SEM_NOME])
+                continue
+            numero, destino = None, os.path.join(pasta, nome)
+            if numerador.indice(pasta).contem(nome):
+                avisos.append(SUBSTITUI)
+
+        if plano_arquivo.encurtado(nome, ext, numero):
+            avisos.append(ENCURTADO)
+        if _passa_do_limite(tam_pasta, pasta, nome):
+            avisos.append(LIMITE_WINDOWS)
+        if pasta_destino is None:
+            numerador.confirmar(origem, destino)
+        else:
+            numerador.ocupar_em(pasta, nome)
+        yield ItemSimulacao(idx, origem, destino, numero, avisos)
+
+
+def _passa_do_limite(tam_pasta: Dict[str, int], pasta: str, nome: str) -> bool:
+    """Caminho absoluto acima do limite do Windows; ``tam_pasta`` guarda o tamanho de cada pasta.
+
+    Pastas com o ``PREFIXO_LONGO`` não têm esse limite.
+    """
+    if pasta.startswith(PREFIXO_LONGO):
+        return False
+    tam = tam_pasta.get(pasta)
+    if tam is None:
+        tam = tam_pasta[pasta] = len(os.path.abspath(pasta))
+    return tam + 1 + len(nome) > _MAX_WINDOWS
+
+
+def _simular_duas_fases(
+    plano: PlanoNome,
+    arquivos: Iterable[str],
+    repetidos: Optional[Dict[str, str]],
+    pular_repetidos: bool,
+    plano_de: Optional[Callable[[str], PlanoNome]],
+    indices: Dict[str, IndiceDiretorio],
+) -> Iterator[ItemSimulacao]:
+    """Um plano de trocas por nome-base, na ordem dos grupos de ``executar_grupos``."""
+    selecao = list(arquivos)
+    itens: List[Optional[ItemSimulacao]] = [None] * len(selecao)
+    grupos: Dict[str, Tuple[PlanoNome, PlanoCompacto, List[int]]] = {}
+    for k, origem in enumerate(selecao):
+        if pular_repetidos and repetidos and origem in repetidos:
+            itens[k] = ItemSimulacao(k + 1, origem, None, None, [REPETIDO])
+            continue
+        plano_arquivo = plano_de(origem) if plano_de else plano
+        grupo = grupos.get(plano_arquivo.base)
+        if grupo is None:
+            grupo = grupos[plano_arquivo.base] = (plano_arquivo, PlanoCompacto(), [])
+        grupo[1].adicionar(origem)
+        grupo[2].append(k)
+
+    tam_pasta: Dict[str, int] = {}
+    for plano_grupo, fatia, posicoes in grupos.values():
+        trocas = planejar_trocas(plano_grupo, fatia, 1, indices)
+        for i, k in enumerate(posicoes):
+            origem = selecao[k]
+            situacao = trocas.situacao[i]
+            if situacao == CAMINHO_REPETIDO:
+                itens[k] = ItemSimulacao(k + 1, origem, None, None, [DUPLICADO])
+                continue
+            if situacao == AUSENTE:
+                itens[k] = ItemSimulacao(k + 1, origem, None, None, [ORIGEM_AUSENTE])
+                continue
+            numero = fatia.numeros[i]
+            if numero == SEM_NUMERO:
+                itens[k] = ItemSimulacao(k + 1, origem, None, None, [SEM_NOME])
+                continue
+            avisos = [REPETIDO] if repetidos and origem in repetidos else []
+            pasta, ext = fatia.pasta(i), fatia.ext(i)
+            nome = plano_grupo.nome_em(pasta, ext, numero) or ""
+            if numero != i + 1:
+                avisos.append(COLISAO)
+            if plano_grupo.encurtado(nome, ext, numero):
+                avisos.append(ENCURTADO)
+            if _passa_do_limite(tam_pasta, pasta, nome):
+                avisos.append(LIMITE_WINDOWS)
+            if situacao == CICLO:
+                avisos.append(TROCA)
+            itens[k] = ItemSimulacao(k + 1, origem, os.path.join(pasta, nome), numero, avisos)
+    for item in itens:
+        if item is not None:
+            yield item
+
+
+# ---------- Relatório ----------
+def escrever_relatorio(itens: Iterable[ItemSimulacao], caminho: str, formato: Optional[str] = None) -> ResumoSimulacao:
+    """Grava ``itens`` em CSV ou JSON (pela extensão, se ``formato`` não vier) e devolve o resumo."""
+    formato = (formato or os.path.splitext(caminho)[1].lstrip(".") or "csv").lower()
+    if formato not in ("csv", "json"):
+        raise ValueError(f"formato de relatório desconhecido: {formato!r} (use csv ou json)")
+    resumo = ResumoSimulacao()
+    with open(caminho, "w", encoding="utf-8", newline="") as f:
+        if formato == "csv":
+            escritor = csv.writer(f)
+            escritor.writerow(_CAMPOS_CSV)
+            for it in itens:
+                resumo.contar(it)
+                escritor.writerow((it.idx, it.origem, it.destino or "", "" if it.numero is None else it.numero, ";".join(it.avisos)))
+        else:
+            f.write('{"itens": [')
+            separador = "\n"
+            for it in itens:
+                resumo.contar(it)
+                f.write(separador + json.dumps(it.como_dict(), ensure_ascii=False))
+                separador = ",\n"
+            resumo_dict = {"total": resumo.total, "com_aviso": resumo.com_aviso, "avisos": resumo.contagem}
+            f.write("\n], \"resumo\": " + json.dumps(resumo_dict, ensure_ascii=False) + "}\n")
+    return resumo
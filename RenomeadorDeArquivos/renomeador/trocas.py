@@ -0,0 +1,183 @@
+"""
+Renome em duas fases — a seleção inteira numerada de uma vez, com trocas e ciclos.
+
+O lote comum numera arquivo a arquivo contra a pasta como ela está: reaplicar
+o app em arquivos que já se chamam ``...-001``, ``...-002`` empurra todos
+para números altos, porque cada nome desejado ainda está ocupado por outro
+arquivo da própria seleção. Aqui os nomes de origem da seleção contam como
+livres; só os arquivos de fora dela ocupam números. Cada arquivo ganha o seu
+número (a posição na seleção, ou o próximo livre) e o lote vira um grafo
+origem -> destino em que cada nome tem no máximo uma aresta chegando e uma
+saindo: só caminhos e ciclos.
+
+Os caminhos são executados do fim para o começo (o destino de cada renome já
+foi desocupado pelo anterior). Em cada ciclo, o primeiro arquivo sai para um
+nome temporário, o resto do ciclo anda, e o temporário vai para o destino
+no fim: um renome a mais por ciclo, nenhum nos caminhos. Tudo em tempo
+linear e sem depender da ordem das threads — o mesmo disco e a mesma
+seleção dão sempre o mesmo plano.
+"""
+
+import os
+from array import array
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .compacto import SEM_NUMERO, PlanoCompacto
+from .nomes import PlanoNome
+from .numeracao import IndiceDiretorio, NumeradorLote
+
+# Situação de cada arquivo no plano
+NORMAL = 0
+AUSENTE = 1  # origem não existe na pasta: não ocupa número
+CAMINHO_REPETIDO = 2  # mesmo caminho já apareceu antes na seleção
+CICLO = 3  # abre um ciclo: vai para ``temporarios[i]`` e só no fim para o destino
+
+_PREFIXO_TEMPORARIO = ".renomeador-troca-"
+
+
+class PlanoTrocas:
+    """Ordem de execução de um ``PlanoCompacto`` já numerado, por pasta.
+
+    ``ordens[id_pasta]`` traz as posições na ordem em que os renomes devem
+    acontecer e ``tamanhos[id_pasta]`` o tamanho de cada cadeia (um caminho,
+    um ciclo ou um arquivo sozinho); cadeias de uma pasta não dependem umas
+    das outras, e pastas diferentes podem andar em paralelo.
+    """
+
+    __slots__ = ("situacao", "ordens", "tamanhos", "temporarios", "ciclos")
+
+    def __init__(self, n: int) -> None:
+        self.situacao = bytearray(n)
+        self.ordens: Dict[int, array] = {}
+        self.tamanhos: Dict[int, array] = {}
+        self.temporarios: Dict[int, str] = {}  # posição -> nome temporário (na mesma pasta)
+        self.ciclos = 0
+
+    def _adicionar(self, id_pasta: int, cadeia: List[int]) -> None:
+        ordem = self.ordens.get(id_pasta)
+        if ordem is None:
+            ordem = self.ordens[id_pasta] = array("I")
+            self.tamanhos[id_pasta] = array("I")
+        ordem.extend(cadeia)
+        self.tamanhos[id_pasta].append(len(cadeia))
+
+    def cadeias(self, id_pasta: int) -> Iterator[array]:
+        """Cadeias da pasta; num ciclo, a primeira posição é a que passa pelo temporário."""
+        ordem = self.ordens.get(id_pasta)
+        if ordem is None:
+            return
+        k = 0
+        for tam in self.tamanhos[id_pasta]:
+            yield ordem[k:k + tam]
+            k += tam
+
+    def __iter__(self) -> Iterator[Tuple[int, array]]:
+        """(id_pasta, cadeia) de todas as pastas, na ordem de execução de cada uma."""
+        for id_pasta in self.ordens:
+            for cadeia in self.cadeias(id_pasta):
+                yield id_pasta, cadeia
+
+
+def _temporario(ocupado: Callable[[str], bool], posicao: int, ext: str) -> str:
+    nome = f"{_PREFIXO_TEMPORARIO}{posicao}{ext}"
+    extra = 0
+    while ocupado(nome):
+        extra += 1
+        nome = f"{_PREFIXO_TEMPORARIO}{posicao}-{extra}{ext}"
+    return nome
+
+
+def planejar_trocas(
+    plano: PlanoNome,
+    fatia: PlanoCompacto,
+    inicio: int = 1,
+    indices: Optional[Dict[str, IndiceDiretorio]] = None,
+) -> PlanoTrocas:
+    """Numera ``fatia`` (o ``i``-ésimo pede ``inicio + i``) e ordena os renomes.
+
+    ``indices`` (compartilhado com a simulação) termina no estado das pastas
+    depois do lote: origens removidas, destinos ocupados.
+    """
+    indices = {} if indices is None else indices
+    n = len(fatia)
+    trocas = PlanoTrocas(n)
+    situacao = trocas.situacao
+    numeros = fatia.numeros
+
+    # 1) Origens da seleção: cada nome (por pasta) aponta para a sua posição e sai do índice.
+    posicao_de: Dict[Tuple[int, str], int] = {}
+    for i in range(n):
+        id_pasta = fatia.id_pasta(i)
+        pasta = fatia.pastas[id_pasta]
+        indice = indices.get(pasta)
+        if indice is None:
+            indice = indices[pasta] = IndiceDiretorio(pasta)
+        chave = (id_pasta, os.path.normcase(fatia.nome(i)))
+        if chave in posicao_de:
+            situacao[i] = CAMINHO_REPETIDO
+        elif not indice.contem(chave[1]):
+            situacao[i] = AUSENTE
+        else:
+            posicao_de[chave] = i
+            indice.remover(chave[1])
+
+    # 2) Números: os nomes de fora da seleção continuam ocupados; os dela, não.
+    # ``proximo[i]`` é o arquivo da seleção que ainda ocupa o destino de ``i``
+    # (ele também recebe número: ou todos recebem, ou o plano não tem nome).
+    numerador = NumeradorLote(plano, indices)
+    proximo = array("i", [-1]) * n
+    tem_anterior = bytearray(n)
+    for i in range(n):
+        numeros[i] = SEM_NUMERO
+        if situacao[i] != NORMAL:
+            continue
+        id_pasta = fatia.id_pasta(i)
+        pasta = fatia.pastas[id_pasta]
+        reserva = numerador.reservar_em(pasta, fatia.ext(i), inicio + i)
+        if not reserva:
+            continue
+        numeros[i] = reserva[0]
+        numerador.ocupar_em(pasta, reserva[1])
+        j = posicao_de.get((id_pasta, os.path.normcase(reserva[1])), i)
+        if j != i:
+            proximo[i] = j
+            tem_anterior[j] = 1
+
+    # 3) Caminhos, a partir de quem ninguém espera; executados do fim para o começo.
+    feito = bytearray(n)
+    for i in range(n):
+        if tem_anterior[i]:
+            continue
+        cadeia = [i]
+        j = proximo[i]
+        while j >= 0:
+            cadeia.append(j)
+            j = proximo[j]
+        for k in cadeia:
+            feito[k] = 1
+        cadeia.reverse()
+        trocas._adicionar(fatia.id_pasta(i), cadeia)
+
+    # 4) O que sobrou está em ciclos; cada um começa pela menor posição.
+    for i in range(n):
+        if feito[i]:
+            continue
+        cadeia = [i]
+        j = proximo[i]
+        while j != i:
+            cadeia.append(j)
+            j = proximo[j]
+        for k in cadeia:
+            feito[k] = 1
+        cadeia[1:] = cadeia[:0:-1]
+        id_pasta = fatia.id_pasta(i)
+        indice = indices[fatia.pastas[id_pasta]]
+
+        def ocupado(nome: str) -> bool:
+            return indice.contem(nome) or (id_pasta, os.path.normcase(nome)) in posicao_de
+
+        situacao[i] = CICLO
+        trocas.temporarios[i] = _temporario(ocupado, i, fatia.ext(i))
+        trocas.ciclos += 1
+        trocas._adicionar(id_pasta, cadeia)
+    return trocas
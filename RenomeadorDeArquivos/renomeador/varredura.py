@@ -0,0 +1,117 @@
+"""
+Varredura de pastas — percorre a árvore sob demanda com ``os.scandir``.
+
+Os arquivos saem em fluxo, pasta por pasta (todos os arquivos de uma pasta
+em sequência), então a memória fica limitada à maior pasta, não à árvore.
+Cada pasta é lida por inteiro antes de entregar o primeiro arquivo dela: quem
+consome pode renomear à vontade sem que a listagem em andamento mude.
+"""
+
+import fnmatch
+import os
+import re
+from typing import Iterable, Iterator, List, Optional, Pattern, Sequence, Set, Tuple
+
+# Mesmos filtros do diálogo "Selecionar".
+TIPOS_ARQUIVO: List[Tuple[str, str]] = [
+    ("Todos os arquivos", "*.*"),
+    ("Documentos PDF", "*.pdf"),
+    ("Documentos Word", "*.docx"),
+    ("Documentos Excel", "*.xlsx"),
+    ("Imagens", "*.png *.jpg *.jpeg"),
+]
+
+
+def extensoes_de_padroes(padroes: str) -> Set[str]:
+    """``"*.png *.jpg"`` -> ``{".png", ".jpg"}``; ``"*.*"`` (todos) -> conjunto vazio."""
+    exts: Set[str] = set()
+    for p in padroes.split():
+        if p in ("*", "*.*"):
+            return set()
+        if p.startswith("*."):
+            exts.add(p[1:].lower())
+    return exts
+
+
+def _compilar(padroes: Iterable[str]) -> List[Tuple[bool, Pattern[str]]]:
+    # (casa_caminho_relativo, regex); padrões com "/" casam o caminho, os outros só o nome.
+    return [
+        ("/" in p, re.compile(fnmatch.translate(os.path.normcase(p.replace("\\", "/")))))
+        for p in padroes
+        if p
+    ]
+
+
+class FiltroArquivos:
+    """Filtros de inclusão/exclusão (glob), extensões e profundidade máxima."""
+
+    __slots__ = ("incluir", "excluir", "extensoes", "profundidade_max")
+
+    def __init__(
+        self,
+        incluir: Sequence[str] = (),
+        excluir: Sequence[str] = (),
+        extensoes: Iterable[str] = (),
+        profundidade_max: Optional[int] = None,
+    ):
+        self.incluir = _compilar(incluir)
+        self.excluir = _compilar(excluir)
+        self.extensoes = {("." + e.lower().lstrip(".")) for e in extensoes if e}
+        self.profundidade_max = profundidade_max
+
+    @staticmethod
+    def _casa(padroes: List[Tuple[bool, Pattern[str]]], rel: str, nome: str) -> bool:
+        return any(rx.match(rel if com_caminho else nome) for com_caminho, rx in padroes)
+
+    def aceita_pasta(self, rel: str, nome: str) -> bool:
+        return not self._casa(self.excluir, os.path.normcase(rel), os.path.normcase(nome))
+
+    def aceita_arquivo(self, rel: str, nome: str) -> bool:
+        if self.extensoes and os.path.splitext(nome)[1].lower() not in self.extensoes:
+            return False
+        rel, nome = os.path.normcase(rel), os.path.normcase(nome)
+        if self.incluir and not self._casa(self.incluir, rel, nome):
+            return False
+        return not self._casa(self.excluir, rel, nome)
+
+
+def varrer(
+    raiz: str,
+    filtro: Optional[FiltroArquivos] = None,
+    *,
+    ordenar: bool = True,
+    seguir_links: bool = False,
+) -> Iterator[str]:
+    """Arquivos sob ``raiz`` em profundidade; ``ordenar`` segue a ordem da interface (nome, sem caixa)."""
+    filtro = filtro or FiltroArquivos()
+    pilha: List[Tuple[str, str, int]] = [(raiz, "", 0)]
+    while pilha:
+        pasta, rel_pasta, profundidade = pilha.pop()
+        desce = filtro.profundidade_max is None or profundidade < filtro.profundidade_max
+        subpastas: List[Tuple[str, str]] = []
+        arquivos: List[Tuple[str, str]] = []
+        try:
+            with os.scandir(pasta) as it:
+                for e in it:
+                    rel = f"{rel_pasta}/{e.name}" if rel_pasta else e.name
+                    try:
+                        if e.is_dir(follow_symlinks=seguir_links):
+                            if desce and filtro.aceita_pasta(rel, e.name):
+                                subpastas.append((e.name, rel))
+                            continue
+                        if not e.is_file(follow_symlinks=seguir_links):
+                            continue
+                    except OSError:
+                        continue
+                    if filtro.aceita_arquivo(rel, e.name):
+                        arquivos.append((e.name, e.path))
+        except OSError:
+            continue
+
+        if ordenar:
+            arquivos.sort(key=lambda a: a[0].lower())
+            subpastas.sort(key=lambda s: s[0].lower(), reverse=True)
+        for _, caminho in arquivos:
+            yield caminho
+        for nome, rel in subpastas:
+            pilha.append((os.path.join(pasta, nome), rel, profundidade + 1))
@@ -0,0 +1,326 @@
+"""
+Pasta vigiada — renomeia sozinho os arquivos que chegam numa pasta.
+
+No Linux usa inotify; nos demais sistemas (ou com ``polling=True``, necessário
+em compartilhamentos de rede, onde o inotify não vê escritas de outras
+máquinas) consulta a pasta periodicamente e só a relê quando o mtime dela
+muda. Um arquivo é renomeado depois de ``estavel`` segundos sem mudar de
+tamanho nem de data, em lotes, com a mesma numeração da interface.
+"""
+
+import ctypes
+import ctypes.util
+import json
+import os
+import queue
+import re
+import select
+import stat
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Pattern, Set, Tuple
+
+from .lote import ResultadoLote, renomear_lote
+from .nomes import PlanoNome
+
+CAMPOS_PERFIL = ("setor", "evento", "funcionario", "documento", "versao")
+
+# Arquivos ainda sendo gravados por navegadores, Office, scanners etc.
+_PREFIXOS_TEMPORARIOS = (".", "~$")
+_SUFIXOS_TEMPORARIOS = (".tmp", ".part", ".partial", ".crdownload", ".download", "~")
+
+# Número no fim de um nome já renomeado (``-001``).
+_RE_NUMERO = re.compile(r"-(\d{3,})$")
+
+# Com polling, a pasta é relida por inteiro de tempos em tempos mesmo sem
+# mudança de mtime (sistemas de arquivos com mtime de baixa resolução).
+_RELEITURA_TOTAL = 60.0
+
+
+# ---------- Perfil ----------
+def carregar_perfil(caminho: str) -> Dict[str, str]:
+    with open(caminho, "r", encoding="utf-8") as f:
+        dados = json.load(f) or {}
+    return {campo: str(dados.get(campo) or "") for campo in CAMPOS_PERFIL}
+
+
+def salvar_perfil(caminho: str, perfil: Dict[str, str]) -> None:
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump({campo: perfil.get(campo, "") for campo in CAMPOS_PERFIL}, f, indent=2, ensure_ascii=False)
+
+
+# ---------- Fontes de eventos ----------
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_Q_OVERFLOW = 0x00004000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_MASCARA = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+_EVENTO = struct.Struct("iIII")
+
+
+class _FonteInotify:
+    """Nomes criados/gravados/movidos para a pasta, via inotify (Linux)."""
+
+    def __init__(self, pasta: str):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        if libc.inotify_add_watch(fd, os.fsencode(pasta), _MASCARA) < 0:
+            err = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(err, os.strerror(err), pasta)
+        self._fd = fd
+
+    def esperar(self, timeout: float) -> Optional[Set[str]]:
+        """Nomes que mudaram; ``None`` quando a fila do kernel transbordou e é preciso reler a pasta."""
+        prontos, _, _ = select.select([self._fd], [], [], timeout)
+        nomes: Set[str] = set()
+        if not prontos:
+            return nomes
+        transbordou = False
+        while True:
+            try:
+                dados = os.read(self._fd, 1 << 16)
+            except BlockingIOError:
+                break
+            pos = 0
+            while pos + _EVENTO.size <= len(dados):
+                _, mascara, _, tam = _EVENTO.unpack_from(dados, pos)
+                pos += _EVENTO.size
+                nome = dados[pos:pos + tam].rstrip(b"\0")
+                pos += tam
+                if mascara & _IN_Q_OVERFLOW:
+                    transbordou = True
+                elif nome and not mascara & _IN_ISDIR:
+                    nomes.add(os.fsdecode(nome))
+        return None if transbordou else nomes
+
+    def fechar(self) -> None:
+        os.close(self._fd)
+
+
+class _FontePolling:
+    """Nomes novos na pasta; relê a pasta só quando o mtime dela muda."""
+
+    def __init__(self, pasta: str, parar: threading.Event):
+        self.pasta = pasta
+        self._parar = parar
+        self._mtime: Optional[int] = None
+        self._ultima_total = 0.0
+        self._nomes: Set[str] = set()
+        self._reler()
+
+    def _reler(self) -> Set[str]:
+        try:
+            self._mtime = os.stat(self.pasta).st_mtime_ns
+            with os.scandir(self.pasta) as it:
+                atuais = {e.name for e in it}
+        except OSError:
+            return set()
+        self._ultima_total = time.monotonic()
+        novos = atuais - self._nomes
+        self._nomes = atuais
+        return novos
+
+    def esperar(self, timeout: float) -> Optional[Set[str]]:
+        self._parar.wait(timeout)
+        try:
+            mtime = os.stat(self.pasta).st_mtime_ns
+        except OSError:
+            return set()
+        if mtime == self._mtime and time.monotonic() - self._ultima_total < _RELEITURA_TOTAL:
+            return set()
+        return self._reler()
+
+    def fechar(self) -> None:
+        pass
+
+
+# ---------- Vigia ----------
+class Vigia:
+    """Vigia ``pasta`` e renomeia cada arquivo estável com o plano de ``criar_plano``.
+
+    ``criar_plano`` é chamado a cada lote (a data do nome acompanha o dia).
+    Arquivos cujo nome já segue o plano (qualquer data, inteiro ou encurtado
+    pelo limite da pasta) são ignorados, então os próprios renomes não
+    voltam para a fila.
+
+    A fila entre quem vigia e quem renomeia tem ``tam_fila`` posições: numa
+    rajada, a vigia espera a renomeação em vez de acumular memória (o kernel
+    guarda os eventos e, se transbordar, a pasta é relida).
+    """
+
+    def __init__(
+        self,
+        pasta: str,
+        criar_plano: Callable[[], PlanoNome],
+        *,
+        estavel: float = 2.0,
+        intervalo: float = 1.0,
+        polling: bool = False,
+        existentes: bool = True,
+        tam_fila: int = 1024,
+        tam_lote: int = 256,
+        ao_renomear: Optional[Callable[[str, str], None]] = None,
+        ao_lote: Optional[Callable[[ResultadoLote], None]] = None,
+    ):
+        self.pasta = pasta
+        self.criar_plano = criar_plano
+        self.estavel = estavel
+        self.intervalo = intervalo
+        self.polling = polling
+        self.existentes = existentes
+        self.tam_lote = max(1, tam_lote)
+        self.ao_renomear = ao_renomear
+        self.ao_lote = ao_lote
+        self.modo = ""
+        self._parar = threading.Event()
+        self._fila: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=max(1, tam_fila))
+        self._trava = threading.Lock()
+        self._enfileirados: Set[str] = set()
+        # nome -> ((tamanho, mtime), desde quando está assim); None = ainda sem stat.
+        self._pendentes: Dict[str, Optional[Tuple[Tuple[int, int], float]]] = {}
+
+    def parar(self) -> None:
+        self._parar.set()
+
+    # ---------- Candidatos ----------
+    @staticmethod
+    def _padrao_renomeado(plano: PlanoNome) -> Pattern[str]:
+        base = plano.base
+        resto = base[8:] if base[:8].isdigit() else base
+        return re.compile(r"\d{8}" + re.escape(resto), re.IGNORECASE)
+
+    def _encurtado_pelo_plano(self, plano: PlanoNome, nome: str) -> bool:
+        """``nome`` é o que ``nome_em`` dá nesta pasta quando corta o meio da base (qualquer data)."""
+        radical, ext = os.path.splitext(nome)
+        m = _RE_NUMERO.search(radical)
+        esperado = plano.nome_em(self.pasta, ext, int(m.group(1)) if m else None)
+        if not esperado or len(esperado) != len(nome):
+            return False
+        if plano.base[:8].isdigit():
+            return nome[:8].isdigit() and esperado[8:].lower() == nome[8:].lower()
+        return esperado.lower() == nome.lower()
+
+    def _observar(self, nomes: Iterable[str]) -> None:
+        plano = self.criar_plano()
+        renomeado = self._padrao_renomeado(plano)
+        with self._trava:
+            enfileirados = set(self._enfileirados)
+        for nome in nomes:
+            if nome in self._pendentes or nome in enfileirados:
+                continue
+            minusculo = nome.lower()
+            if minusculo.startswith(_PREFIXOS_TEMPORARIOS) or minusculo.endswith(_SUFIXOS_TEMPORARIOS):
+                continue
+            if renomeado.match(nome) or self._encurtado_pelo_plano(plano, nome):
+                continue
+            self._pendentes[nome] = None
+
+    def _maduros(self, agora: float) -> List[str]:
+        prontos: List[str] = []
+        for nome, visto in list(self._pendentes.items()):
+            try:
+                st = os.stat(os.path.join(self.pasta, nome))
+            except FileNotFoundError:
+                del self._pendentes[nome]
+                continue
+            except OSError:
+                continue
+            if not stat.S_ISREG(st.st_mode):
+                del self._pendentes[nome]
+                continue
+            chave = (st.st_size, st.st_mtime_ns)
+            if visto is None or visto[0] != chave:
+                self._pendentes[nome] = (chave, agora)
+            elif agora - visto[1] >= self.estavel:
+                del self._pendentes[nome]
+                prontos.append(nome)
+        return prontos
+
+    def _listar(self) -> List[str]:
+        try:
+            return os.listdir(self.pasta)
+        except OSError:
+            return []
+
+    def _enfileirar(self, nome: str) -> None:
+        with self._trava:
+            self._enfileirados.add(nome)
+        while not self._parar.is_set():
+            try:
+                self._fila.put(nome, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    # ---------- Renomeação ----------
+    def _renomear(self) -> None:
+        fim = False
+        while not fim:
+            nome = self._fila.get()
+            if nome is None:
+                break
+            lote = [nome]
+            while len(lote) < self.tam_lote:
+                try:
+                    nome = self._fila.get_nowait()
+                except queue.Empty:
+                    break
+                if nome is None:
+                    fim = True
+                    break
+                lote.append(nome)
+            lote.sort(key=str.lower)
+            arquivos = [os.path.join(self.pasta, n) for n in lote]
+            resultado = renomear_lote(self.criar_plano(), arquivos, ao_renomear=self.ao_renomear)
+            with self._trava:
+                self._enfileirados.difference_update(lote)
+            if self.ao_lote:
+                self.ao_lote(resultado)
+
+    # ---------- Laço principal ----------
+    def _criar_fonte(self):
+        if not self.polling and sys.platform.startswith("linux"):
+            try:
+                fonte = _FonteInotify(self.pasta)
+                self.modo = "inotify"
+                if self.existentes:
+                    self._observar(self._listar())
+                return fonte
+            except (OSError, AttributeError):
+                pass
+        self.modo = "polling"
+        fonte = _FontePolling(self.pasta, self._parar)
+        if self.existentes:
+            self._observar(self._listar())
+        return fonte
+
+    def executar(self) -> None:
+        """Vigia até ``parar()``; os arquivos já enfileirados são renomeados antes de voltar."""
+        if not os.path.isdir(self.pasta):
+            raise NotADirectoryError(self.pasta)
+        fonte = self._criar_fonte()
+        renomeador = threading.Thread(target=self._renomear, name="vigia-renomear", daemon=True)
+        renomeador.start()
+        try:
+            while not self._parar.is_set():
+                nomes = fonte.esperar(self.intervalo)
+                if nomes is None:
+                    nomes = self._listar()
+                if nomes:
+                    self._observar(nomes)
+                if self._pendentes:
+                    for nome in self._maduros(time.monotonic()):
+                        self._enfileirar(nome)
+        finally:
+            fonte.fechar()
+            self._fila.put(None)
+            renomeador.join()
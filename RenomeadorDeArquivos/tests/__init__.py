@@ -0,0 +1 @@
+"""Testes do motor (``renomeador``) — rodar com ``python -m pytest`` na pasta do projeto."""
@@ -0,0 +1,54 @@
+import os
+from typing import Dict, List
+
+import pytest
+
+from renomeador.configuracao import VARIAVEL_PASTA
+from renomeador.nomes import PlanoNome, formatar_numero
+
+PLANO = PlanoNome("20260101-Fin")
+
+
+class Queda(BaseException):
+    """Morte do processo no meio do lote: nada depois dela roda (nem ``except Exception``)."""
+
+
+@pytest.fixture(autouse=True)
+def configuracao_isolada(tmp_path, monkeypatch):
+    monkeypatch.setenv(VARIAVEL_PASTA, str(tmp_path / "config"))
+
+
+def numerado(pasta: str, numero: int, ext: str = ".pdf") -> str:
+    return os.path.join(pasta, f"{PLANO.base}-{formatar_numero(numero)}{ext}")
+
+
+def criar(caminho: str, conteudo: str = "") -> str:
+    with open(caminho, "w", encoding="utf-8") as f:
+        f.write(conteudo or os.path.basename(caminho))
+    return caminho
+
+
+def estado(raiz: str) -> Dict[str, str]:
+    """Caminho relativo -> conteúdo de cada arquivo sob ``raiz`` (sem diários)."""
+    arquivos = {}
+    for pasta, _, nomes in os.walk(raiz):
+        for nome in nomes:
+            if not nome.endswith(".jsonl"):
+                caminho = os.path.join(pasta, nome)
+                with open(caminho, encoding="utf-8") as f:
+                    arquivos[os.path.relpath(caminho, raiz)] = f.read()
+    return arquivos
+
+
+def arvore(raiz: str, pastas: int = 6, por_pasta: int = 15) -> List[str]:
+    """Pastas com alguns números já ocupados; a seleção volta a cada pasta em dois blocos."""
+    metades: List[List[str]] = []
+    for p in range(pastas):
+        pasta = os.path.join(raiz, f"d{p}")
+        os.makedirs(pasta)
+        for k in range(1, p % 3 + 2):
+            criar(numerado(pasta, 2 * k))
+        arquivos = [criar(os.path.join(pasta, f"f{i}{'.pdf' if i % 3 else '.txt'}")) for i in range(por_pasta + p)]
+        metades += [arquivos[: len(arquivos) // 2], arquivos[len(arquivos) // 2 :]]
+    ordem = metades[0::2] + metades[1::2]
+    return [a for bloco in ordem for a in bloco]
@@ -0,0 +1,69 @@
+import os
+import threading
+
+import pytest
+
+from renomeador.arquivamento import ArquivadorLote
+from renomeador.diario import Diario, desfazer, ler_diario
+from renomeador.executor import CANCELADO, RENOMEADO
+from renomeador.numeracao import CacheSufixos
+
+from .conftest import PLANO, criar, estado, numerado
+
+
+def _em_fluxo(arquivos, cancelar: threading.Event, depois: int):
+    """Gerador (tamanho desconhecido) que cancela o lote ao entregar o arquivo ``depois``."""
+    for i, arquivo in enumerate(arquivos, start=1):
+        if i == depois:
+            cancelar.set()
+        yield arquivo
+
+
+@pytest.fixture
+def origens(tmp_path):
+    pasta = tmp_path / "entrada"
+    pasta.mkdir()
+    return [criar(str(pasta / f"f{i:03d}.pdf")) for i in range(150)]
+
+
+def test_arquivar_e_desfazer(tmp_path, origens):
+    destino = str(tmp_path / "arquivo")
+    antes = estado(str(tmp_path))
+    caminho = str(tmp_path / "lote.jsonl")
+    with Diario.criar(caminho, PLANO.base) as diario:
+        r = ArquivadorLote(PLANO, destino, diario=diario, max_tarefas=2).executar(origens)
+    assert (r.total, r.ok, r.erros) == (150, 150, [])
+    assert sorted(os.listdir(destino)) == [os.path.basename(numerado(destino, n)) for n in range(1, 151)]
+    assert desfazer(caminho).erros == []
+    assert estado(str(tmp_path)) == antes
+
+
+@pytest.mark.parametrize("depois", [10, 100])
+def test_cancelar_em_fluxo_conta_os_nao_despachados(tmp_path, origens, depois):
+    destino = str(tmp_path / "arquivo")
+    caminho = str(tmp_path / "lote.jsonl")
+    cancelar = threading.Event()
+    eventos = []
+    sufixos = CacheSufixos(str(tmp_path / "sufixos.db"))
+    try:
+        with Diario.criar(caminho, PLANO.base) as diario:
+            r = ArquivadorLote(
+                PLANO, destino, diario=diario, cancelar=cancelar, sufixos=sufixos, ao_evento=eventos.append
+            ).executar(_em_fluxo(origens, cancelar, depois))
+        # Os ``depois - 1`` planejados contam: movidos ou cancelados, nenhum some do resultado.
+        assert r.total == depois - 1 and r.ok + r.cancelados == r.total and r.cancelados > 0
+        assert sorted(e.idx for e in eventos) == list(range(1, depois))
+        assert sum(e.tipo == CANCELADO for e in eventos) == r.cancelados
+        assert len(os.listdir(destino)) == sum(e.tipo == RENOMEADO for e in eventos) == r.ok
+        with open(caminho, encoding="utf-8") as f:
+            assert sum('"cancelado"' in linha for linha in f) == r.cancelados
+
+        # Os números reservados e não usados não ficam gravados como ocupados.
+        antes = set(os.listdir(destino))
+        livres = [n for n in range(1, 200) if os.path.basename(numerado(destino, n)) not in antes][:3]
+        r2 = ArquivadorLote(PLANO, destino, sufixos=sufixos).executar([o for o in origens if os.path.exists(o)][:3])
+        assert r2.ok == 3
+        assert set(os.listdir(destino)) - antes == {os.path.basename(numerado(destino, n)) for n in livres}
+    finally:
+        sufixos.fechar()
+    assert not ler_diario(caminho).pendentes()
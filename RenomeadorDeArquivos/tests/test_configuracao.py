@@ -0,0 +1,95 @@
+import json
+import os
+import threading
+
+import pytest
+
+from renomeador import configuracao
+from renomeador.configuracao import NOME_ARQUIVO, Configuracao
+
+
+@pytest.fixture
+def pasta(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # sem arquivo legado na pasta de trabalho
+    return str(tmp_path / "config")
+
+
+def _no_disco(pasta: str) -> dict:
+    with open(os.path.join(pasta, NOME_ARQUIVO), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_so_grava_o_que_mudou(pasta):
+    config = Configuracao(pasta)
+    assert config.atualizar({"setor": "Financeiro", "tarefas": 4}, carimbo="salvo_em")
+    antes = os.stat(os.path.join(pasta, NOME_ARQUIVO))
+    assert not config.atualizar({"setor": "Financeiro"}, carimbo="salvo_em")
+    depois = os.stat(os.path.join(pasta, NOME_ARQUIVO))
+    assert (antes.st_ino, antes.st_mtime_ns) == (depois.st_ino, depois.st_mtime_ns)
+    dados = _no_disco(pasta)
+    assert dados["setor"] == "Financeiro" and dados["tarefas"] == 4 and "salvo_em" in dados
+
+
+def test_junta_com_o_que_outra_instancia_gravou(pasta):
+    a, b = Configuracao(pasta), Configuracao(pasta)
+    a.atualizar({"setor": "Financeiro", "evento": "RCA"})
+    assert b.get("evento") == "RCA"
+    b.atualizar({"evento": "AUD", "funcionario": "Ana"})
+    # ``a`` ainda tem evento=RCA em memória: o que ele não mudou não desfaz o de ``b``.
+    assert a.atualizar({"setor": "Juridico", "evento": "RCA"})
+    assert _no_disco(pasta) == {"setor": "Juridico", "evento": "AUD", "funcionario": "Ana"}
+    assert a.get("funcionario") == "Ana"
+
+
+def test_gravacao_do_mesmo_tamanho_no_mesmo_instante(pasta):
+    a, b = Configuracao(pasta), Configuracao(pasta)
+    a.atualizar({"x": 1, "y": 1})
+    b.get("x")
+    mtime = os.stat(os.path.join(pasta, NOME_ARQUIVO)).st_mtime_ns
+    b.atualizar({"y": 2})
+    # Relógio grosso: o arquivo novo fica com o mesmo tamanho e o mesmo mtime.
+    os.utime(os.path.join(pasta, NOME_ARQUIVO), ns=(mtime, mtime))
+    a.atualizar({"x": 3})
+    assert _no_disco(pasta) == {"x": 3, "y": 2}
+
+
+def test_instancias_concorrentes_nao_perdem_valores(pasta):
+    def gravar(t: int) -> None:
+        config = Configuracao(pasta)
+        for i in range(20):
+            config.atualizar({f"k{t}_{i:02d}": i})
+
+    threads = [threading.Thread(target=gravar, args=(t,)) for t in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(_no_disco(pasta)) == 80
+    assert [n for n in os.listdir(pasta) if n.endswith(".tmp")] == []
+
+
+def test_falha_ao_gravar_mantem_o_arquivo(pasta, monkeypatch):
+    config = Configuracao(pasta)
+    config.atualizar({"setor": "Financeiro"})
+
+    def quebrar(*args, **kwargs):
+        raise OSError(28, "disco cheio")
+
+    monkeypatch.setattr(configuracao.json, "dump", quebrar)
+    with pytest.raises(OSError):
+        Configuracao(pasta).atualizar({"setor": "Juridico"})
+    monkeypatch.undo()
+    assert _no_disco(pasta) == {"setor": "Financeiro"}
+    assert [n for n in os.listdir(pasta) if n.endswith(".tmp")] == []
+
+
+def test_arquivo_corrompido_e_legado(pasta, tmp_path):
+    (tmp_path / configuracao.CAMINHO_LEGADO).write_text('{"setor": "Legado"}', encoding="utf-8")
+    assert Configuracao(pasta).get("setor") == "Legado"
+    os.makedirs(pasta)
+    with open(os.path.join(pasta, NOME_ARQUIVO), "w", encoding="utf-8") as f:
+        f.write("{nao e json")
+    config = Configuracao(pasta)
+    assert config.get("setor") is None
+    assert config.atualizar({"setor": "Novo"})
+    assert _no_disco(pasta) == {"setor": "Novo"}
@@ -0,0 +1,141 @@
+import json
+import os
+
+import pytest
+
+from renomeador import executor
+from renomeador.diario import Diario, desfazer, diarios_incompletos, ler_diario, recuperar
+from renomeador.executor import ExecutorLote
+
+from .conftest import PLANO, Queda, criar, estado, numerado
+
+
+def _interromper(monkeypatch, depois: int) -> None:
+    """O ``os.replace`` do executor morre depois de ``depois`` renomes."""
+    real = os.replace
+    feitos = [0]
+
+    def replace(origem, destino):
+        if feitos[0] >= depois:
+            raise Queda()
+        feitos[0] += 1
+        real(origem, destino)
+
+    monkeypatch.setattr(executor.os, "replace", replace)
+
+
+def _lote_interrompido(monkeypatch, caminho: str, arquivos, depois: int, **opcoes) -> None:
+    with monkeypatch.context() as m:
+        _interromper(m, depois)
+        with pytest.raises(Queda):
+            with Diario.criar(caminho, PLANO.base) as diario:
+                ExecutorLote(PLANO, max_tarefas=1, diario=diario, **opcoes).executar(arquivos)
+
+
+def _cortar_ultima_linha(caminho: str) -> None:
+    with open(caminho, encoding="utf-8") as f:
+        linhas = f.readlines()
+    with open(caminho, "w", encoding="utf-8") as f:
+        f.writelines(linhas[:-1])
+        f.write(linhas[-1][: len(linhas[-1]) // 2])
+
+
+@pytest.fixture
+def pasta(tmp_path):
+    p = tmp_path / "docs"
+    p.mkdir()
+    return str(p)
+
+
+@pytest.fixture
+def lote(tmp_path, pasta):
+    """Seleção de 8 arquivos, o estado antes e o estado esperado depois do lote."""
+    arquivos = [criar(os.path.join(pasta, f"f{i}.pdf")) for i in range(8)]
+    antes = estado(pasta)
+    esperado = {os.path.basename(numerado(pasta, i)): f"f{i - 1}.pdf" for i in range(1, 9)}
+    return arquivos, antes, esperado, str(tmp_path / "lote.jsonl")
+
+
+@pytest.mark.parametrize("depois", [0, 3])
+def test_recuperar_e_desfazer_depois_do_plano(monkeypatch, lote, pasta, depois):
+    arquivos, antes, esperado, caminho = lote
+    _lote_interrompido(monkeypatch, caminho, arquivos, depois)
+    estado_diario = ler_diario(caminho)
+    assert not estado_diario.terminado
+    assert len(estado_diario.pendentes()) == 8 - depois
+
+    r = recuperar(caminho)
+    assert (r.ok, r.erros) == (8 - depois, [])
+    assert estado(pasta) == esperado
+    assert ler_diario(caminho).terminado
+
+    u = desfazer(caminho)
+    assert (u.ok, u.erros) == (8, [])
+    assert estado(pasta) == antes
+
+
+def test_desfazer_lote_interrompido(monkeypatch, lote, pasta):
+    arquivos, antes, _, caminho = lote
+    _lote_interrompido(monkeypatch, caminho, arquivos, 5)
+    u = desfazer(caminho)
+    assert (u.ok, u.erros) == (5, [])
+    assert estado(pasta) == antes
+
+
+def test_feito_cortado_no_meio_da_linha(monkeypatch, lote, pasta):
+    arquivos, antes, esperado, caminho = lote
+    _lote_interrompido(monkeypatch, caminho, arquivos, 4)
+    _cortar_ultima_linha(caminho)  # o último ``feito`` não chegou inteiro ao disco
+    assert len(ler_diario(caminho).pendentes()) == 5
+
+    r = recuperar(caminho)
+    assert r.erros == []
+    assert estado(pasta) == esperado
+    desfazer(caminho)
+    assert estado(pasta) == antes
+
+
+@pytest.mark.parametrize("depois", [0, 1, 2, 3])
+@pytest.mark.parametrize("acao", ["recuperar", "desfazer"])
+def test_queda_no_meio_do_ciclo(monkeypatch, tmp_path, pasta, depois, acao):
+    # 003 -> 001, 001 -> 002, 002 -> 003: um ciclo só, quatro renomes com o do temporário.
+    arquivos = [criar(numerado(pasta, n), str(n)) for n in (3, 1, 2)]
+    antes = estado(pasta)
+    caminho = str(tmp_path / "ciclo.jsonl")
+    _lote_interrompido(monkeypatch, caminho, arquivos, depois, duas_fases=True)
+    with open(caminho, encoding="utf-8") as f:
+        tipos = [json.loads(linha)["tipo"] for linha in f]
+    assert ("ciclo" in tipos) == (depois == 3)  # o ciclo só fecha depois do terceiro renome
+
+    if acao == "recuperar":
+        assert recuperar(caminho).erros == []
+        assert estado(pasta) == {os.path.basename(numerado(pasta, i)): str(n) for i, n in enumerate((3, 1, 2), 1)}
+    desfazer(caminho)
+    assert estado(pasta) == antes
+
+
+def test_diarios_incompletos(monkeypatch, tmp_path, lote):
+    arquivos, _, _, caminho = lote
+    _lote_interrompido(monkeypatch, caminho, arquivos, 2)
+    with Diario.criar(str(tmp_path / "terminado.jsonl")):
+        pass
+    assert diarios_incompletos(str(tmp_path), parado_ha=0) == [caminho]
+    recuperar(caminho)
+    assert diarios_incompletos(str(tmp_path), parado_ha=0) == []
+
+
+@pytest.mark.skipif(os.name == "nt", reason="nomes em bytes soltos só existem em POSIX")
+def test_nome_que_nao_e_utf8(tmp_path, pasta):
+    criar(os.fsdecode(os.path.join(os.fsencode(pasta), b"caf\xe9.pdf")), "cafe")
+    arquivos = [os.path.join(pasta, n) for n in os.listdir(pasta)]
+    antes = estado(pasta)
+    caminho = str(tmp_path / "lote.jsonl")
+    with Diario.criar(caminho, PLANO.base) as diario:
+        r = ExecutorLote(PLANO, diario=diario).executar(arquivos)
+    assert (r.ok, r.erros) == (1, [])
+    [item] = ler_diario(caminho).itens.values()
+    assert item.origem == arquivos[0] and item.estado == "feito"
+
+    assert desfazer(caminho).erros == []
+    assert estado(pasta) == antes
+    assert os.listdir(os.fsencode(pasta)) == [b"caf\xe9.pdf"]
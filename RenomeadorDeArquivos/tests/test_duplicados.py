@@ -0,0 +1,106 @@
+import os
+import threading
+
+import pytest
+
+from renomeador import duplicados
+from renomeador.duplicados import CacheHashes, encontrar_duplicados, sem_repetidos
+
+GRANDE = 3 * 64 * 1024  # maior que o início + fim do hash parcial
+
+
+@pytest.fixture
+def leituras(monkeypatch):
+    """Quantos hashes parciais e completos foram calculados."""
+    contas = {"parcial": 0, "completo": 0}
+    parcial, completo = duplicados.hash_parcial, duplicados.hash_completo
+
+    def contar_parcial(caminho, tamanho):
+        contas["parcial"] += 1
+        return parcial(caminho, tamanho)
+
+    def contar_completo(caminho, tamanho):
+        contas["completo"] += 1
+        return completo(caminho, tamanho)
+
+    monkeypatch.setattr(duplicados, "hash_parcial", contar_parcial)
+    monkeypatch.setattr(duplicados, "hash_completo", contar_completo)
+    return contas
+
+
+def _arquivo(tmp_path, nome: str, conteudo: bytes) -> str:
+    caminho = tmp_path / nome
+    caminho.write_bytes(conteudo)
+    return str(caminho)
+
+
+def test_tamanhos_diferentes_nao_sao_lidos(tmp_path, leituras):
+    arquivos = [_arquivo(tmp_path, f"{i}.bin", b"x" * (i + 1)) for i in range(5)]
+    r = encontrar_duplicados(arquivos)
+    assert r.repetidos == {} and r.lidos == 0
+    assert leituras == {"parcial": 0, "completo": 0}
+
+
+def test_hash_parcial_separa_inicio_diferente(tmp_path, leituras):
+    a = _arquivo(tmp_path, "a.bin", b"a" + b"\0" * (GRANDE - 1))
+    b = _arquivo(tmp_path, "b.bin", b"b" + b"\0" * (GRANDE - 1))
+    r = encontrar_duplicados([a, b])
+    assert r.repetidos == {}
+    assert leituras == {"parcial": 2, "completo": 0}
+
+
+def test_hash_completo_separa_meio_diferente(tmp_path, leituras):
+    meio = GRANDE // 2
+    base = bytearray(GRANDE)
+    a = _arquivo(tmp_path, "a.bin", bytes(base))
+    base[meio] = 1
+    b = _arquivo(tmp_path, "b.bin", bytes(base))
+    c = _arquivo(tmp_path, "c.bin", bytes(base))
+    r = encontrar_duplicados([a, b, c])
+    assert r.repetidos == {c: b}
+    assert leituras == {"parcial": 3, "completo": 3}
+
+
+def test_pequenos_nao_sao_relidos(tmp_path, leituras):
+    a = _arquivo(tmp_path, "a.txt", b"igual")
+    b = _arquivo(tmp_path, "b.txt", b"igual")
+    r = encontrar_duplicados([a, b])
+    assert r.repetidos == {b: a} and r.lidos == 2
+    # O parcial de um arquivo pequeno já é o hash completo dele: uma leitura só por arquivo.
+    assert leituras == {"parcial": 2, "completo": 2}
+
+
+def test_o_primeiro_da_selecao_e_o_original(tmp_path):
+    pasta = tmp_path / "sub"
+    pasta.mkdir()
+    a = _arquivo(tmp_path, "a.pdf", b"conteudo")
+    b = _arquivo(pasta, "a.pdf", b"conteudo")
+    c = _arquivo(tmp_path, "c.pdf", b"conteudo")
+    vazio1, vazio2 = _arquivo(tmp_path, "v1", b""), _arquivo(tmp_path, "v2", b"")
+    r = encontrar_duplicados([c, a, vazio1, b, a, vazio2])
+    assert r.repetidos == {a: c, b: c}
+    assert r.grupos == [[c, a, b]]
+    assert list(sem_repetidos([c, a, vazio1, b], r.repetidos)) == [c, vazio1]
+
+
+def test_cancelado_fica_de_fora(tmp_path, leituras):
+    a = _arquivo(tmp_path, "a.txt", b"igual")
+    b = _arquivo(tmp_path, "b.txt", b"igual")
+    cancelar = threading.Event()
+    cancelar.set()
+    r = encontrar_duplicados([a, b], cancelar=cancelar)
+    assert r.repetidos == {} and r.lidos == 0
+    assert leituras == {"parcial": 0, "completo": 0}
+
+
+def test_cache_evita_reler(tmp_path, leituras, monkeypatch):
+    a = _arquivo(tmp_path, "a.bin", b"\0" * GRANDE)
+    b = _arquivo(tmp_path, "b.bin", b"\0" * GRANDE)
+    with CacheHashes(str(tmp_path / "hashes.db")) as cache:
+        primeiro = encontrar_duplicados([a, b], cache=cache)
+        # Outra pasta de trabalho e caminhos relativos: a mesma chave no cache.
+        monkeypatch.chdir(tmp_path)
+        segundo = encontrar_duplicados(["a.bin", os.path.join(".", "b.bin")], cache=cache)
+    assert primeiro.repetidos == {b: a} and primeiro.lidos == 4
+    assert segundo.repetidos == {os.path.join(".", "b.bin"): "a.bin"}
+    assert (segundo.lidos, segundo.do_cache) == (0, 4)
@@ -0,0 +1,173 @@
+import datetime
+import os
+import struct
+import zipfile
+
+import pytest
+
+from renomeador.metadados import (
+    FONTE_EXIF,
+    FONTE_MTIME,
+    FONTE_OFFICE,
+    FONTE_PDF,
+    data_jpeg,
+    data_odf,
+    data_office,
+    data_pdf,
+    data_tiff,
+    extrair,
+    versao_do_nome,
+)
+
+
+# ---------- EXIF ----------
+def _tiff(ordem: str, original: bytes = b"", principal: bytes = b"") -> bytes:
+    """Cabeçalho TIFF com ``DateTime`` na IFD0 e ``DateTimeOriginal`` na IFD do EXIF (se vierem)."""
+    textos = b""
+    fim_ifds = 8 + (2 + 2 * 12 + 4) + (2 + 12 + 4)
+    entradas0 = []
+    if principal:
+        entradas0.append((0x0132, 2, len(principal), fim_ifds + len(textos)))
+        textos += principal
+    sub_offset = 8 + 2 + 2 * 12 + 4
+    entradas0.append((0x8769, 4, 1, sub_offset))
+    entradas_sub = []
+    if original:
+        entradas_sub.append((0x9003, 2, len(original), fim_ifds + len(textos)))
+        textos += original
+
+    def ifd(entradas, total):
+        dados = struct.pack(ordem + "H", total)
+        for entrada in entradas:
+            dados += struct.pack(ordem + "HHII", *entrada)
+        dados += b"\0" * 12 * (total - len(entradas))
+        return dados + struct.pack(ordem + "I", 0)
+
+    marca = b"II" if ordem == "<" else b"MM"
+    return marca + struct.pack(ordem + "HI", 42, 8) + ifd(entradas0, 2) + ifd(entradas_sub, 1) + textos
+
+
+def _jpeg(tiff: bytes) -> bytes:
+    jfif = b"JFIF\0\x01\x01\0\0\x01\0\x01\0\0"
+    app1 = b"Exif\0\0" + tiff
+    return (
+        b"\xff\xd8"
+        + b"\xff\xe0" + struct.pack(">H", len(jfif) + 2) + jfif
+        + b"\xff\xe1" + struct.pack(">H", len(app1) + 2) + app1
+        + b"\xff\xda\0\x02" + b"\0" * 64
+    )
+
+
+@pytest.mark.parametrize("ordem", ["<", ">"])
+def test_data_jpeg_exif(tmp_path, ordem):
+    foto = tmp_path / "foto.jpg"
+    foto.write_bytes(_jpeg(_tiff(ordem, original=b"2019:07:04 10:00:00\0", principal=b"2020:01:01 00:00:00\0")))
+    assert data_jpeg(str(foto)) == "20190704"
+
+
+def test_data_jpeg_sem_data_original_usa_ifd0(tmp_path):
+    foto = tmp_path / "foto.jpg"
+    foto.write_bytes(_jpeg(_tiff("<", principal=b"2020:01:02 00:00:00\0")))
+    assert data_jpeg(str(foto)) == "20200102"
+
+
+def test_data_jpeg_invalida_ou_ausente(tmp_path):
+    zerada = tmp_path / "zerada.jpg"
+    zerada.write_bytes(_jpeg(_tiff("<", original=b"0000:00:00 00:00:00\0")))
+    sem_exif = tmp_path / "sem.jpg"
+    sem_exif.write_bytes(b"\xff\xd8\xff\xda\0\x02" + b"\0" * 16)
+    assert data_jpeg(str(zerada)) is None
+    assert data_jpeg(str(sem_exif)) is None
+
+
+def test_data_tiff(tmp_path):
+    imagem = tmp_path / "scan.tif"
+    imagem.write_bytes(_tiff(">", original=b"2015:12:31 23:59:59\0"))
+    assert data_tiff(str(imagem)) == "20151231"
+
+
+# ---------- PDF ----------
+def test_data_pdf_info_no_fim(tmp_path):
+    pdf = tmp_path / "a.pdf"
+    pdf.write_bytes(b"%PDF-1.4\n" + b"0" * 200_000 + b"\n<< /CreationDate (D:20180512093000-03'00') >>\n%%EOF")
+    assert data_pdf(str(pdf)) == "20180512"
+
+
+def test_data_pdf_xmp_no_inicio(tmp_path):
+    pdf = tmp_path / "a.pdf"
+    pdf.write_bytes(b"%PDF-1.7\n<x:xmpmeta><xmp:CreateDate>2017-03-09T08:00:00</xmp:CreateDate>" + b"0" * 100)
+    assert data_pdf(str(pdf)) == "20170309"
+
+
+def test_data_pdf_sem_data(tmp_path):
+    pdf = tmp_path / "a.pdf"
+    pdf.write_bytes(b"%PDF-1.4\n<< /CreationDate (D:00000101) >>\n%%EOF")
+    assert data_pdf(str(pdf)) is None
+
+
+# ---------- Office / ODF ----------
+def test_data_office_core_xml(tmp_path):
+    docx = tmp_path / "a.docx"
+    with zipfile.ZipFile(docx, "w") as z:
+        z.writestr("word/document.xml", "<w:document/>")
+        z.writestr(
+            "docProps/core.xml",
+            '<cp:coreProperties><dcterms:created xsi:type="dcterms:W3CDTF">2021-02-03T12:00:00'
+            "</dcterms:created></cp:coreProperties>",
+        )
+    assert data_office(str(docx)) == "20210203"
+
+
+def test_data_office_sem_core_xml(tmp_path):
+    xlsx = tmp_path / "a.xlsx"
+    with zipfile.ZipFile(xlsx, "w") as z:
+        z.writestr("xl/workbook.xml", "<workbook/>")
+    assert data_office(str(xlsx)) is None
+
+
+def test_data_odf(tmp_path):
+    odt = tmp_path / "a.odt"
+    with zipfile.ZipFile(odt, "w") as z:
+        z.writestr("meta.xml", "<office:meta><meta:creation-date>2016-06-07T09:30:00</meta:creation-date></office:meta>")
+    assert data_odf(str(odt)) == "20160607"
+
+
+# ---------- Extração ----------
+def test_extrair_escolhe_a_fonte(tmp_path):
+    foto = tmp_path / "ferias_v2.JPG"
+    foto.write_bytes(_jpeg(_tiff("<", original=b"2019:07:04 10:00:00\0")))
+    pdf = tmp_path / "a.pdf"
+    pdf.write_bytes(b"%PDF-1.4\n<< /CreationDate (D:20180512) >>")
+    docx = tmp_path / "a.docx"
+    with zipfile.ZipFile(docx, "w") as z:
+        z.writestr("docProps/core.xml", "<dcterms:created>2021-02-03T12:00:00</dcterms:created>")
+    quebrado = tmp_path / "quebrado.docx"
+    quebrado.write_bytes(b"nao e zip")
+    os.utime(quebrado, (1_600_000_000, 1_600_000_000))
+
+    m = extrair(str(foto))
+    assert (m.data, m.fonte, m.versao) == ("20190704", FONTE_EXIF, "2")
+    assert extrair(str(pdf)).fonte == FONTE_PDF
+    assert extrair(str(docx)).fonte == FONTE_OFFICE
+    m = extrair(str(quebrado))  # extensão do Office, conteúdo não: vale a data de modificação
+    assert (m.fonte, m.data) == (FONTE_MTIME, datetime.date.fromtimestamp(1_600_000_000).strftime("%Y%m%d"))
+
+
+# ---------- Versão ----------
+@pytest.mark.parametrize(
+    "nome, versao",
+    [
+        ("contrato_v2.pdf", "2"),
+        ("Contrato Rev 3.docx", "3"),
+        ("relatorio versão 4.pdf", "4"),
+        ("ata-revisao_12.pdf", "12"),
+        ("20260101-Fin-DOC-v02-001.pdf", "2"),
+        ("proposta v1 revisada v3.pdf", "3"),
+        ("video_v1080.mp4", None),
+        ("dev2.txt", None),
+        ("preview3.png", None),
+        ("sem versao.pdf", None),
+    ],
+)
+def test_versao_do_nome(nome, versao):
+    assert versao_do_nome(os.path.join("pasta_v9", nome)) == versao
@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+from renomeador.nomes import PlanoNome, encurtar_se_preciso, limite_do_nome
+
+PLANO_LONGO = PlanoNome("20260101-Fin-RCA-" + "ADITIVOCONTRATUAL" * 20 + "-v03")
+
+
+@pytest.mark.parametrize("ext", [".pdf", ".docx", ""])
+def test_encurtar_mantem_versao_e_numero(tmp_path, ext):
+    pasta = str(tmp_path)
+    limite = limite_do_nome(pasta)
+    nomes = [PLANO_LONGO.nome_em(pasta, ext, n) for n in (1, 2, 10, 999, 1000)]
+    for n, nome in zip((1, 2, 10, 999, 1000), nomes):
+        assert len(nome) <= limite
+        assert nome.startswith("20260101-Fin-RCA-ADITIVO")
+        assert nome.endswith(f"-v03-{n:03d}{ext}")
+        assert PLANO_LONGO.encurtado(nome, ext, n)
+    assert len(set(nomes)) == len(nomes)
+    assert PLANO_LONGO.nome_em(pasta, ext).endswith(f"-v03{ext}")
+
+
+def test_encurtar_se_preciso():
+    assert encurtar_se_preciso("/tmp", "curto-v01-002.pdf") == "curto-v01-002.pdf"
+    longo = encurtar_se_preciso("/tmp", "X" * 300 + "-v12-004.pdf")
+    assert len(longo) <= limite_do_nome("/tmp") and longo.endswith("X-v12-004.pdf")
+    # Nem a cauda cabe: sem nome.
+    assert encurtar_se_preciso("/tmp", "-v01-" + "1" * 300 + ".pdf") is None
+
+
+def test_nome_curto_nao_muda(tmp_path):
+    plano = PlanoNome("20260101-Fin-DOC-v01")
+    assert plano.nome_em(str(tmp_path), ".pdf", 7) == "20260101-Fin-DOC-v01-007.pdf"
+    assert not plano.encurtado("20260101-Fin-DOC-v01-007.pdf", ".pdf", 7)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="caminhos de mais de 3800 caracteres")
+def test_limite_de_pasta_relativa_segue_a_pasta_de_trabalho(tmp_path, monkeypatch):
+    funda = str(tmp_path)
+    while len(funda) < 3900:
+        funda = os.path.join(funda, "p" * 200)
+    os.makedirs(funda)
+    monkeypatch.chdir(tmp_path)
+    raso = limite_do_nome("")
+    monkeypatch.chdir(funda)
+    fundo = limite_do_nome("")
+    assert raso == 255 and fundo == 4096 - len(funda) - 1 < raso
+    monkeypatch.chdir(tmp_path)
+    assert limite_do_nome("") == raso
+    assert limite_do_nome(funda) == fundo
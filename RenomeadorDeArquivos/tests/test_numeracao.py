@@ -0,0 +1,76 @@
+import os
+import random
+import shutil
+
+import pytest
+
+from renomeador.lote import renomear_lote
+from renomeador.numeracao import NumerosOcupados
+
+from .conftest import PLANO, criar, estado, numerado
+
+
+def _renomear_sondando(arquivos):
+    """A regra original: começa em ``idx`` e sobe enquanto ``os.path.exists`` achar o nome."""
+    for idx, origem in enumerate(arquivos, start=1):
+        pasta, ext = os.path.dirname(origem), os.path.splitext(origem)[1]
+        n = idx
+        destino = os.path.join(pasta, PLANO.nome_em(pasta, ext, n))
+        while os.path.exists(destino):
+            n += 1
+            destino = os.path.join(pasta, PLANO.nome_em(pasta, ext, n))
+        os.replace(origem, destino)
+
+
+def _pastas_com_buracos(raiz: str, semente: int):
+    sorteio = random.Random(semente)
+    arquivos = []
+    for p in range(4):
+        pasta = os.path.join(raiz, f"d{p}")
+        os.makedirs(pasta)
+        # Números já usados, com buracos, em extensões e caixas diferentes.
+        for n in sorteio.sample(range(1, 30), 8):
+            criar(numerado(pasta, n, sorteio.choice([".pdf", ".PDF", ".txt"])))
+        criar(os.path.join(pasta, f"{PLANO.base.lower()}-{sorteio.randint(1, 9):03d}.pdf"))
+        criar(os.path.join(pasta, f"{PLANO.base}-7.pdf"))  # sem os três dígitos: não é número do plano
+        selecao = [criar(os.path.join(pasta, f"f{i}{sorteio.choice(['.pdf', '.txt', '.PDF'])}")) for i in range(20)]
+        # Alguns já numerados entram na seleção (o próprio nome conta como ocupado).
+        selecao += sorteio.sample([os.path.join(pasta, n) for n in os.listdir(pasta) if n.startswith(PLANO.base)], 3)
+        arquivos += selecao
+    sorteio.shuffle(arquivos)
+    return arquivos
+
+
+@pytest.mark.parametrize("semente", range(8))
+def test_mesma_numeracao_que_sondar_o_disco(tmp_path, semente):
+    a, b = str(tmp_path / "a"), str(tmp_path / "b")
+    arquivos = _pastas_com_buracos(a, semente)
+    shutil.copytree(a, b)
+    antes = estado(a)
+
+    _renomear_sondando(arquivos)
+    r = renomear_lote(PLANO, [b + c[len(a):] for c in arquivos])
+    assert (r.ok, r.erros) == (len(arquivos), [])
+    assert estado(a) != antes
+    assert estado(b) == estado(a)
+
+
+def test_numeros_ocupados_contra_um_conjunto():
+    sorteio = random.Random(1)
+    ocupados, conjunto = NumerosOcupados(), set()
+    for _ in range(3000):
+        n = sorteio.randint(1, 60)
+        acao = sorteio.random()
+        if acao < 0.45:
+            ocupados.ocupar(n)
+            conjunto.add(n)
+        elif acao < 0.6:
+            ocupados.liberar(n)
+            conjunto.discard(n)
+        else:
+            livre = n
+            while livre in conjunto:
+                livre += 1
+            assert ocupados.proximo_livre(n) == livre
+    faixas = ocupados.faixas()
+    assert [n for inicio, fim in faixas for n in range(inicio, fim + 1)] == sorted(conjunto)
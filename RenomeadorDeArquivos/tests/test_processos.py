@@ -0,0 +1,91 @@
+import os
+
+import pytest
+
+from renomeador import executor
+from renomeador.diario import Diario, desfazer, diarios_incompletos, ler_diario, recuperar
+from renomeador.executor import RENOMEADO, ExecutorLote
+
+from .conftest import PLANO, Queda, arvore, estado
+
+
+@pytest.fixture
+def pacotes_pequenos(monkeypatch):
+    monkeypatch.setattr(executor, "_ARQUIVOS_POR_PACOTE", 20)
+
+
+@pytest.fixture
+def duas_arvores(tmp_path):
+    a, b = str(tmp_path / "a"), str(tmp_path / "b")
+    arquivos_a, arquivos_b = arvore(a), arvore(b)
+    return (a, arquivos_a), (b, arquivos_b)
+
+
+def test_processos_iguais_a_threads(tmp_path, pacotes_pequenos, duas_arvores):
+    (a, arquivos_a), (b, arquivos_b) = duas_arvores
+    antes = estado(b)
+    r_threads = ExecutorLote(PLANO, max_tarefas=2).executar(arquivos_a)
+
+    eventos = []
+    caminho = str(tmp_path / "diarios" / "lote.jsonl")
+    with Diario.criar(caminho, PLANO.base) as diario:
+        r_processos = ExecutorLote(PLANO, processos=2, diario=diario, ao_evento=eventos.append).executar(arquivos_b)
+
+    assert estado(a) == estado(b)
+    assert (r_processos.total, r_processos.ok, r_processos.erros) == (r_threads.total, r_threads.ok, [])
+    assert sorted(e.idx for e in eventos if e.tipo == RENOMEADO) == list(range(1, len(arquivos_b) + 1))
+
+    # Os diários dos pacotes entraram no do lote e foram apagados.
+    assert os.listdir(os.path.dirname(caminho)) == ["lote.jsonl"]
+    estado_diario = ler_diario(caminho)
+    assert estado_diario.terminado and len(estado_diario.itens) == r_processos.ok
+    assert not estado_diario.pendentes()
+    desfazer(caminho)
+    assert estado(b) == antes
+
+
+def _queda_com_pacotes(monkeypatch, caminho: str, arquivos) -> None:
+    """O processo principal morre antes de juntar o primeiro pacote ao diário do lote."""
+
+    def anexar(self, caminho_pacote):
+        raise Queda()
+
+    with monkeypatch.context() as m:
+        m.setattr(Diario, "anexar", anexar)
+        with pytest.raises(Queda):
+            with Diario.criar(caminho, PLANO.base) as diario:
+                ExecutorLote(PLANO, processos=2, diario=diario).executar(arquivos)
+
+
+def test_recuperar_com_diarios_de_pacote(tmp_path, monkeypatch, pacotes_pequenos, duas_arvores):
+    (_, _), (b, arquivos) = duas_arvores
+    antes = estado(b)
+    pasta_diarios = str(tmp_path / "diarios")
+    caminho = os.path.join(pasta_diarios, "lote.jsonl")
+    _queda_com_pacotes(monkeypatch, caminho, arquivos)
+
+    pacotes = [n for n in os.listdir(pasta_diarios) if n != "lote.jsonl"]
+    assert pacotes and all(n.startswith("lote.p") for n in pacotes)
+    # Um lote só, com o que os pacotes renomearam.
+    assert diarios_incompletos(pasta_diarios, parado_ha=0) == [caminho]
+    feitos = [it for it in ler_diario(caminho).itens.values() if it.estado == "feito"]
+    assert feitos and all(os.path.exists(it.destino) for it in feitos)
+
+    assert recuperar(caminho).erros == []
+    assert os.listdir(pasta_diarios) == ["lote.jsonl"]
+    assert not ler_diario(caminho).pendentes()
+    u = desfazer(caminho)
+    assert u.erros == [] and u.ok >= len(feitos)
+    assert estado(b) == antes
+
+
+def test_desfazer_com_diarios_de_pacote(tmp_path, monkeypatch, pacotes_pequenos, duas_arvores):
+    (_, _), (b, arquivos) = duas_arvores
+    antes = estado(b)
+    caminho = str(tmp_path / "diarios" / "lote.jsonl")
+    _queda_com_pacotes(monkeypatch, caminho, arquivos)
+
+    assert estado(b) != antes
+    assert desfazer(caminho).erros == []
+    assert estado(b) == antes
+    assert os.listdir(os.path.dirname(caminho)) == ["lote.jsonl"]
@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from renomeador.catalogo import FonteCatalogo
+from renomeador.diario import desfazer, ler_diario
+from renomeador.servico import ServicoRenomeador
+
+CAMPOS = {"setor": "Financeiro", "evento": "RCA360", "documento": "doc", "data": "20260228"}
+
+
+@pytest.fixture
+def servico():
+    return ServicoRenomeador(FonteCatalogo(None), tarefas=1)
+
+
+@pytest.fixture
+def arquivo(tmp_path):
+    caminho = tmp_path / "a.pdf"
+    caminho.write_text("a")
+    return str(caminho)
+
+
+# "{a}" é trocado pelo arquivo da fixture.
+@pytest.mark.parametrize(
+    "pedido, erro",
+    [
+        ({"op": ["x"]}, "operação desconhecida"),
+        ({"op": "nome", "campos": dict(CAMPOS, data="xx")}, "data inválida"),
+        ({"op": "nome", "campos": dict(CAMPOS, data="20260230")}, "data inválida"),
+        ({"op": "nome", "campos": dict(CAMPOS, data=20260228)}, "'data' deve ser"),
+        ({"op": "nome", "campos": CAMPOS, "numerar": True, "itens": [{"arquivo": "{a}", "numero": 0}]}, "'numero'"),
+        ({"op": "nome", "campos": CAMPOS, "numerar": True, "itens": [{"arquivo": "{a}", "numero": True}]}, "'numero'"),
+        ({"op": "nome", "campos": CAMPOS, "numerar": True, "itens": [{"arquivo": "{a}", "numero": [1]}]}, "'numero'"),
+        ({"op": "planejar", "campos": CAMPOS, "arquivos": ["{a}"], "arquivar": 7}, "'arquivar'"),
+        ({"op": "executar", "campos": CAMPOS, "arquivos": ["{a}"], "arquivar": ["x"]}, "'arquivar'"),
+        ({"op": "executar", "campos": CAMPOS, "arquivos": ["{a}"], "diario": 7}, "'diario'"),
+    ],
+)
+def test_pedido_invalido(servico, arquivo, pedido, erro):
+    if "arquivos" in pedido:
+        pedido = dict(pedido, arquivos=[arquivo])
+    if "itens" in pedido:
+        pedido = dict(pedido, itens=[dict(it, arquivo=arquivo) for it in pedido["itens"]])
+    resposta = servico.atender(dict(pedido, id=9))
+    assert resposta["ok"] is False and resposta["id"] == 9
+    assert erro in resposta["erro"]
+    assert os.path.exists(arquivo)
+
+
+def test_erro_inesperado_vira_resposta(servico, monkeypatch):
+    def quebrar(pedido):
+        raise KeyError("x")
+
+    monkeypatch.setitem(servico._operacoes, "nome", quebrar)
+    resposta = servico.atender({"op": "nome", "id": 1})
+    assert resposta["ok"] is False and resposta["erro"].startswith("erro interno: KeyError")
+
+
+def test_nome_valido(servico, arquivo):
+    itens = [{"arquivo": arquivo, "numero": 3}, {"arquivo": arquivo}, {}]
+    resposta = servico.atender({"op": "nome", "campos": CAMPOS, "numerar": True, "itens": itens})
+    assert resposta["ok"] is True and resposta["base"] == "20260228-Fin-RCA-DOC"
+    # Sem ``numero``, a posição na pasta; sem arquivo, só o nome-base.
+    assert [it["numero"] for it in resposta["itens"]] == [3, 2, None]
+    assert resposta["itens"][0]["nome"] == "20260228-Fin-RCA-DOC-003.pdf"
+
+
+def test_executar_um_arquivo_com_diario(servico, arquivo, tmp_path):
+    caminho = str(tmp_path / "um.jsonl")
+    resposta = servico.atender({"op": "executar", "campos": CAMPOS, "arquivos": [arquivo], "diario": caminho})
+    assert resposta["ok"] is True and resposta["erros"] == []
+    [(origem, destino)] = resposta["renomeados"]
+    assert origem == arquivo and os.path.exists(destino)
+    assert resposta["metricas"]["renomeados"] == 1
+
+    estado = ler_diario(caminho)
+    assert estado.terminado and [it.estado for it in estado.itens.values()] == ["feito"]
+    desfazer(caminho)
+    assert os.path.exists(arquivo) and not os.path.exists(destino)
@@ -0,0 +1,101 @@
+import os
+
+import pytest
+
+from renomeador import numeracao
+from renomeador.lote import renomear_lote
+from renomeador.numeracao import CacheSufixos, IndiceDiretorio, NumerosOcupados, mtime_pasta
+
+from .conftest import PLANO, criar, numerado
+
+
+class _IndiceContado(IndiceDiretorio):
+    listagens = 0
+
+    def __init__(self, diretorio: str):
+        _IndiceContado.listagens += 1
+        super().__init__(diretorio)
+
+
+@pytest.fixture
+def listagens(monkeypatch):
+    _IndiceContado.listagens = 0
+    monkeypatch.setattr(numeracao, "IndiceDiretorio", _IndiceContado)
+    return _IndiceContado
+
+
+@pytest.fixture
+def pasta(tmp_path):
+    p = tmp_path / "docs"
+    p.mkdir()
+    return str(p)
+
+
+def _mexer_no_mtime(pasta: str) -> None:
+    """Garante um mtime novo (e com fração de segundo) mesmo em sistemas de arquivos rápidos."""
+    mtime = os.stat(pasta).st_mtime_ns + 1_000_001
+    os.utime(pasta, ns=(mtime, mtime))
+
+
+def _lote(pasta: str, quantos: int, cache: CacheSufixos, prefixo: str):
+    arquivos = [criar(os.path.join(pasta, f"{prefixo}{i}.pdf")) for i in range(quantos)]
+    _mexer_no_mtime(pasta)
+    r = renomear_lote(PLANO, arquivos, sufixos=cache)
+    assert r.erros == []
+    return r
+
+
+def test_faixas_ida_e_volta(tmp_path, pasta):
+    caminho = str(tmp_path / "sufixos.db")
+    ocupados = NumerosOcupados()
+    ocupados.ocupar_faixa(1, 40)
+    ocupados.ocupar(45)
+    with CacheSufixos(caminho) as cache:
+        cache.guardar_faixas(pasta, PLANO.base, mtime_pasta(pasta), {".pdf": ocupados})
+        cache.salvar()
+    with CacheSufixos(caminho) as cache:
+        assert cache.consultar_faixas(pasta, PLANO.base) == {".pdf": [[1, 40], [45, 45]]}
+        assert cache.consultar_faixas(pasta, PLANO.base + "-OUTRO") is None
+
+
+def test_pasta_que_mudou_e_relida(tmp_path, pasta, listagens):
+    cache = CacheSufixos(str(tmp_path / "sufixos.db"))
+    try:
+        _lote(pasta, 3, cache, "a")
+        assert listagens.listagens == 1
+        assert cache.consultar_faixas(pasta, PLANO.base) == {".pdf": [[1, 3]]}
+
+        # De fora: um número novo e o mtime da pasta muda.
+        criar(numerado(pasta, 4))
+        _mexer_no_mtime(pasta)
+        assert cache.consultar_faixas(pasta, PLANO.base) is None
+        r = renomear_lote(PLANO, [criar(os.path.join(pasta, "b.pdf"))], sufixos=cache)
+        assert r.erros == [] and listagens.listagens == 2
+        assert os.path.exists(numerado(pasta, 5))
+        assert cache.consultar_faixas(pasta, PLANO.base) == {".pdf": [[1, 5]]}
+    finally:
+        cache.fechar()
+
+
+def test_pasta_que_nao_mudou_nao_e_listada(tmp_path, pasta, listagens):
+    cache = CacheSufixos(str(tmp_path / "sufixos.db"))
+    try:
+        _lote(pasta, 3, cache, "a")
+        # A pasta volta ao mtime gravado no fim do primeiro lote: o segundo
+        # numera pelas faixas do cache, sem listar a pasta.
+        mtime = mtime_pasta(pasta)
+        novo = criar(os.path.join(pasta, "b.pdf"))
+        os.utime(pasta, ns=(mtime, mtime))
+        r = renomear_lote(PLANO, [novo], sufixos=cache)
+        assert r.erros == [] and listagens.listagens == 1
+        assert os.path.exists(numerado(pasta, 4))
+    finally:
+        cache.fechar()
+
+
+def test_mtime_so_em_segundos_nao_vale(tmp_path, pasta):
+    os.utime(pasta, ns=(1_700_000_000_000_000_000, 1_700_000_000_000_000_000))
+    assert mtime_pasta(pasta) is None
+    with CacheSufixos(str(tmp_path / "sufixos.db")) as cache:
+        cache.guardar(CacheSufixos._chave(pasta, PLANO.base), 0, 1_700_000_000_000_000_000, ("{}",))
+        assert cache.consultar_faixas(pasta, PLANO.base) is None
@@ -0,0 +1,55 @@
+import os
+
+from renomeador.compacto import PlanoCompacto
+from renomeador.diario import Diario, desfazer
+from renomeador.executor import ExecutorLote
+from renomeador.trocas import CICLO, NORMAL, planejar_trocas
+
+from .conftest import PLANO, criar, estado, numerado
+
+
+def _destinos(fatia: PlanoCompacto):
+    return [os.path.basename(fatia.destino(PLANO, i)) for i in range(len(fatia))]
+
+
+def test_caminho_anda_do_fim_para_o_comeco(tmp_path):
+    pasta = str(tmp_path)
+    fatia = PlanoCompacto([criar(numerado(pasta, 2)), criar(numerado(pasta, 3))])
+    trocas = planejar_trocas(PLANO, fatia)
+    # 002 -> 001 desocupa o 002, que é o destino de 003.
+    assert _destinos(fatia) == [os.path.basename(numerado(pasta, n)) for n in (1, 2)]
+    assert list(trocas.ordens[0]) == [0, 1]
+    assert list(trocas.tamanhos[0]) == [2]
+    assert trocas.ciclos == 0 and not trocas.temporarios
+
+
+def test_ciclo_passa_pelo_temporario(tmp_path):
+    pasta = str(tmp_path)
+    criar(numerado(pasta, 4))  # de fora da seleção: continua ocupado
+    fatia = PlanoCompacto([criar(numerado(pasta, n)) for n in (3, 1, 2)] + [criar(os.path.join(pasta, "novo.pdf"))])
+    trocas = planejar_trocas(PLANO, fatia)
+    assert _destinos(fatia) == [os.path.basename(numerado(pasta, n)) for n in (1, 2, 3, 5)]
+    assert trocas.ciclos == 1
+    assert list(trocas.situacao) == [CICLO, NORMAL, NORMAL, NORMAL]
+    # Caminhos antes dos ciclos; o ciclo começa pela menor posição e o resto anda de trás para a frente.
+    assert list(trocas.ordens[0]) == [3, 0, 2, 1]
+    assert list(trocas.tamanhos[0]) == [1, 3]
+    temporario = trocas.temporarios[0]
+    assert temporario.endswith(".pdf") and not os.path.exists(os.path.join(pasta, temporario))
+
+
+def test_executar_e_desfazer_ciclo(tmp_path):
+    pasta = str(tmp_path / "docs")
+    os.makedirs(pasta)
+    arquivos = [criar(numerado(pasta, n), str(n)) for n in (2, 3, 1)] + [criar(os.path.join(pasta, "a.pdf"), "a")]
+    antes = estado(pasta)
+    caminho = str(tmp_path / "lote.jsonl")
+    with Diario.criar(caminho, PLANO.base) as diario:
+        r = ExecutorLote(PLANO, diario=diario, duas_fases=True).executar(arquivos)
+    assert (r.ok, r.erros) == (4, [])
+    assert r.metricas.contadores.get("ciclos") == 1
+    assert estado(pasta) == {os.path.basename(numerado(pasta, i)): c for i, c in enumerate(("2", "3", "1", "a"), 1)}
+
+    u = desfazer(caminho)
+    assert (u.ok, u.erros) == (4, [])
+    assert estado(pasta) == antes
@@ -0,0 +1,47 @@
+import os
+import threading
+import time
+
+from renomeador.nomes import PlanoNome
+from renomeador.vigia import Vigia
+
+from .conftest import criar
+
+# Base maior que o limite de 255 do nome: todo destino sai encurtado no meio.
+PLANO_LONGO = PlanoNome("20260101-Fin-" + "DOC" * 100 + "-v02")
+
+
+def test_nome_encurtado_nao_volta_para_a_fila(tmp_path):
+    pasta = str(tmp_path)
+    vigia = Vigia(pasta, lambda: PLANO_LONGO)
+    encurtado = PLANO_LONGO.nome_em(pasta, ".pdf", 1)
+    assert len(encurtado) < len(PLANO_LONGO.base) and encurtado.endswith("-v02-001.pdf")
+    outro_dia = "20251231" + encurtado[8:]
+    vigia._observar([encurtado, outro_dia, encurtado.replace("-001.", "-117."), "novo.pdf"])
+    assert list(vigia._pendentes) == ["novo.pdf"]
+
+
+def test_vigia_renomeia_uma_vez_so(tmp_path):
+    pasta = str(tmp_path)
+    renomes = []
+    vigia = Vigia(
+        pasta,
+        lambda: PLANO_LONGO,
+        estavel=0.05,
+        intervalo=0.02,
+        polling=True,
+        ao_renomear=lambda origem, destino: renomes.append(destino),
+    )
+    criar(os.path.join(pasta, "a.pdf"))
+    laco = threading.Thread(target=vigia.executar)
+    laco.start()
+    try:
+        fim = time.monotonic() + 5
+        while not renomes and time.monotonic() < fim:
+            time.sleep(0.02)
+        time.sleep(0.5)  # várias voltas do laço depois do renome
+    finally:
+        vigia.parar()
+        laco.join()
+    assert len(renomes) == 1
+    assert os.listdir(pasta) == [os.path.basename(renomes[0])]